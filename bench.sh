@@ -0,0 +1,44 @@
+#!/usr/bin/env bash
+# Usage:
+#   ./bench.sh save [pyperf options]     Record baseline results
+#   ./bench.sh compare [pyperf options]  Compare against the baseline, and fail
+#                                        if a benchmark significantly regressed
+#   ./bench.sh import [--runs N]         Time `import ppb_vector`, and fail if it
+#                                        exceeds its budget
+#
+# Options are passed to tests/benchmark.py, for instance `--group operators`
+#  or `--fast`. Set BENCH_THRESHOLD to change the tolerated slowdown (in %).
+source .common.sh
+
+BENCH_DIR=.benchmarks
+BASELINE="${BENCH_DIR}/baseline.json"
+CURRENT="${BENCH_DIR}/current.json"
+
+export PYTHONPATH=".${PYTHONPATH+:${PYTHONPATH}}"
+mkdir -p "${BENCH_DIR}"
+
+case "${1-}" in
+    save)
+        shift
+        rm -f "${BASELINE}"
+        run ${PY} tests/benchmark.py -o "${BASELINE}" "$@"
+        ;;
+
+    compare)
+        shift
+        [ -f "${BASELINE}" ] || die "No baseline in ${BASELINE}; run '$0 save' first"
+        rm -f "${CURRENT}"
+        run ${PY} tests/benchmark.py -o "${CURRENT}" "$@"
+        run ${PY} tests/benchmark_compare.py --threshold "${BENCH_THRESHOLD-5}" \
+            "${BASELINE}" "${CURRENT}"
+        ;;
+
+    import)
+        shift
+        run ${PY} tests/benchmark_import.py "$@"
+        ;;
+
+    *)
+        die "Usage: $0 {save|compare|import} [options]"
+        ;;
+esac
@@ -0,0 +1,9 @@
+import sys
+import typing
+
+# This file has no doctests, and --doctest-modules would import it as the
+#  `conftest` module, which is already tests/conftest.py.
+collect_ignore: typing.List[str] = ['conftest.py']
+if sys.version_info < (3, 8):
+    # multiprocessing.shared_memory is new in Python 3.8
+    collect_ignore.append('ppb_vector/shared.py')
@@ -1,39 +1,100 @@
+from __future__ import annotations
+
+import os
+import struct
 import sys
-import typing  # TODO: In Py3.9 onwards, ABCs can be subscripted directly
-import warnings
-from collections.abc import Mapping, Sequence
-from dataclasses import dataclass
-from math import atan2, copysign, cos, degrees, hypot, isclose, radians, sin, sqrt
-from typing import Optional, SupportsFloat, Tuple, Union
+from collections.abc import Mapping, Sequence, Sized
+from functools import lru_cache
+from math import atan2, copysign, cos, degrees, fsum, hypot, isclose, radians, sin, sqrt
+
+# `typing` is slow to import compared to this whole module, and only needed
+#  for type-checking: annotations are not evaluated at runtime, and the
+#  VectorLike aliases are only made when first used (see __getattr__).
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    # TODO: In Py3.9 onwards, ABCs can be subscripted directly
+    import typing  # noqa: I300 (TYPE_CHECKING is defined just above)
+    from functools import _CacheInfo
+    from typing import Optional, SupportsFloat, Tuple, TypedDict, Union
+
+    from ppb_vector.array import VectorArray  # noqa: F401
+    from ppb_vector.codec import pack_array, pack_vectors, unpack_vectors  # noqa: F401
+    from ppb_vector.components import ComponentTable, VectorField  # noqa: F401
+    from ppb_vector.curves import (  # noqa: F401
+        CatmullRom, CubicBezier, lerp, QuadraticBezier, slerp,
+    )
+    from ppb_vector.expression import Expression  # noqa: F401
+    from ppb_vector.geometry import (  # noqa: F401
+        closest_point, segment_distance, segment_distance_squared, segment_intersection,
+    )
+    from ppb_vector.grid import GridVector  # noqa: F401
+    from ppb_vector.instrumentation import instrument  # noqa: F401
+    from ppb_vector.interning import VectorInterner  # noqa: F401
+    from ppb_vector.parallel import ParallelExecutor  # noqa: F401
+    from ppb_vector.polyline import Polyline  # noqa: F401
+    from ppb_vector.shared import SharedVectorArray  # noqa: F401
+    from ppb_vector.spatial import KDTree, SpatialHash  # noqa: F401
+    from ppb_vector.transform import Transform2D  # noqa: F401
+
+if not TYPE_CHECKING:
+    def overload(f):
+        # Overloads are only meaningful to type checkers, and are replaced by
+        #  the implementation that follows them.
+        return f
+else:
+    from typing import overload
 
-__all__ = ('Vector',)
+__all__ = (
+    'Rotation', 'Vector', 'VectorAccumulator',
+    'register_vector_like', 'trig_cache_clear', 'trig_cache_info',
+)
 
 #: ppb_vector's current version.
 #: It follows the semantic versioning convention.
 __version__ = "1.0"
 
 
-# TODO: TypedDict is only available from the stdlib in Python 3.8 onwards
-if sys.version_info.minor >= 8:
-    from typing import TypedDict
-else:
-    from typing_extensions import TypedDict
-
-
-# Mappings convertable to Vector
-VectorLikeDict = TypedDict('VectorLikeDict', {'x': SupportsFloat, 'y': SupportsFloat})
-
+if TYPE_CHECKING:
+    # Mappings convertable to Vector
+    VectorLikeDict = TypedDict('VectorLikeDict', {'x': SupportsFloat, 'y': SupportsFloat})
+
+    # Anything convertable to a Vector, including lists, tuples, and dicts
+    VectorLike = Union[
+        'Vector',
+        'VectorAccumulator',
+        Tuple[SupportsFloat, SupportsFloat],
+        typing.Sequence[SupportsFloat],  # TODO: Length 2
+        VectorLikeDict,
+    ]
+
+
+def _type_aliases() -> typing.Dict[str, typing.Any]:
+    # Make the VectorLike aliases at runtime, for annotations evaluated by
+    #  other modules; this is the only use of `typing` here.
+    import typing
+
+    # TODO: TypedDict is only available from the stdlib in Python 3.8 onwards
+    if sys.version_info.minor >= 8:
+        from typing import TypedDict
+    else:
+        from typing_extensions import TypedDict
+
+    vector_like_dict = TypedDict(  # type: ignore
+        'VectorLikeDict', {'x': typing.SupportsFloat, 'y': typing.SupportsFloat},
+    )
+    return {
+        'VectorLikeDict': vector_like_dict,
+        'VectorLike': typing.Union[
+            'Vector',
+            'VectorAccumulator',
+            typing.Tuple[typing.SupportsFloat, typing.SupportsFloat],
+            typing.Sequence[typing.SupportsFloat],
+            vector_like_dict,
+        ],
+    }
 
-# Anything convertable to a Vector, including lists, tuples, and dicts
-VectorLike = Union[
-    'Vector',
-    Tuple[SupportsFloat, SupportsFloat],
-    typing.Sequence[SupportsFloat],  # TODO: Length 2
-    VectorLikeDict,
-]
 
-
-@dataclass(eq=False, frozen=True, init=False, repr=False)
 class Vector:
     """The immutable, 2D vector class of the PursuedPyBear project.
 
@@ -106,10 +167,10 @@ class Vector:
     # See https://www.python.org/dev/peps/pep-0622/#special-attribute-match-args
     __match_args__ = ('x', 'y')
 
-    @typing.overload
+    @overload
     def __new__(cls, x: SupportsFloat, y: SupportsFloat): pass
 
-    @typing.overload
+    @overload
     def __new__(cls, other: VectorLike): pass
 
     def __new__(cls, *args, **kwargs):
@@ -150,24 +211,30 @@ class Vector:
 
         self = super().__new__(cls)
 
-        try:
-            # The @dataclass decorator made the class frozen, so we need to
-            #  bypass the class' default assignment function :
-            #
-            #  https://docs.python.org/3/library/dataclasses.html#frozen-instances
-            object.__setattr__(self, 'x', float(x))
-        except ValueError as exc:
-            raise TypeError(f"{type(x).__name__} object not convertable to float") from exc
-
-        try:
-            object.__setattr__(self, 'y', float(y))
-        except ValueError as exc:
-            raise TypeError(f"{type(y).__name__} object not convertable to float") from exc
+        # Vector is frozen, so we need to bypass the class' assignment function.
+        object.__setattr__(self, 'x', _float(x))
+        object.__setattr__(self, 'y', _float(y))
 
         return self
 
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        # Like a frozen dataclass: coordinates are read-only, and so is any
+        #  attribute of Vector itself, but subclasses may add others.
+        if type(self) is Vector or name in ('x', 'y'):
+            raise _frozen(f"cannot assign to field {name!r}")
+
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if type(self) is Vector or name in ('x', 'y'):
+            raise _frozen(f"cannot delete field {name!r}")
+
+        super().__delattr__(name)
+
     def __reduce__(self):
-        return Vector, (self.x, self.y)
+        # Coordinates are already floats, so unpickling can use the trusted
+        #  construction path rather than going through Vector.__new__.
+        return _make, (self.x, self.y)
 
     def update(self, *,
                x: Optional[SupportsFloat] = None,
@@ -176,20 +243,17 @@ class Vector:
         if x is None and y is None:
             return self
 
-        return Vector(self.x if x is None else x,
-                      self.y if y is None else y)
+        return _make(self.x if x is None else _float(x),
+                     self.y if y is None else _float(y))
 
     @staticmethod
     def _unpack(value: VectorLike) -> Tuple[float, float]:
-        if isinstance(value, Vector):
-            return value.x, value.y
-        elif isinstance(value, Sequence) and len(value) == 2:
-            return float(value[0]), float(value[1])
-        elif isinstance(value, Mapping) and 'x' in value and 'y' in value and len(value) == 2:
-            return float(value['x']), float(value['y'])
-        else:
+        unpack = _unpacker(type(value))
+        if unpack is None:
             raise ValueError(f"Cannot use {value} as a vector-like")
 
+        return unpack(value)
+
     def __bool__(self) -> bool:
         """Check whether the vector is non-zero.
 
@@ -222,6 +286,40 @@ class Vector:
         """
         return {'x': self.x, 'y': self.y}
 
+    def to_bytes(self, *, typecode: str = 'd', byteorder: str = 'little') -> bytes:
+        """Encode a vector as the binary representation of its coordinates.
+
+        :param typecode: ``'d'`` to encode coordinates as double-precision
+          (64 bits) floats, or ``'f'`` for single-precision (32 bits) floats.
+        :param byteorder: ``'little'`` or ``'big'``, as in :py:meth:`int.to_bytes`.
+
+        >>> Vector(1, 2).to_bytes(typecode='f', byteorder='big')
+        b'?\\x80\\x00\\x00@\\x00\\x00\\x00'
+
+        Finite coordinates too large for single-precision floats raise
+        :py:class:`OverflowError`. The conversion can be reversed with
+        :py:meth:`from_bytes`.
+        """
+        try:
+            return _struct(typecode, byteorder).pack(self.x, self.y)
+        except struct.error as exc:
+            raise ValueError(str(exc)) from exc
+
+    @classmethod
+    def from_bytes(cls, data: bytes, *, typecode: str = 'd',
+                   byteorder: str = 'little') -> 'Vector':
+        """Decode a vector encoded by :py:meth:`to_bytes`, with the same parameters.
+
+        >>> v = Vector(42, 69)
+        >>> assert v == Vector.from_bytes(v.to_bytes())
+        """
+        try:
+            x, y = _struct(typecode, byteorder).unpack(data)
+        except struct.error as exc:
+            raise ValueError(str(exc)) from exc
+
+        return _make(x, y)
+
     def __len__(self) -> int:
         return 2
 
@@ -236,12 +334,16 @@ class Vector:
         >>> (0, 1) + Vector(1, 0)
         Vector(1.0, 1.0)
         """
+        unpack = _unpacker(type(other))
+        if unpack is None:
+            return NotImplemented
+
         try:
-            other_x, other_y = Vector._unpack(other)
+            other_x, other_y = unpack(other)
         except ValueError:
             return NotImplemented
 
-        return Vector(self.x + other_x, self.y + other_y)
+        return _make(self.x + other_x, self.y + other_y)
 
     def __radd__(self, other: VectorLike) -> 'Vector':
         return self + other
@@ -255,12 +357,16 @@ class Vector:
         >>> Vector(3, 3) - (1, 1)
         Vector(2.0, 2.0)
         """
+        unpack = _unpacker(type(other))
+        if unpack is None:
+            return NotImplemented
+
         try:
-            other_x, other_y = Vector._unpack(other)
+            other_x, other_y = unpack(other)
         except ValueError:
             return NotImplemented
 
-        return Vector(self.x - other_x, self.y - other_y)
+        return _make(self.x - other_x, self.y - other_y)
 
     def dot(self, other: VectorLike) -> float:
         """Compute the dot product of two vectors.
@@ -289,12 +395,12 @@ class Vector:
         >>> assert Vector(1, 2).scale_by(3) == 3 * Vector(1, 2)
         """
         scalar = float(scalar)
-        return Vector(scalar * self.x, scalar * self.y)
+        return _make(scalar * self.x, scalar * self.y)
 
-    @typing.overload
+    @overload
     def __mul__(self, other: VectorLike) -> float: pass
 
-    @typing.overload
+    @overload
     def __mul__(self, other: SupportsFloat) -> 'Vector': pass
 
     def __mul__(self, other):
@@ -328,15 +434,18 @@ class Vector:
         if isinstance(other, (float, int)):
             return self.scale_by(other)
 
+        if _unpacker(type(other)) is None:
+            return NotImplemented
+
         try:
             return self.dot(other)
         except (TypeError, ValueError):
             return NotImplemented
 
-    @typing.overload
+    @overload
     def __rmul__(self, other: VectorLike) -> float: pass
 
-    @typing.overload
+    @overload
     def __rmul__(self, other: SupportsFloat) -> 'Vector': pass
 
     def __rmul__(self, other):
@@ -349,7 +458,7 @@ class Vector:
         Vector(1.0, 1.0)
         """
         other = float(other)
-        return Vector(self.x / other, self.y / other)
+        return _make(self.x / other, self.y / other)
 
     def __getitem__(self, item: Union[str, int]) -> float:
         if hasattr(item, '__index__'):
@@ -383,13 +492,32 @@ class Vector:
         >>> Vector(1, 0) == (0, 1)
         False
         """
+        unpack = _unpacker(type(other))
+        if unpack is None:
+            return NotImplemented
+
         try:
-            other_x, other_y = Vector._unpack(other)
+            other_x, other_y = unpack(other)
         except (TypeError, ValueError):
             return NotImplemented
         else:
             return self.x == other_x and self.y == other_y
 
+    def __hash__(self) -> int:
+        """Compute a hash consistent with :py:meth:`__eq__`.
+
+        Vectors can be used as keys in dictionaries and sets:
+
+        >>> tiles = {Vector(0, 0): 'grass', Vector(1, 0): 'water'}
+        >>> tiles[Vector(1, 0)]
+        'water'
+
+        As vectors are equal to the corresponding tuples, they also hash alike:
+
+        >>> assert hash(Vector(1, 0)) == hash((1, 0))
+        """
+        return hash((self.x, self.y))
+
     def __iter__(self) -> typing.Iterator[float]:
         yield self.x
         yield self.y
@@ -460,36 +588,39 @@ class Vector:
         if abs_tol < 0 or rel_tol < 0:
             raise ValueError("Vector.isclose takes non-negative tolerances")
 
-        other = Vector(other)
+        # This is called in tight loops, so it works on unpacked coordinates
+        #  rather than making intermediate vectors.
+        x, y = self.x, self.y
+        if type(other) is Vector:
+            other_x, other_y = other.x, other.y  # type: ignore
+        else:
+            other_x, other_y = Vector._unpack(other)
+
+        rel_length = max(hypot(x, y), hypot(other_x, other_y))
+        for v in rel_to:
+            if type(v) is Vector:
+                length = hypot(v.x, v.y)  # type: ignore
+            else:
+                length = hypot(*Vector._unpack(v))
 
-        rel_length = max(
-            self.length,
-            other.length,
-            *map(lambda v: Vector(v).length, rel_to),
-        )
+            if length > rel_length:
+                rel_length = length
 
-        diff = (self - other).length
-        return (diff <= rel_tol * rel_length or diff <= float(abs_tol))
+        diff = hypot(x - other_x, y - other_y)
+        return (diff <= rel_tol * rel_length or diff <= abs_tol)
 
     @staticmethod
-    def _trig(angle: SupportsFloat) -> Tuple[float, float]:
-        r = radians(angle)
-        r_cos, r_sin = cos(r), sin(r)
-
-        if abs(r_cos) > abs(r_sin):
-            # From the equation sin(r)² + cos(r)² = 1, we get
-            #  sin(r) = ±√(1 - cos(r)²), so we can fix r_sin to that value
-            #  preserving its original sign.
-            # This way, r_sin² + r_cos² is closer to 1, meaning that the length
-            #  of rotated vectors is better preserved
-            r_sin = copysign(sqrt(1 - r_cos * r_cos), r_sin)
-        else:
-            # Same for r_cos
-            r_cos = copysign(sqrt(1 - r_sin * r_sin), r_cos)
+    def _trig(angle: 'Union[SupportsFloat, Rotation]') -> Tuple[float, float]:
+        if type(angle) is Rotation:
+            return angle._cos, angle._sin  # type: ignore
 
-        return r_cos, r_sin
+        try:
+            return _cached_trig(angle)  # type: ignore
+        except TypeError:
+            # Unhashable angles, like 0-dimensional NumPy arrays, can't be cached.
+            return _compute_trig(angle)  # type: ignore
 
-    def rotate(self, angle: SupportsFloat) -> 'Vector':
+    def rotate(self, angle: 'Union[SupportsFloat, Rotation]') -> 'Vector':
         """Rotate a vector.
 
         Rotate a vector in relation to the origin and return a new :py:class:`Vector`.
@@ -498,12 +629,14 @@ class Vector:
         Vector(0.0, 1.0)
 
         Positive rotation is counter/anti-clockwise.
+
+        :param angle: An angle in degrees, or a precomputed :py:class:`Rotation`.
         """
         r_cos, r_sin = Vector._trig(angle)
 
         x = self.x * r_cos - self.y * r_sin
         y = self.x * r_sin + self.y * r_cos
-        return Vector(x, y)
+        return _make(x, y)
 
     def normalize(self) -> 'Vector':
         """Return a vector with the same direction and unit length.
@@ -564,9 +697,11 @@ class Vector:
         if length == 0:
             return Vector.zero
 
-        return (length * self) / self.length
+        self_length = self.length
+        return _make((length * self.x) / self_length, (length * self.y) / self_length)
 
     def scale(self, length: SupportsFloat) -> 'Vector':
+        import warnings
         warnings.warn("Vector.scale was renamed to `scale_to`",
                       DeprecationWarning)
         return self.scale_to(length)
@@ -618,6 +753,482 @@ class Vector:
         p, _ = self.decompose(basis)
         return p
 
+    @classmethod
+    def sum(cls, vectors: typing.Iterable[VectorLike], *, exact: bool = False) -> 'Vector':
+        """Add up vector-likes, in a single pass.
+
+        >>> Vector.sum([(1, 2), Vector(3, 4), {'x': 5, 'y': 6}])
+        Vector(9.0, 12.0)
+
+        This is equivalent to ``sum(vectors, Vector.zero)``, but doesn't make a
+        :py:class:`Vector` for each partial sum.
+
+        :param exact: Compute the sum without accumulating rounding errors,
+          using :py:func:`math.fsum`:
+
+          >>> Vector.sum([(1e100, 1), (1, 1), (-1e100, 1)], exact=True)
+          Vector(1.0, 3.0)
+        """
+        batch = _batch(vectors)
+        if batch is not None:
+            if exact:
+                return _make(fsum(batch.x), fsum(batch.y))
+
+            return _make(float(batch.x.sum()), float(batch.y.sum()))
+
+        if exact:
+            xs, ys = _columns(vectors)
+            return _make(fsum(xs), fsum(ys))
+
+        x = y = 0.0
+        for other_x, other_y in map(Vector._unpack, vectors):
+            x += other_x
+            y += other_y
+
+        return _make(x, y)
+
+    @classmethod
+    def mean(cls, vectors: typing.Iterable[VectorLike], *, exact: bool = False) -> 'Vector':
+        """Compute the average of vector-likes, in a single pass.
+
+        >>> Vector.mean([(0, 0), (1, 2), (2, 4)])
+        Vector(1.0, 2.0)
+
+        :param exact: Compute the sum without accumulating rounding errors,
+          as in :py:meth:`sum`.
+        """
+        batch = _batch(vectors)
+        if batch is not None:
+            count = len(batch)
+            total = Vector.sum(batch, exact=exact)
+        elif exact:
+            xs, ys = _columns(vectors)
+            count = len(xs)
+            total = _make(fsum(xs), fsum(ys))
+        else:
+            count = 0
+            x = y = 0.0
+            for other_x, other_y in map(Vector._unpack, vectors):
+                x += other_x
+                y += other_y
+                count += 1
+
+            total = _make(x, y)
+
+        if count == 0:
+            raise ValueError("Vector.mean requires at least one vector")
+
+        return total / count
+
+    @classmethod
+    def weighted_mean(cls, vectors: typing.Iterable[VectorLike],
+                      weights: typing.Iterable[SupportsFloat], *,
+                      exact: bool = False) -> 'Vector':
+        """Compute the weighted average of vector-likes, in a single pass.
+
+        :param weights: The weight of each vector-like, in the same order.
+          Their total must be non-zero.
+
+        >>> Vector.weighted_mean([(0, 0), (4, 8)], [3, 1])
+        Vector(1.0, 2.0)
+
+        :param exact: Compute the sums without accumulating rounding errors,
+          as in :py:meth:`sum`.
+        """
+        batch = _batch(vectors)
+        if batch is not None:
+            import numpy as np
+            ws = np.asarray(weights, dtype=np.float64)
+            if ws.shape != (len(batch),):
+                raise ValueError(f"Vector.weighted_mean requires as many weights as vectors, "
+                                 f"got {len(batch)} vectors and weights of shape {ws.shape}")
+            columns = (ws * batch.x, ws * batch.y, ws)
+            if exact:
+                x, y, total = map(fsum, columns)
+            else:
+                x, y, total = (float(column.sum()) for column in columns)
+
+        else:
+            # Iterators are consumed upfront, to check there is a weight per vector.
+            if not isinstance(vectors, Sized):
+                vectors = list(vectors)
+            if not isinstance(weights, Sized):
+                weights = list(weights)
+            if len(vectors) != len(weights):
+                raise ValueError(f"Vector.weighted_mean requires as many weights as vectors, "
+                                 f"got {len(vectors)} vectors and {len(weights)} weights")
+
+            if exact:
+                xs: typing.List[float] = []
+                ys: typing.List[float] = []
+                ws_list: typing.List[float] = []
+                for (other_x, other_y), weight in zip(map(Vector._unpack, vectors), weights):
+                    weight = float(weight)
+                    xs.append(weight * other_x)
+                    ys.append(weight * other_y)
+                    ws_list.append(weight)
+
+                x, y, total = fsum(xs), fsum(ys), fsum(ws_list)
+
+            else:
+                x = y = total = 0.0
+                for (other_x, other_y), weight in zip(map(Vector._unpack, vectors), weights):
+                    weight = float(weight)
+                    x += weight * other_x
+                    y += weight * other_y
+                    total += weight
+
+        if total == 0:
+            raise ValueError("Vector.weighted_mean requires a non-zero total weight")
+
+        return _make(x / total, y / total)
+
+    @classmethod
+    def centroid(cls, vertices: typing.Iterable[VectorLike]) -> 'Vector':
+        """Compute the centroid of a polygon, in a single pass.
+
+        :param vertices: The vertices of a non-self-intersecting polygon, in order.
+
+        Unlike :py:meth:`mean`, this is the center of mass of the polygon's
+        surface, not of its vertices:
+
+        >>> Vector.centroid([(0, 0), (4, 0), (4, 1), (1, 1), (1, 4), (0, 4)])
+        Vector(1.3571428571428572, 1.3571428571428572)
+
+        The polygon must have a non-zero area.
+        """
+        batch = _batch(vertices)
+        if batch is not None:
+            import numpy as np
+            if len(batch) == 0:
+                raise ValueError("Vector.centroid requires at least one vector")
+
+            x0, y0 = float(batch.x[0]), float(batch.y[0])
+            rel_x, rel_y = batch.x - x0, batch.y - y0
+            next_x, next_y = np.roll(rel_x, -1), np.roll(rel_y, -1)
+            crosses = rel_x * next_y - next_x * rel_y
+            area2 = float(crosses.sum())
+            cx = float(((rel_x + next_x) * crosses).sum())
+            cy = float(((rel_y + next_y) * crosses).sum())
+        else:
+            coordinates = map(Vector._unpack, vertices)
+            try:
+                x0, y0 = next(coordinates)
+            except StopIteration:
+                raise ValueError("Vector.centroid requires at least one vector") from None
+
+            # Coordinates are taken relative to the first vertex, which reduces
+            #  rounding errors, and means the closing edge contributes nothing.
+            area2 = cx = cy = 0.0
+            prev_x = prev_y = 0.0
+            for x, y in coordinates:
+                x, y = x - x0, y - y0
+                cross = prev_x * y - x * prev_y
+                area2 += cross
+                cx += (prev_x + x) * cross
+                cy += (prev_y + y) * cross
+                prev_x, prev_y = x, y
+
+        if area2 == 0:
+            raise ValueError("Vector.centroid requires a polygon with a non-zero area")
+
+        return _make(x0 + cx / (3 * area2), y0 + cy / (3 * area2))
+
+    @classmethod
+    def min(cls, vectors: typing.Iterable[VectorLike]) -> 'Vector':
+        """Get the shortest of some vector-likes, in a single pass.
+
+        >>> Vector.min([(3, 4), (0, -1), (2, 0)])
+        Vector(0.0, -1.0)
+
+        If several are equally short, the first one is returned.
+        """
+        batch = _batch(vectors)
+        if batch is not None:
+            if len(batch) == 0:
+                raise ValueError("Vector.min requires at least one vector")
+
+            return batch[int(batch.length.argmin())]
+
+        best, best_length = None, 0.0
+        for v in vectors:
+            length = hypot(*Vector._unpack(v))
+            if best is None or length < best_length:
+                best, best_length = v, length
+
+        if best is None:
+            raise ValueError("Vector.min requires at least one vector")
+
+        return Vector(best)
+
+    @classmethod
+    def max(cls, vectors: typing.Iterable[VectorLike]) -> 'Vector':
+        """Get the longest of some vector-likes, in a single pass.
+
+        >>> Vector.max([(3, 4), (0, -1), (2, 0)])
+        Vector(3.0, 4.0)
+
+        If several are equally long, the first one is returned.
+        """
+        batch = _batch(vectors)
+        if batch is not None:
+            if len(batch) == 0:
+                raise ValueError("Vector.max requires at least one vector")
+
+            return batch[int(batch.length.argmax())]
+
+        best, best_length = None, 0.0
+        for v in vectors:
+            length = hypot(*Vector._unpack(v))
+            if best is None or length > best_length:
+                best, best_length = v, length
+
+        if best is None:
+            raise ValueError("Vector.max requires at least one vector")
+
+        return Vector(best)
+
+    @classmethod
+    def bounding_box(cls, vectors: typing.Iterable[VectorLike]) -> 'Tuple[Vector, Vector]':
+        """Compute the axis-aligned bounding box of some vector-likes, in a single pass.
+
+        It is returned as its lower and upper corners:
+
+        >>> Vector.bounding_box([(3, -4), (0, 1), (-2, 0)])
+        (Vector(-2.0, -4.0), Vector(3.0, 1.0))
+        """
+        batch = _batch(vectors)
+        if batch is not None:
+            if len(batch) == 0:
+                raise ValueError("Vector.bounding_box requires at least one vector")
+
+            return (_make(float(batch.x.min()), float(batch.y.min())),
+                    _make(float(batch.x.max()), float(batch.y.max())))
+
+        coordinates = map(Vector._unpack, vectors)
+        try:
+            min_x, min_y = max_x, max_y = next(coordinates)
+        except StopIteration:
+            raise ValueError("Vector.bounding_box requires at least one vector") from None
+
+        for x, y in coordinates:
+            if x < min_x:
+                min_x = x
+            elif x > max_x:
+                max_x = x
+
+            if y < min_y:
+                min_y = y
+            elif y > max_y:
+                max_y = y
+
+        return _make(min_x, min_y), _make(max_x, max_y)
+
+
+if TYPE_CHECKING:
+    # Converts a vector-like of a given type to its coordinates, raising ValueError
+    #  if a particular value cannot be used (for instance, a sequence of length 3).
+    Unpacker = typing.Callable[[typing.Any], Tuple[float, float]]
+
+
+def _unpack_vector(value: Vector) -> Tuple[float, float]:
+    return value.x, value.y
+
+
+def _unpack_sequence(value: typing.Sequence[SupportsFloat]) -> Tuple[float, float]:
+    if len(value) != 2:
+        raise ValueError(f"Cannot use {value} as a vector-like")
+
+    return float(value[0]), float(value[1])
+
+
+def _unpack_mapping(value: typing.Mapping[str, SupportsFloat]) -> Tuple[float, float]:
+    if 'x' not in value or 'y' not in value or len(value) != 2:
+        raise ValueError(f"Cannot use {value} as a vector-like")
+
+    return float(value['x']), float(value['y'])
+
+
+def _unpack_ndarray(value: typing.Any) -> Tuple[float, float]:
+    if value.shape != (2,):
+        raise ValueError(f"Cannot use {value} as a vector-like")
+
+    return float(value[0]), float(value[1])
+
+
+# Unpackers declared with register_vector_like, including ``None`` for types
+#  which were declared not to be vector-likes.
+_registry: typing.Dict[type, Optional[Unpacker]] = {
+    Vector: _unpack_vector,
+    # Scalars are commonly used as operands, for instance in Vector.__mul__
+    float: None,
+    int: None,
+}
+
+# Unpacker for each concrete type seen so far, or None if it is known not to
+#  be a vector-like. This avoids costly isinstance checks against the ABCs.
+_unpackers: typing.Dict[type, Optional[Unpacker]] = {}
+
+
+def _find_unpacker(cls: type) -> Optional[Unpacker]:
+    for base in cls.__mro__:
+        if base in _registry:
+            return _registry[base]
+
+    if issubclass(cls, Sequence):
+        return _unpack_sequence
+    elif issubclass(cls, Mapping):
+        return _unpack_mapping
+    elif cls.__module__ == 'numpy' and cls.__name__ == 'ndarray':
+        # Checked by name, to avoid importing NumPy.
+        return _unpack_ndarray
+    else:
+        return None
+
+
+def _unpacker(cls: type) -> Optional[Unpacker]:
+    try:
+        return _unpackers[cls]
+    except KeyError:
+        unpack = _unpackers[cls] = _find_unpacker(cls)
+        return unpack
+
+
+def register_vector_like(cls: type, unpack: Optional[Unpacker]) -> None:
+    """Declare how instances of ``cls`` (and its subclasses) convert to vectors.
+
+    :param unpack: A function returning the ``x`` and ``y`` coordinates, as
+      floats, of an instance of ``cls``. It should raise :py:class:`ValueError`
+      for instances which cannot be used as vectors.
+
+      Passing ``None`` declares that ``cls`` isn't a vector-like, so operations
+      between it and a :py:class:`Vector` return :py:data:`NotImplemented`
+      without any further checks.
+
+    >>> class Point:
+    ...     def __init__(self, x, y):
+    ...         self.x, self.y = x, y
+    >>> register_vector_like(Point, lambda p: (float(p.x), float(p.y)))
+    >>> Vector(1, 1) + Point(2, 3)
+    Vector(3.0, 4.0)
+    """
+    _registry[cls] = unpack
+    # Registering a type may change the unpacker of its subclasses.
+    _unpackers.clear()
+
+
+def _batch(vectors: typing.Any) -> 'Optional[VectorArray]':
+    # Checking for VectorArray only if ppb_vector.array was already imported
+    #  avoids requiring (and importing) NumPy when there cannot be batches.
+    module = sys.modules.get('ppb_vector.array')
+    if module is not None and isinstance(vectors, module.VectorArray):
+        return vectors
+
+    return None
+
+
+def _is_scalar(value: typing.Any) -> bool:
+    # Whether a parameter is a single number, rather than a batch of them.
+    #  Like float(), this accepts NumPy scalars, Fractions and Decimals.
+    if isinstance(value, (float, int)):
+        return True
+
+    ndim = getattr(value, 'ndim', None)
+    if ndim is not None:
+        return ndim == 0
+
+    return not isinstance(value, Sequence)
+
+
+def _columns(vectors: typing.Iterable[VectorLike]) -> Tuple[typing.List[float], typing.List[float]]:
+    xs: typing.List[float] = []
+    ys: typing.List[float] = []
+    for x, y in map(Vector._unpack, vectors):
+        xs.append(x)
+        ys.append(y)
+
+    return xs, ys
+
+
+def _compute_trig(angle: SupportsFloat) -> Tuple[float, float]:
+    r = radians(angle)
+    r_cos, r_sin = cos(r), sin(r)
+
+    if abs(r_cos) > abs(r_sin):
+        # From the equation sin(r)² + cos(r)² = 1, we get
+        #  sin(r) = ±√(1 - cos(r)²), so we can fix r_sin to that value
+        #  preserving its original sign.
+        # This way, r_sin² + r_cos² is closer to 1, meaning that the length
+        #  of rotated vectors is better preserved
+        r_sin = copysign(sqrt(1 - r_cos * r_cos), r_sin)
+    else:
+        # Same for r_cos
+        r_cos = copysign(sqrt(1 - r_sin * r_sin), r_cos)
+
+    return r_cos, r_sin
+
+
+#: How many angles :py:meth:`Vector.rotate` keeps the trigonometric values of.
+#: The least-recently used angles are evicted first.
+TRIG_CACHE_SIZE = 1024
+
+_cached_trig = lru_cache(maxsize=TRIG_CACHE_SIZE)(_compute_trig)
+
+
+def trig_cache_info() -> '_CacheInfo':
+    """Get statistics about the cache used by :py:meth:`Vector.rotate`.
+
+    This returns a named tuple with fields ``hits``, ``misses``, ``maxsize`` and
+    ``currsize``, like :py:func:`functools.lru_cache`'s ``cache_info``.
+    """
+    return _cached_trig.cache_info()
+
+
+def trig_cache_clear() -> None:
+    """Clear the cache used by :py:meth:`Vector.rotate`, and its statistics."""
+    _cached_trig.cache_clear()
+
+
+# Binary layouts of vectors, by typecode and byte order.
+_STRUCTS = {
+    (typecode, byteorder): struct.Struct(prefix + 2 * typecode)
+    for typecode in 'df'
+    for byteorder, prefix in (('little', '<'), ('big', '>'))
+}
+
+
+def _struct(typecode: str, byteorder: str) -> struct.Struct:
+    try:
+        return _STRUCTS[typecode, byteorder]
+    except KeyError:
+        raise ValueError(f"Unsupported typecode {typecode!r} or byteorder {byteorder!r}") from None
+
+
+def _float(value: SupportsFloat) -> float:
+    try:
+        return float(value)
+    except ValueError as exc:
+        raise TypeError(f"{type(value).__name__} object not convertable to float") from exc
+
+
+# Slot descriptors, used to initialise instances without going through the
+#  frozen Vector.__setattr__.
+_set_x = Vector.__dict__['x'].__set__
+_set_y = Vector.__dict__['y'].__set__
+
+
+def _make(x: float, y: float) -> Vector:
+    """Make a :py:class:`Vector` from coordinates which are already floats.
+
+    This is the trusted construction path used by operators, which compute
+    their results from already-validated floats: it skips the argument
+    handling and coercions done by :py:meth:`Vector.__new__`.
+    """
+    self = object.__new__(Vector)
+    _set_x(self, x)
+    _set_y(self, y)
+    return self
+
 
 Vector.x_unit = Vector(1, 0)
 Vector.y_unit = Vector(0, 1)
@@ -625,3 +1236,266 @@ Vector.zero = Vector(0, 0)
 
 
 Sequence.register(Vector)
+
+
+class VectorAccumulator:
+    """A mutable 2D vector, for accumulating many contributions in place.
+
+    Adding vectors in a loop, with :py:meth:`Vector.__add__`, makes a new
+    :py:class:`Vector` at each step. A :py:class:`VectorAccumulator` is updated
+    in place instead, and can be converted to an immutable :py:class:`Vector`
+    when done:
+
+    >>> acc = VectorAccumulator()
+    >>> for force in [(1, 0), Vector(0, 2), {'x': -3, 'y': 1}]:
+    ...     acc += force
+    >>> acc.freeze()
+    Vector(-2.0, 3.0)
+
+    Its in-place operations accept the same vector-likes as :py:class:`Vector`,
+    and return the accumulator itself so they can be chained:
+
+    >>> VectorAccumulator((1, 0)).iscale(2).irotate(90).freeze()
+    Vector(0.0, 2.0)
+
+    A :py:class:`VectorAccumulator` is itself a vector-like:
+
+    >>> Vector(1, 1) + VectorAccumulator((1, 2))
+    Vector(2.0, 3.0)
+    """
+
+    __slots__ = ('x', 'y')
+
+    x: float
+    y: float
+
+    # Accumulators compare equal to vectors, but are mutable, so unhashable.
+    __hash__ = None  # type: ignore
+
+    def __init__(self, initial: VectorLike = Vector.zero):
+        self.x, self.y = Vector._unpack(initial)
+
+    def __repr__(self) -> str:
+        return f"VectorAccumulator({self.x}, {self.y})"
+
+    def freeze(self) -> Vector:
+        """Make an immutable :py:class:`Vector` with the current value."""
+        return _make(self.x, self.y)
+
+    def reset(self, value: VectorLike = Vector.zero) -> 'VectorAccumulator':
+        """Set the accumulator to ``value``, the null vector by default."""
+        self.x, self.y = Vector._unpack(value)
+        return self
+
+    def iadd(self, other: VectorLike) -> 'VectorAccumulator':
+        """Add a vector-like in place."""
+        other_x, other_y = Vector._unpack(other)
+        self.x += other_x
+        self.y += other_y
+        return self
+
+    __iadd__ = iadd
+
+    def isub(self, other: VectorLike) -> 'VectorAccumulator':
+        """Subtract a vector-like in place."""
+        other_x, other_y = Vector._unpack(other)
+        self.x -= other_x
+        self.y -= other_y
+        return self
+
+    __isub__ = isub
+
+    def iscale(self, scalar: SupportsFloat) -> 'VectorAccumulator':
+        """Multiply by a scalar in place."""
+        scalar = float(scalar)
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def iadd_scaled(self, other: VectorLike, scalar: SupportsFloat) -> 'VectorAccumulator':
+        """Add ``scalar * other`` in place, without making an intermediate vector.
+
+        >>> position, velocity = VectorAccumulator((1, 1)), Vector(2, 0)
+        >>> position.iadd_scaled(velocity, 0.5)
+        VectorAccumulator(2.0, 1.0)
+        """
+        other_x, other_y = Vector._unpack(other)
+        scalar = float(scalar)
+        self.x += scalar * other_x
+        self.y += scalar * other_y
+        return self
+
+    def irotate(self, angle: 'Union[SupportsFloat, Rotation]') -> 'VectorAccumulator':
+        """Rotate in place, as :py:meth:`Vector.rotate` does."""
+        r_cos, r_sin = Vector._trig(angle)
+        x, y = self.x, self.y
+        self.x = x * r_cos - y * r_sin
+        self.y = x * r_sin + y * r_cos
+        return self
+
+
+register_vector_like(VectorAccumulator, _unpack_vector)  # type: ignore
+
+
+class Rotation:
+    """A rotation by a fixed angle, with its trigonometric values precomputed.
+
+    Rotating many vectors by the same angle with a :py:class:`Rotation` skips
+    computing the same sine and cosine each time:
+
+    >>> quarter_turn = Rotation(90)
+    >>> Vector(1, 0).rotate(quarter_turn)
+    Vector(0.0, 1.0)
+    >>> quarter_turn.apply((0, 1))
+    Vector(-1.0, 0.0)
+
+    As with :py:meth:`Vector.rotate`, angles are expressed in degrees and
+    positive rotations are counter-clockwise.
+
+    Rotations compose by adding their angles, and can be inverted:
+
+    >>> Rotation(30) + Rotation(60)
+    Rotation(90.0)
+    >>> -Rotation(90)
+    Rotation(-90.0)
+    """
+
+    __slots__ = ('_angle', '_cos', '_sin')
+
+    _angle: float
+    _cos: float
+    _sin: float
+
+    def __init__(self, angle: SupportsFloat):
+        self._angle = float(angle)
+        self._cos, self._sin = Vector._trig(self._angle)
+
+    @classmethod
+    def _make(cls, angle: float, r_cos: float, r_sin: float) -> 'Rotation':
+        self = cls.__new__(cls)
+        self._angle, self._cos, self._sin = angle, r_cos, r_sin
+        return self
+
+    @property
+    def angle(self) -> float:
+        """The angle of the rotation, in degrees."""
+        return self._angle
+
+    @property
+    def cos(self) -> float:
+        """The cosine of the angle, as used by :py:meth:`Vector.rotate`."""
+        return self._cos
+
+    @property
+    def sin(self) -> float:
+        """The sine of the angle, as used by :py:meth:`Vector.rotate`."""
+        return self._sin
+
+    def __repr__(self) -> str:
+        return f"Rotation({self._angle})"
+
+    def __eq__(self, other: typing.Any) -> bool:
+        if not isinstance(other, Rotation):
+            return NotImplemented
+
+        return self._angle == other._angle
+
+    def __hash__(self) -> int:
+        return hash(self._angle)
+
+    def __add__(self, other: 'Rotation') -> 'Rotation':
+        """Compose two rotations, which is equivalent to adding their angles."""
+        if not isinstance(other, Rotation):
+            return NotImplemented
+
+        return Rotation(self._angle + other._angle)
+
+    def __sub__(self, other: 'Rotation') -> 'Rotation':
+        if not isinstance(other, Rotation):
+            return NotImplemented
+
+        return Rotation(self._angle - other._angle)
+
+    def inverse(self) -> 'Rotation':
+        """Get the rotation by the opposite angle.
+
+        >>> Rotation(90).inverse()
+        Rotation(-90.0)
+        """
+        return Rotation._make(-self._angle, self._cos, -self._sin)
+
+    __neg__ = inverse
+
+    @overload
+    def apply(self, vectors: VectorLike) -> Vector: pass
+
+    @overload
+    def apply(self, vectors: 'VectorArray') -> 'VectorArray': pass
+
+    def apply(self, vectors):
+        """Rotate a vector-like, or a whole :py:class:`VectorArray`."""
+        batch = _batch(vectors)
+        if batch is not None:
+            return batch.rotate(self)
+
+        x, y = Vector._unpack(vectors)
+        return _make(x * self._cos - y * self._sin, x * self._sin + y * self._cos)
+
+
+# Public names provided by submodules, which are only imported on first use.
+#  This keeps optional dependencies, like NumPy, from being required by Vector.
+_LAZY_EXPORTS = {
+    'CatmullRom': 'ppb_vector.curves',
+    'closest_point': 'ppb_vector.geometry',
+    'ComponentTable': 'ppb_vector.components',
+    'CubicBezier': 'ppb_vector.curves',
+    'Expression': 'ppb_vector.expression',
+    'GridVector': 'ppb_vector.grid',
+    'instrument': 'ppb_vector.instrumentation',
+    'KDTree': 'ppb_vector.spatial',
+    'lerp': 'ppb_vector.curves',
+    'pack_array': 'ppb_vector.codec',
+    'pack_vectors': 'ppb_vector.codec',
+    'ParallelExecutor': 'ppb_vector.parallel',
+    'Polyline': 'ppb_vector.polyline',
+    'QuadraticBezier': 'ppb_vector.curves',
+    'unpack_vectors': 'ppb_vector.codec',
+    'segment_distance': 'ppb_vector.geometry',
+    'segment_distance_squared': 'ppb_vector.geometry',
+    'segment_intersection': 'ppb_vector.geometry',
+    'SharedVectorArray': 'ppb_vector.shared',
+    'slerp': 'ppb_vector.curves',
+    'SpatialHash': 'ppb_vector.spatial',
+    'Transform2D': 'ppb_vector.transform',
+    'VectorArray': 'ppb_vector.array',
+    'VectorField': 'ppb_vector.components',
+    'VectorInterner': 'ppb_vector.interning',
+}
+
+
+def _frozen(message: str) -> AttributeError:
+    # Raised on assignments to vectors; dataclasses is only imported then.
+    from dataclasses import FrozenInstanceError
+    return FrozenInstanceError(message)
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name in ('VectorLike', 'VectorLikeDict'):
+        aliases = _type_aliases()
+        globals().update(aliases)
+        return aliases[name]
+
+    try:
+        module = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    from importlib import import_module
+    return getattr(import_module(module), name)
+
+
+# Instrumentation, which replaces Vector's methods, is opt-in: see
+#  ppb_vector.instrumentation.
+if os.environ.get('PPB_VECTOR_INSTRUMENT'):
+    from ppb_vector import instrumentation
+    instrumentation._enable_from_environment(os.environ['PPB_VECTOR_INSTRUMENT'])
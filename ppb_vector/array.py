@@ -0,0 +1,527 @@
+"""Batches of 2D vectors, backed by NumPy.
+
+:py:class:`VectorArray` stores many vectors as two contiguous columns of
+``float64`` coordinates, and mirrors the :py:class:`Vector <ppb_vector.Vector>`
+API so that a whole population can be updated in a single call:
+
+>>> from ppb_vector import Vector, VectorArray
+>>> positions = VectorArray([(0, 0), (1, 2), (3, 4)])
+>>> positions + Vector(1, 1)
+VectorArray([Vector(1.0, 1.0), Vector(2.0, 3.0), Vector(4.0, 5.0)])
+
+This module requires NumPy, which is an optional dependency of ``ppb-vector``.
+"""
+import typing
+from typing import Optional, SupportsFloat, Tuple, Union
+
+import numpy as np
+
+from ppb_vector import _is_scalar, _make, _unpacker, Rotation, Vector, VectorLike
+
+__all__ = ('VectorArray',)
+
+
+# A coordinate is either a single float, broadcast against the whole batch,
+#  or a column with one entry per vector of the batch.
+Coordinate = Union[float, np.ndarray]
+
+# Anything that VectorArray operations broadcast against.
+VectorArrayLike = Union['VectorArray', VectorLike, np.ndarray]
+
+# Either a single scalar or one scalar per vector in the batch.
+Scalars = Union[SupportsFloat, np.ndarray]
+
+
+def _is_unit(length: Coordinate) -> bool:
+    """Vectorised equivalent of ``math.isclose(length, 1)`` over a batch."""
+    return bool(np.all(np.abs(length - 1) <= 1e-09 * np.maximum(np.abs(length), 1)))
+
+
+def _trig(angle: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorised equivalent of :py:meth:`Vector._trig`, over angles in degrees."""
+    r = np.radians(angle)
+    r_cos, r_sin = np.cos(r), np.sin(r)
+
+    # Same correction as in Vector._trig, to better preserve lengths.
+    fix_sin = np.abs(r_cos) > np.abs(r_sin)
+    r_sin = np.where(fix_sin, np.copysign(np.sqrt(1 - r_cos * r_cos), r_sin), r_sin)
+    r_cos = np.where(fix_sin, r_cos, np.copysign(np.sqrt(1 - r_sin * r_sin), r_cos))
+    return r_cos, r_sin
+
+
+class VectorArray:
+    """A mutable batch of 2D vectors.
+
+    A :py:class:`VectorArray` can be made from any iterable of vector-likes,
+    and indexing it produces :py:class:`Vector <ppb_vector.Vector>` instances:
+
+    >>> a = VectorArray([Vector(3, 4), (1, 0), {'x': 0, 'y': 1}])
+    >>> len(a)
+    3
+    >>> a[0]
+    Vector(3.0, 4.0)
+
+    Operations broadcast against a single vector-like, against another
+    :py:class:`VectorArray` of the same length, and (for scalar parameters)
+    against a NumPy array holding one scalar per vector:
+
+    >>> a.scale_by(2)
+    VectorArray([Vector(6.0, 8.0), Vector(2.0, 0.0), Vector(0.0, 2.0)])
+    >>> a.length
+    array([5., 1., 1.])
+    """
+
+    __slots__ = ('_data', '__weakref__')
+
+    _data: np.ndarray
+
+    # Leave arithmetic with NumPy arrays to VectorArray's reflected operators.
+    __array_ufunc__ = None
+
+    def __init__(self, vectors: typing.Iterable[VectorLike] = ()):
+        if isinstance(vectors, VectorArray):
+            self._data = vectors._data.copy()
+            return
+
+        if isinstance(vectors, np.ndarray):
+            data = np.asarray(vectors, dtype=np.float64)
+            if data.ndim != 2 or data.shape[1] != 2:
+                raise ValueError(f"Expected an array of shape (N, 2), got {data.shape}")
+
+            self._data = np.ascontiguousarray(data.T)
+            return
+
+        xs, ys = [], []
+        for v in vectors:
+            x, y = Vector._unpack(v)
+            xs.append(x)
+            ys.append(y)
+
+        self._data = np.array((xs, ys), dtype=np.float64).reshape(2, len(xs))
+
+    @classmethod
+    def _wrap(cls, data: np.ndarray) -> 'VectorArray':
+        # Make a VectorArray sharing `data`, which must be a (2, N) float64 array.
+        self = cls.__new__(cls)
+        self._data = data
+        return self
+
+    @classmethod
+    def from_columns(cls, x: typing.Iterable[SupportsFloat],
+                     y: typing.Iterable[SupportsFloat]) -> 'VectorArray':
+        """Make a batch from separate columns of ``x`` and ``y`` coordinates.
+
+        >>> VectorArray.from_columns([1, 2], [3, 4])
+        VectorArray([Vector(1.0, 3.0), Vector(2.0, 4.0)])
+        """
+        xs = np.asarray(x, dtype=np.float64)
+        ys = np.asarray(y, dtype=np.float64)
+        if xs.ndim != 1 or xs.shape != ys.shape:
+            raise ValueError("Expected two 1-dimensional columns of the same length")
+
+        return cls._wrap(np.stack((xs, ys)))
+
+    @classmethod
+    def zeros(cls, length: int) -> 'VectorArray':
+        """Make a batch of ``length`` null vectors.
+
+        >>> VectorArray.zeros(2)
+        VectorArray([Vector(0.0, 0.0), Vector(0.0, 0.0)])
+        """
+        return cls._wrap(np.zeros((2, length), dtype=np.float64))
+
+    @property
+    def x(self) -> np.ndarray:
+        """The column of ``x`` coordinates, as a writable view."""
+        return self._data[0]
+
+    @property
+    def y(self) -> np.ndarray:
+        """The column of ``y`` coordinates, as a writable view."""
+        return self._data[1]
+
+    def __len__(self) -> int:
+        return self._data.shape[1]
+
+    def __iter__(self) -> typing.Iterator[Vector]:
+        for x, y in zip(self._data[0].tolist(), self._data[1].tolist()):
+            yield _make(x, y)
+
+    @typing.overload
+    def __getitem__(self, item: int) -> Vector: pass
+
+    @typing.overload
+    def __getitem__(self, item: Union[slice, np.ndarray]) -> 'VectorArray': pass
+
+    def __getitem__(self, item):
+        """Get a single :py:class:`Vector <ppb_vector.Vector>` or a sub-batch.
+
+        Slicing produces a view sharing the coordinates of the original batch,
+        while indexing with an array (of integers or booleans) produces a copy.
+
+        >>> a = VectorArray([(1, 2), (3, 4), (5, 6)])
+        >>> a[-1]
+        Vector(5.0, 6.0)
+        >>> a[1:]
+        VectorArray([Vector(3.0, 4.0), Vector(5.0, 6.0)])
+        """
+        if hasattr(item, '__index__'):
+            x, y = self._data[:, item.__index__()].tolist()
+            return _make(x, y)
+
+        return VectorArray._wrap(self._data[:, item])
+
+    def __setitem__(self, item, value: VectorArrayLike) -> None:
+        if isinstance(value, VectorArray):
+            x, y = value._data
+        else:
+            x, y = Vector._unpack(value)  # type: ignore
+
+        self._data[0, item] = x
+        self._data[1, item] = y
+
+    def __repr__(self) -> str:
+        return f"VectorArray([{', '.join(map(repr, self))}])"
+
+    # VectorArray is mutable, hence unhashable.
+    __hash__ = None  # type: ignore
+
+    def _operand(self, other: VectorArrayLike) -> Tuple[Coordinate, Coordinate]:
+        """Get the coordinates of ``other``, as columns or as single values.
+
+        Raises :py:class:`ValueError` if ``other`` cannot be broadcast against self.
+        """
+        if isinstance(other, VectorArray):
+            if len(other) != len(self):
+                raise ValueError(f"Cannot broadcast a batch of {len(other)} vectors "
+                                 f"against one of {len(self)}")
+            return other._data[0], other._data[1]
+
+        if isinstance(other, np.ndarray) and other.ndim == 2:
+            return self._operand(VectorArray(other))
+
+        return Vector._unpack(other)  # type: ignore
+
+    def _scalars(self, value: Scalars) -> Coordinate:
+        """Convert a scalar, or a column with a scalar per vector, to floats."""
+        if isinstance(value, np.ndarray) and value.ndim > 0:
+            if value.shape != (len(self),):
+                raise ValueError(f"Expected {len(self)} scalars, got shape {value.shape}")
+            return value.astype(np.float64, copy=False)
+
+        return float(value)
+
+    def __eq__(self, other: typing.Any) -> np.ndarray:  # type: ignore
+        """Compare vectors elementwise, producing a boolean mask.
+
+        >>> VectorArray([(1, 0), (0, 1)]) == (0, 1)
+        array([False,  True])
+        """
+        try:
+            other_x, other_y = self._operand(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+
+        return (self._data[0] == other_x) & (self._data[1] == other_y)
+
+    def __ne__(self, other: typing.Any) -> np.ndarray:  # type: ignore
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+
+        return ~result
+
+    def __add__(self, other: VectorArrayLike) -> 'VectorArray':
+        """Add vectors elementwise.
+
+        >>> VectorArray([(1, 0), (0, 1)]) + (1, 1)
+        VectorArray([Vector(2.0, 1.0), Vector(1.0, 2.0)])
+        """
+        try:
+            other_x, other_y = self._operand(other)
+        except ValueError:
+            return NotImplemented
+
+        return VectorArray._wrap(np.stack((self._data[0] + other_x, self._data[1] + other_y)))
+
+    def __radd__(self, other: VectorArrayLike) -> 'VectorArray':
+        return self + other
+
+    def __sub__(self, other: VectorArrayLike) -> 'VectorArray':
+        """Subtract vectors elementwise.
+
+        >>> VectorArray([(1, 0), (0, 1)]) - (1, 1)
+        VectorArray([Vector(0.0, -1.0), Vector(-1.0, 0.0)])
+        """
+        try:
+            other_x, other_y = self._operand(other)
+        except ValueError:
+            return NotImplemented
+
+        return VectorArray._wrap(np.stack((self._data[0] - other_x, self._data[1] - other_y)))
+
+    def __rsub__(self, other: VectorArrayLike) -> 'VectorArray':
+        try:
+            other_x, other_y = self._operand(other)
+        except ValueError:
+            return NotImplemented
+
+        return VectorArray._wrap(np.stack((other_x - self._data[0], other_y - self._data[1])))
+
+    def __neg__(self) -> 'VectorArray':
+        """Negate all vectors of the batch."""
+        return self.scale_by(-1)
+
+    def dot(self, other: VectorArrayLike) -> np.ndarray:
+        """Compute the elementwise dot product with vectors.
+
+        >>> VectorArray([(1, 1), (2, 3)]).dot((-1, -1))
+        array([-2., -5.])
+        """
+        other_x, other_y = self._operand(other)
+        return self._data[0] * other_x + self._data[1] * other_y
+
+    def scale_by(self, scalar: Scalars) -> 'VectorArray':
+        """Multiply all vectors by a scalar, or each by its own scalar.
+
+        >>> VectorArray([(1, 2), (3, 4)]).scale_by(np.array([1, -1]))
+        VectorArray([Vector(1.0, 2.0), Vector(-3.0, -4.0)])
+        """
+        return VectorArray._wrap(self._scalars(scalar) * self._data)
+
+    def __mul__(self, other):
+        """Perform a dot product or a scalar product, based on the parameter type.
+
+        Scalars and one-dimensional arrays are handled by :py:meth:`scale_by`,
+        while vector-likes and batches are handled by :py:meth:`dot`.
+        """
+        if isinstance(other, np.ndarray):
+            if other.ndim < 2:
+                return self.scale_by(other)
+        elif _is_scalar(other) and _unpacker(type(other)) is None:
+            return self.scale_by(other)
+
+        try:
+            return self.dot(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __truediv__(self, other: Scalars) -> 'VectorArray':
+        """Divide all vectors by a scalar, or each by its own scalar."""
+        return VectorArray._wrap(self._data / self._scalars(other))
+
+    @property
+    def length(self) -> np.ndarray:
+        """Compute the length of each vector."""
+        return np.hypot(self._data[0], self._data[1])
+
+    def angle(self, other: VectorArrayLike) -> np.ndarray:
+        """Compute the angles, in degrees, from each vector to ``other``.
+
+        As with :py:meth:`Vector.angle <ppb_vector.Vector.angle>`, angles are
+        signed and normalized to the interval (-180°, 180°].
+
+        >>> VectorArray([(1, 0), (0, 1)]).angle((0, 1))
+        array([90.,  0.])
+        """
+        other_x, other_y = self._operand(other)
+        rv = np.degrees(np.arctan2(other_x, -other_y) - np.arctan2(self._data[0], -self._data[1]))
+        rv[rv <= -180] += 360
+        rv[rv > 180] -= 360
+        return rv
+
+    def isclose(self, other: VectorArrayLike, *,
+                abs_tol: SupportsFloat = 1e-09, rel_tol: SupportsFloat = 1e-09,
+                rel_to: typing.Sequence[VectorArrayLike] = ()) -> np.ndarray:
+        """Perform an elementwise approximate comparison, producing a boolean mask.
+
+        The tolerances have the same meaning as in
+        :py:meth:`Vector.isclose <ppb_vector.Vector.isclose>`, and the
+        vector-likes in ``rel_to`` may also be batches.
+
+        >>> VectorArray([(1, 0), (0, 1)]).isclose((1, 1e-10))
+        array([ True, False])
+        """
+        abs_tol, rel_tol = float(abs_tol), float(rel_tol)
+        if abs_tol < 0 or rel_tol < 0:
+            raise ValueError("VectorArray.isclose takes non-negative tolerances")
+
+        other_x, other_y = self._operand(other)
+        rel_length = np.maximum(self.length, np.hypot(other_x, other_y))
+        for v in rel_to:
+            rel_length = np.maximum(rel_length, np.hypot(*self._operand(v)))
+
+        diff = np.hypot(self._data[0] - other_x, self._data[1] - other_y)
+        return (diff <= rel_tol * rel_length) | (diff <= abs_tol)
+
+    def rotate(self, angle: Union[Scalars, Rotation]) -> 'VectorArray':
+        """Rotate all vectors by an angle, or each by its own angle, in degrees.
+
+        Passing a :py:class:`Rotation <ppb_vector.Rotation>` skips computing
+        its trigonometric values.
+
+        >>> VectorArray([(1, 0), (0, 1)]).rotate(90)
+        VectorArray([Vector(0.0, 1.0), Vector(-1.0, 0.0)])
+        """
+        r_cos: Coordinate
+        r_sin: Coordinate
+        if not isinstance(angle, Rotation):
+            angle = self._scalars(angle)
+
+        if isinstance(angle, np.ndarray):
+            r_cos, r_sin = _trig(angle)
+        else:
+            r_cos, r_sin = Vector._trig(angle)
+
+        x, y = self._data
+        return VectorArray._wrap(np.stack((x * r_cos - y * r_sin, x * r_sin + y * r_cos)))
+
+    def normalize(self) -> 'VectorArray':
+        """Scale all vectors to unit length.
+
+        >>> VectorArray([(3, 4), (0, 2)]).normalize()
+        VectorArray([Vector(0.6, 0.8), Vector(0.0, 1.0)])
+        """
+        return self.scale_to(1)
+
+    def truncate(self, max_length: Scalars) -> 'VectorArray':
+        """Scale down the vectors longer than ``max_length``.
+
+        >>> VectorArray([(3, 4), (0, 2)]).truncate(3)
+        VectorArray([Vector(1.8, 2.4), Vector(0.0, 2.0)])
+        """
+        max_length = self._scalars(max_length)
+        length = self.length
+        keep = length <= max_length
+        if np.all(keep):
+            return VectorArray._wrap(self._data.copy())
+
+        # Only the vectors that need scaling are checked for valid lengths.
+        target = np.where(keep, length, max_length)
+        if np.any(target < 0):
+            raise ValueError("VectorArray.truncate takes non-negative lengths.")
+
+        return VectorArray._wrap(np.where(keep, self._data, self._scale_to(target, length)))
+
+    def scale_to(self, length: Scalars) -> 'VectorArray':
+        """Scale all vectors to a given length, or each to its own length.
+
+        >>> VectorArray([(7, 24), (0, -1)]).scale_to(2)
+        VectorArray([Vector(0.56, 1.92), Vector(0.0, -2.0)])
+        """
+        length = self._scalars(length)
+        if np.any(np.less(length, 0)):
+            raise ValueError("VectorArray.scale_to takes non-negative lengths.")
+
+        return VectorArray._wrap(self._scale_to(length, self.length))
+
+    def _scale_to(self, target: Coordinate, length: np.ndarray) -> np.ndarray:
+        nonzero = np.not_equal(target, 0)
+        if np.any(nonzero & (length == 0)):
+            raise ZeroDivisionError("Cannot scale a null vector to a non-zero length")
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scaled = (target * self._data) / length
+
+        return np.where(nonzero, scaled, 0.0)
+
+    def decompose(self, basis: VectorArrayLike) -> Tuple['VectorArray', 'VectorArray']:
+        """Decompose all vectors as 2 components in a different basis.
+
+        :param basis: The first component of the basis, which must be normalized;
+          either a single vector-like or one per vector in the batch.
+
+        >>> a, b = VectorArray([(2, 3)]).decompose((1, 0))
+        >>> a, b
+        (VectorArray([Vector(2.0, 0.0)]), VectorArray([Vector(0.0, 3.0)]))
+        """
+        basis_x, basis_y = self._operand(basis)
+        if not _is_unit(np.hypot(basis_x, basis_y)):
+            raise ValueError("Decomposition requires a normalized vector.")
+
+        dot = self._data[0] * basis_x + self._data[1] * basis_y
+        a = np.stack((dot * basis_x, dot * basis_y))
+        return VectorArray._wrap(a), VectorArray._wrap(self._data - a)
+
+    def reflect(self, surface_normal: VectorArrayLike) -> 'VectorArray':
+        """Reflect all vectors against a surface, or each against its own.
+
+        :param surface_normal: The normalized normal of the surface, either a
+          single vector-like or one per vector in the batch.
+
+        >>> VectorArray([(5, 3), (1, 1)]).reflect((-1, 0))
+        VectorArray([Vector(-5.0, 3.0), Vector(-1.0, 1.0)])
+        """
+        normal_x, normal_y = self._operand(surface_normal)
+        if not _is_unit(np.hypot(normal_x, normal_y)):
+            raise ValueError("Reflection requires a normalized vector.")
+
+        twice_dot = 2 * (self._data[0] * normal_x + self._data[1] * normal_y)
+        return VectorArray._wrap(np.stack((
+            self._data[0] - twice_dot * normal_x,
+            self._data[1] - twice_dot * normal_y,
+        )))
+
+    def project(self, direction: VectorArrayLike) -> 'VectorArray':
+        """Project all vectors on a line, or each on its own line.
+
+        :param direction: A non-null vector-like, or a batch of those.
+
+        >>> VectorArray([(2, 3), (-1, 5)]).project((0, 2))
+        VectorArray([Vector(0.0, 3.0), Vector(0.0, 5.0)])
+        """
+        x, y = self._operand(direction)
+        if isinstance(x, np.ndarray):
+            basis: VectorArrayLike = VectorArray._wrap(np.stack((x, y))).normalize()
+        else:
+            basis = Vector(x, y).normalize()
+
+        p, _ = self.decompose(basis)
+        return p
+
+    def copy(self) -> 'VectorArray':
+        """Make a copy of the batch, which does not share its coordinates."""
+        return VectorArray._wrap(self._data.copy())
+
+    def __reduce_ex__(self, protocol: typing.Any) -> Tuple[typing.Any, ...]:
+        """Pickle the coordinates as a single buffer.
+
+        With pickle protocol 5, the buffer can be sent out-of-band:
+
+        >>> import pickle
+        >>> a = VectorArray([(1, 2), (3, 4)])
+        >>> buffers = []
+        >>> data = pickle.dumps(a, protocol=5, buffer_callback=buffers.append)
+        >>> pickle.loads(data, buffers=buffers)
+        VectorArray([Vector(1.0, 2.0), Vector(3.0, 4.0)])
+
+        The unpickled batch then shares its coordinates with the buffers it
+        was loaded from, without copying them.
+        """
+        data = np.ascontiguousarray(self._data)
+        if protocol >= 5:
+            # Only available, and only needed, from Python 3.8 onwards.
+            from pickle import PickleBuffer
+            buffer: typing.Any = PickleBuffer(data)  # type: ignore
+        else:
+            # A bytearray, so that the unpickled coordinates are writable.
+            buffer = bytearray(data)
+
+        return _from_buffer, (buffer, data.dtype.str, len(self))
+
+    def to_numpy(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Get the coordinates as a new array of shape (N, 2)."""
+        if out is None:
+            return self._data.T.copy()
+
+        out[...] = self._data.T
+        return out
+
+
+def _from_buffer(buffer: typing.Any, dtype: str, length: int) -> VectorArray:
+    # Unpickle a VectorArray; the dtype records the byte order it was saved in.
+    data = np.frombuffer(buffer, dtype=dtype).reshape(2, length)
+    return VectorArray._wrap(data.astype(np.float64, copy=False))
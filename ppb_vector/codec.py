@@ -0,0 +1,135 @@
+"""Binary encoding of many vectors at once.
+
+:py:func:`pack_vectors` encodes vectors as a single contiguous buffer of
+coordinates, ``x0 y0 x1 y1 ...``, and :py:func:`unpack_vectors` decodes it:
+
+>>> from ppb_vector import pack_vectors, unpack_vectors, Vector
+>>> data = pack_vectors([Vector(1, 2), (3, 4)])
+>>> len(data)
+32
+>>> unpack_vectors(data)
+[Vector(1.0, 2.0), Vector(3.0, 4.0)]
+
+Single vectors can be encoded with :py:meth:`Vector.to_bytes <ppb_vector.Vector.to_bytes>`,
+which uses the same layout.
+"""
+import struct
+import sys
+import typing
+from array import array
+from math import inf
+
+from ppb_vector import _batch, _make, _struct, Vector, VectorLike
+
+__all__ = ('pack_array', 'pack_vectors', 'unpack_vectors')
+
+
+def _check(typecode: str, byteorder: str) -> None:
+    # Raises ValueError for unsupported parameters, like Vector.to_bytes does.
+    _struct(typecode, byteorder)
+
+
+_SINGLE_INFINITIES = (struct.pack('=f', inf), struct.pack('=f', -inf))
+
+
+def _infinities(coordinates: array) -> int:
+    return coordinates.count(inf) + coordinates.count(-inf)
+
+
+def _overflow() -> OverflowError:
+    # Same error as struct, and so Vector.to_bytes, for values out of range.
+    return OverflowError("float too large to pack with f format")
+
+
+def pack_array(vectors: typing.Iterable[VectorLike], typecode: str = 'd') -> array:
+    """Encode vector-likes as an :py:class:`array.array` of coordinates.
+
+    :param typecode: ``'d'`` for double-precision floats, or ``'f'`` for
+      single-precision ones; then, like :py:meth:`Vector.to_bytes
+      <ppb_vector.Vector.to_bytes>`, finite coordinates too large for them
+      raise :py:class:`OverflowError`.
+
+    >>> pack_array([(1, 2), (3, 4)])
+    array('d', [1.0, 2.0, 3.0, 4.0])
+    """
+    _check(typecode, sys.byteorder)
+
+    batch = _batch(vectors)
+    if batch is not None:
+        import numpy as np
+        coordinates = batch.to_numpy()
+        if typecode == 'f':
+            with np.errstate(over='ignore'):
+                narrowed = coordinates.astype('f')
+            if np.isinf(narrowed).sum() != np.isinf(coordinates).sum():
+                raise _overflow()
+            coordinates = narrowed
+
+        return array(typecode, coordinates.tobytes())
+
+    if typecode == 'f':
+        # Kept, to check for values out of range; see below.
+        vectors = list(vectors)
+
+    result = array(typecode)
+    append = result.append
+    for v in vectors:
+        if type(v) is Vector:
+            append(v.x)  # type: ignore
+            append(v.y)  # type: ignore
+        else:
+            x, y = Vector._unpack(v)
+            append(x)  # type: ignore
+            append(y)  # type: ignore
+
+    if typecode == 'f':
+        # Conversion turns values out of range into infinities. Searching the
+        #  encoded coordinates for any is much faster than counting them.
+        encoded = result.tobytes()
+        if any(i in encoded for i in _SINGLE_INFINITIES):
+            if _infinities(result) != _infinities(pack_array(vectors)):
+                raise _overflow()
+
+    return result
+
+
+def pack_vectors(vectors: typing.Iterable[VectorLike], *,
+                 typecode: str = 'd', byteorder: str = 'little') -> bytes:
+    """Encode vector-likes as a single buffer of coordinates.
+
+    :param typecode: ``'d'`` to encode coordinates as double-precision
+      (64 bits) floats, or ``'f'`` for single-precision (32 bits) floats.
+    :param byteorder: ``'little'`` or ``'big'``, as in :py:meth:`int.to_bytes`.
+
+    The encoding of each vector is the same as
+    :py:meth:`Vector.to_bytes <ppb_vector.Vector.to_bytes>`, which raises the
+    same :py:class:`OverflowError` for coordinates too large for ``'f'``.
+    """
+    _check(typecode, byteorder)
+    coordinates = pack_array(vectors, typecode)
+    if byteorder != sys.byteorder:
+        coordinates.byteswap()
+
+    return coordinates.tobytes()
+
+
+def unpack_vectors(data: typing.Union[bytes, bytearray, memoryview, array], *,
+                   typecode: str = 'd', byteorder: str = 'little') -> typing.List[Vector]:
+    """Decode vectors encoded by :py:func:`pack_vectors`, with the same parameters.
+
+    ``data`` can be any object supporting the buffer protocol, including an
+    :py:class:`array.array` made by :py:func:`pack_array`, in which case
+    ``byteorder`` must be the native one (:py:data:`sys.byteorder`).
+    """
+    _check(typecode, byteorder)
+    coordinates = array(typecode)
+    # array.frombytes only takes byte buffers, so other formats are cast.
+    coordinates.frombytes(memoryview(data).cast('B'))
+    if len(coordinates) % 2:
+        raise ValueError("Expected an even number of coordinates")
+
+    if byteorder != sys.byteorder:
+        coordinates.byteswap()
+
+    it = iter(coordinates)
+    return [_make(x, y) for x, y in zip(it, it)]
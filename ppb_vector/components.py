@@ -0,0 +1,261 @@
+"""Columnar storage for the vector attributes of many entities.
+
+Game objects typically hold a few vectors each, like a position and a
+velocity. Declaring those as :py:class:`VectorField` attributes stores them in
+a shared :py:class:`ComponentTable` instead, with one pair of ``x`` and ``y``
+columns per attribute:
+
+>>> from ppb_vector import ComponentTable, Vector, VectorField
+>>> class Body:
+...     table = ComponentTable()
+...     position = VectorField(table)
+...     velocity = VectorField(table)
+...
+...     def __init__(self, position, velocity):
+...         self.position = position
+...         self.velocity = velocity
+>>> ball = Body((0, 0), (1, 2))
+>>> ball.position
+Vector(0.0, 0.0)
+
+The attributes still read and write :py:class:`Vector <ppb_vector.Vector>`
+values, one entity at a time, while the table updates all entities at once:
+
+>>> Body.table['position'] += Body.table['velocity'] * 0.5
+>>> ball.position
+Vector(0.5, 1.0)
+
+This module requires NumPy.
+"""
+import typing
+from operator import index
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ppb_vector import _make, Vector, VectorLike
+from ppb_vector.array import VectorArray, VectorArrayLike
+
+__all__ = ('ComponentTable', 'VectorField')
+
+# Entity ids combine a slot, in their low bits, with the generation of that
+#  slot, which increases each time its entity is removed.
+_SLOT_BITS = 32
+_SLOT_MASK = (1 << _SLOT_BITS) - 1
+
+
+class ComponentTable:
+    """A table of vector fields, with a row for each entity.
+
+    :param fields: The names of the initial fields; more can be added with
+      :py:meth:`add_field`, which :py:class:`VectorField` does.
+    :param capacity: The number of rows to allocate initially; the table
+      grows as needed.
+    :param id_attribute: The attribute in which :py:class:`VectorField`
+      stores the entity id of objects.
+
+    Entities are added with :py:meth:`add`, which returns their entity id.
+    Ids are stable, and never reused: after :py:meth:`remove`, the removed
+    entity's id raises :py:class:`KeyError`, even once its storage is reused
+    for another entity. Rows are kept contiguous, so that indexing the table
+    by field gives a :py:class:`VectorArray <ppb_vector.VectorArray>`
+    covering all entities:
+
+    >>> table = ComponentTable(['position'])
+    >>> a = table.add(position=(1, 2))
+    >>> b = table.add(position=(3, 4))
+    >>> table['position'].length
+    array([2.23606798, 5.        ])
+
+    That batch is a view of the table's storage; assigning to it, or to the
+    table's field, updates the entities' vectors. It is only valid until
+    entities are added or removed.
+    """
+
+    def __init__(self, fields: Iterable[str] = (), *,
+                 capacity: int = 16, id_attribute: str = 'entity_id'):
+        self.id_attribute = id_attribute
+        self._capacity = max(1, capacity)
+        self._columns: Dict[str, np.ndarray] = {}
+        # The row and generation of each slot; free slots have no row (-1),
+        #  and are reused with the next generation.
+        self._rows: List[int] = []
+        self._generations: List[int] = []
+        self._free: List[int] = []
+        # The entity id of each row.
+        self._ids: List[int] = []
+
+        for name in fields:
+            self.add_field(name)
+
+    def __repr__(self) -> str:
+        return f"<ComponentTable ({', '.join(self._columns)}) of {len(self)} entities>"
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """The names of the fields, in the order they were added."""
+        return tuple(self._columns)
+
+    def add_field(self, name: str) -> None:
+        """Add a field, initialised to null vectors for existing entities."""
+        if name in self._columns:
+            raise ValueError(f"Field {name!r} already exists")
+
+        self._columns[name] = np.zeros((2, self._capacity), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, entity_id: object) -> bool:
+        try:
+            key = index(entity_id)  # type: ignore
+        except TypeError:
+            return False
+
+        if key < 0:
+            return False
+
+        slot = key & _SLOT_MASK
+        if slot >= len(self._rows) or self._rows[slot] < 0:
+            return False
+
+        return self._generations[slot] == key >> _SLOT_BITS
+
+    @property
+    def ids(self) -> np.ndarray:
+        """The entity id of each row, in the same order as the fields' batches."""
+        return np.array(self._ids, dtype=np.int64)
+
+    def _row(self, entity_id: int) -> int:
+        if entity_id not in self:
+            raise KeyError(entity_id)
+
+        return self._rows[index(entity_id) & _SLOT_MASK]
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.zeros((2, self._capacity), dtype=np.float64)
+            grown[:, :column.shape[1]] = column
+            self._columns[name] = grown
+
+    def add(self, **values: VectorLike) -> int:
+        """Add an entity, and return its id.
+
+        Keyword arguments set the initial value of fields; others start as
+        null vectors. Raises :py:class:`KeyError` for unknown fields.
+        """
+        for name in values:
+            if name not in self._columns:
+                raise KeyError(name)
+
+        row = len(self._ids)
+        if row == self._capacity:
+            self._grow()
+
+        for name, column in self._columns.items():
+            column[:, row] = Vector._unpack(values[name]) if name in values else 0
+
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._rows)
+            self._rows.append(-1)
+            self._generations.append(0)
+
+        self._rows[slot] = row
+        entity_id = self._generations[slot] << _SLOT_BITS | slot
+        self._ids.append(entity_id)
+        return entity_id
+
+    def remove(self, entity_id: int) -> None:
+        """Remove an entity; its row is filled with the last one."""
+        row = self._row(entity_id)
+        last = len(self._ids) - 1
+        if row != last:
+            for column in self._columns.values():
+                column[:, row] = column[:, last]
+
+            moved = self._ids[last]
+            self._ids[row] = moved
+            self._rows[moved & _SLOT_MASK] = row
+
+        self._ids.pop()
+        slot = index(entity_id) & _SLOT_MASK
+        self._rows[slot] = -1
+        self._generations[slot] += 1
+        self._free.append(slot)
+
+    def get(self, entity_id: int, field: str) -> Vector:
+        """Get the value of an entity's field."""
+        x, y = self._columns[field][:, self._row(entity_id)].tolist()
+        return _make(x, y)
+
+    def set(self, entity_id: int, field: str, value: VectorLike) -> None:
+        """Set the value of an entity's field."""
+        self._columns[field][:, self._row(entity_id)] = Vector._unpack(value)
+
+    def __getitem__(self, field: str) -> VectorArray:
+        """Get a field, for all entities, as a view of the table's storage."""
+        return VectorArray._wrap(self._columns[field][:, :len(self)])
+
+    def __setitem__(self, field: str, values: VectorArrayLike) -> None:
+        """Set a field for all entities, from a batch or a single vector-like."""
+        self[field][:] = values
+
+
+class VectorField:
+    """A vector attribute, stored in a :py:class:`ComponentTable`.
+
+    :param table: The table holding the attribute's values; a field is added
+      to it, named after the attribute unless ``name`` is given.
+
+    Setting the attribute on an object which isn't in the table yet adds it,
+    and stores its entity id in the table's ``id_attribute``, which the
+    object's class must allow. Reading the attribute returns a
+    :py:class:`Vector <ppb_vector.Vector>`. Once the object's entity is
+    removed from the table, both raise :py:class:`KeyError`.
+    """
+
+    def __init__(self, table: ComponentTable, name: Optional[str] = None):
+        self.table = table
+        self.name = name
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        if self.name is None:
+            self.name = name
+        if self.name not in self.table.fields:
+            self.table.add_field(self.name)
+
+    def __repr__(self) -> str:
+        return f"<VectorField {self.name!r} of {self.table!r}>"
+
+    @typing.overload
+    def __get__(self, instance: None, owner: type) -> 'VectorField': pass
+
+    @typing.overload
+    def __get__(self, instance: Any, owner: type) -> Vector: pass
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        entity_id = getattr(instance, self.table.id_attribute, None)
+        if entity_id is None:
+            raise AttributeError(f"{type(instance).__name__!r} object has no attribute "
+                                 f"{self.name!r}")
+
+        return self.table.get(entity_id, self.name)  # type: ignore
+
+    def __set__(self, instance: Any, value: VectorLike) -> None:
+        table = self.table
+        entity_id = getattr(instance, table.id_attribute, None)
+        if entity_id is None:
+            entity_id = table.add()
+            try:
+                setattr(instance, table.id_attribute, entity_id)
+            except BaseException:
+                table.remove(entity_id)
+                raise
+
+        table.set(entity_id, self.name, value)  # type: ignore
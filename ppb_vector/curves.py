@@ -0,0 +1,365 @@
+"""Interpolation between vectors, and polynomial curves through them.
+
+:py:func:`lerp` and :py:func:`slerp` interpolate between two vectors, along
+a straight line or an arc:
+
+>>> from ppb_vector import lerp, slerp
+>>> lerp((0, 0), (2, 4), 0.25)
+Vector(0.5, 1.0)
+>>> slerp((1, 0), (0, 2), 0.5).isclose((1.0606601717798212, 1.0606601717798212))
+True
+
+Bézier curves and Catmull–Rom splines compute their polynomial coefficients
+once, when they are made, so that each evaluation is a few multiplications:
+
+>>> from ppb_vector import CubicBezier
+>>> curve = CubicBezier((0, 0), (0, 1), (1, 1), (1, 0))
+>>> curve(0.5)
+Vector(0.5, 0.75)
+
+All of them take a batch of parameters as well, as a NumPy array or a
+sequence, and then return a :py:class:`VectorArray <ppb_vector.VectorArray>`;
+:py:meth:`sample <CubicBezier.sample>` evaluates a curve at evenly spaced
+parameters.
+"""
+import typing
+from array import array
+from math import floor, hypot
+from typing import Any, Iterator, SupportsFloat, Tuple
+
+from ppb_vector import _batch, _compute_trig, _is_scalar, _make, Vector, VectorLike
+
+if typing.TYPE_CHECKING:
+    import numpy as np  # noqa: F401
+
+    from ppb_vector.array import VectorArray  # noqa: F401
+
+__all__ = ('CatmullRom', 'CubicBezier', 'lerp', 'QuadraticBezier', 'slerp')
+
+
+def _is_vector_like(*vectors: Any) -> bool:
+    # Batches of endpoints are handled like batches of parameters.
+    return all(_batch(v) is None for v in vectors)
+
+
+def _batch_operands(a: Any, b: Any, t: Any) -> Tuple['VectorArray', 'VectorArray', 'np.ndarray']:
+    """Broadcast the endpoints and parameters of an interpolation to batches."""
+    import numpy as np
+
+    from ppb_vector.array import VectorArray
+    from ppb_vector.geometry import _operands
+    (ax, ay), (bx, by) = _operands(a, b) or [Vector._unpack(v) for v in (a, b)]
+    t = np.asarray(t, dtype=np.float64)
+    shape = np.broadcast(ax, ay, bx, by, t).shape
+    if len(shape) != 1:
+        raise ValueError(f"Expected a 1-dimensional batch of parameters, got shape {shape}")
+
+    start = VectorArray.from_columns(np.broadcast_to(ax, shape), np.broadcast_to(ay, shape))
+    end = VectorArray.from_columns(np.broadcast_to(bx, shape), np.broadcast_to(by, shape))
+    return start, end, np.broadcast_to(t, shape)
+
+
+@typing.overload
+def lerp(a: VectorLike, b: VectorLike, t: SupportsFloat) -> Vector: pass
+
+
+@typing.overload
+def lerp(a: Any, b: Any, t: Any) -> 'VectorArray': pass
+
+
+def lerp(a, b, t):
+    """Interpolate linearly from ``a``, for ``t = 0``, to ``b``, for ``t = 1``.
+
+    Unlike ``a + (b - a) * t``, this computes the coordinates directly, and
+    is exact at both ends. Values of ``t`` outside ``[0, 1]`` extrapolate.
+
+    ``t`` may be a batch of parameters, and ``a`` and ``b`` may be
+    :py:class:`VectorArray <ppb_vector.VectorArray>` batches of endpoints:
+
+    >>> lerp((0, 0), (2, 4), [0, 0.5, 1])
+    VectorArray([Vector(0.0, 0.0), Vector(1.0, 2.0), Vector(2.0, 4.0)])
+    """
+    if type(a) is Vector and type(b) is Vector and type(t) is float:
+        return _make((1 - t) * a.x + t * b.x, (1 - t) * a.y + t * b.y)
+
+    if not _is_scalar(t) or not _is_vector_like(a, b):
+        from ppb_vector.array import VectorArray
+        start, end, t = _batch_operands(a, b, t)
+        return VectorArray.from_columns((1 - t) * start.x + t * end.x,
+                                        (1 - t) * start.y + t * end.y)
+
+    t = float(t)
+    ax, ay = Vector._unpack(a)
+    bx, by = Vector._unpack(b)
+    return _make((1 - t) * ax + t * bx, (1 - t) * ay + t * by)
+
+
+@typing.overload
+def slerp(a: VectorLike, b: VectorLike, t: SupportsFloat) -> Vector: pass
+
+
+@typing.overload
+def slerp(a: Any, b: Any, t: Any) -> 'VectorArray': pass
+
+
+def slerp(a, b, t):
+    """Interpolate along an arc from ``a``, for ``t = 0``, to ``b``, for ``t = 1``.
+
+    The direction turns at a constant rate, by the fraction ``t`` of
+    :py:meth:`a.angle(b) <ppb_vector.Vector.angle>`, and the length changes
+    linearly, so that interpolating between vectors of the same length stays
+    on a circle:
+
+    >>> slerp((2, 0), (0, 2), 0.5).isclose((1.4142135623730951, 1.4142135623730951))
+    True
+
+    If either vector is null, this is the same as :py:func:`lerp`. Like it,
+    it accepts batches of parameters, and endpoints.
+    """
+    if not _is_scalar(t) or not _is_vector_like(a, b):
+        import numpy as np
+
+        from ppb_vector.array import VectorArray
+        start, end, t = _batch_operands(a, b, t)
+        a_length, b_length = start.length, end.length
+        with np.errstate(divide='ignore', invalid='ignore'):
+            largest = np.maximum(np.abs(start.x), np.abs(start.y))
+            direction = VectorArray.from_columns(start.x / largest, start.y / largest)
+            scale = ((1 - t) * a_length + t * b_length) / direction.length
+
+        rotated = direction.rotate(start.angle(end) * t)
+        linear = (a_length == 0) | (b_length == 0)
+        return VectorArray.from_columns(
+            np.where(linear, (1 - t) * start.x + t * end.x, rotated.x * scale),
+            np.where(linear, (1 - t) * start.y + t * end.y, rotated.y * scale),
+        )
+
+    t = float(t)
+    ax, ay = Vector._unpack(a)
+    bx, by = Vector._unpack(b)
+    a_length, b_length = hypot(ax, ay), hypot(bx, by)
+    if a_length == 0 or b_length == 0:
+        return _make((1 - t) * ax + t * bx, (1 - t) * ay + t * by)
+
+    # Angles vary continuously with t, so caching their trigonometric values
+    #  like Vector.rotate does would only evict more useful entries.
+    r_cos, r_sin = _compute_trig(_make(ax, ay).angle((bx, by)) * t)
+
+    # Rotate a's direction rather than a itself: dividing by a_length would
+    #  overflow when it is subnormal. Scaling by the largest coordinate first
+    #  keeps the direction exact, even then.
+    largest = max(abs(ax), abs(ay))
+    ux, uy = ax / largest, ay / largest
+    scale = ((1 - t) * a_length + t * b_length) / hypot(ux, uy)
+    return _make((ux * r_cos - uy * r_sin) * scale, (ux * r_sin + uy * r_cos) * scale)
+
+
+class _Curve:
+    """A piecewise cubic polynomial curve, for parameters from 0 to 1.
+
+    The curve is split into segments, covering equal intervals of the
+    parameter; each is represented by the coefficients of its polynomials in
+    ``u``, the parameter within the segment, lowest degree first.
+    """
+
+    __slots__ = ('_points', '_x', '_y')
+
+    _points: Tuple[Vector, ...]
+    _x: 'array[float]'
+    _y: 'array[float]'
+
+    def _set_coefficients(self, segments: typing.Iterable[typing.Sequence[Vector]]) -> None:
+        self._x, self._y = array('d'), array('d')
+        for coefficients in segments:
+            for c in coefficients:
+                self._x.append(c.x)
+                self._y.append(c.y)
+
+    @property
+    def points(self) -> Tuple[Vector, ...]:
+        """The points defining the curve."""
+        return self._points
+
+    def __iter__(self) -> Iterator[Vector]:
+        return iter(self._points)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, self._points))})"
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return self._points == other._points
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._points))
+
+    def _segment(self, t: float) -> Tuple[int, float]:
+        segments = len(self._x) // 4
+        if segments == 1:
+            return 0, t
+
+        s = t * segments
+        i = min(max(floor(s), 0), segments - 1)
+        return i, s - i
+
+    def _batch_segments(self, t: Any) -> Tuple[int, 'np.ndarray', 'np.ndarray',
+                                               'np.ndarray', 'np.ndarray']:
+        # The number of segments, the segment and position within it for each
+        #  parameter, and the columns of coefficients.
+        import numpy as np
+        t = np.asarray(t, dtype=np.float64)
+        if t.ndim != 1:
+            raise ValueError(f"Expected a 1-dimensional batch of parameters, got shape {t.shape}")
+
+        segments = len(self._x) // 4
+        s = t * segments
+        i = np.clip(np.floor(s), 0, segments - 1)
+        return segments, i.astype(np.intp), s - i, np.frombuffer(self._x), np.frombuffer(self._y)
+
+    @typing.overload
+    def __call__(self, t: SupportsFloat) -> Vector: pass
+
+    @typing.overload
+    def __call__(self, t: Any) -> 'VectorArray': pass
+
+    def __call__(self, t):
+        """Evaluate the curve at ``t``, or at each of a batch of parameters."""
+        if not _is_scalar(t):
+            from ppb_vector.array import VectorArray
+            _, i, u, cx, cy = self._batch_segments(t)
+            k = 4 * i
+            return VectorArray.from_columns(
+                cx[k] + u * (cx[k + 1] + u * (cx[k + 2] + u * cx[k + 3])),
+                cy[k] + u * (cy[k + 1] + u * (cy[k + 2] + u * cy[k + 3])),
+            )
+
+        i, u = self._segment(float(t))
+        k = 4 * i
+        cx, cy = self._x, self._y
+        return _make(cx[k] + u * (cx[k + 1] + u * (cx[k + 2] + u * cx[k + 3])),
+                     cy[k] + u * (cy[k + 1] + u * (cy[k + 2] + u * cy[k + 3])))
+
+    @typing.overload
+    def derivative(self, t: SupportsFloat) -> Vector: pass
+
+    @typing.overload
+    def derivative(self, t: Any) -> 'VectorArray': pass
+
+    def derivative(self, t):
+        """Compute the derivative of the curve, with respect to ``t``.
+
+        This is tangent to the curve, and its length is the speed at which the
+        curve is travelled, as ``t`` increases.
+        """
+        if not _is_scalar(t):
+            from ppb_vector.array import VectorArray
+            segments, i, u, cx, cy = self._batch_segments(t)
+            k = 4 * i
+            return VectorArray.from_columns(
+                segments * (cx[k + 1] + u * (2 * cx[k + 2] + u * 3 * cx[k + 3])),
+                segments * (cy[k + 1] + u * (2 * cy[k + 2] + u * 3 * cy[k + 3])),
+            )
+
+        i, u = self._segment(float(t))
+        k = 4 * i
+        cx, cy = self._x, self._y
+        segments = len(cx) // 4
+        return _make(segments * (cx[k + 1] + u * (2 * cx[k + 2] + u * 3 * cx[k + 3])),
+                     segments * (cy[k + 1] + u * (2 * cy[k + 2] + u * 3 * cy[k + 3])))
+
+    def sample(self, count: int) -> 'VectorArray':
+        """Evaluate the curve at ``count`` evenly spaced parameters, from 0 to 1."""
+        import numpy as np
+        return self(np.linspace(0.0, 1.0, count))  # type: ignore
+
+
+class QuadraticBezier(_Curve):
+    """A quadratic Bézier curve, from ``start`` to ``end``, pulled towards ``control``.
+
+    Calling it evaluates the curve, from ``start`` for ``t = 0`` to ``end``
+    for ``t = 1``:
+
+    >>> curve = QuadraticBezier((0, 0), (1, 2), (2, 0))
+    >>> curve(0.5)
+    Vector(1.0, 1.0)
+    >>> curve([0, 0.5, 1])
+    VectorArray([Vector(0.0, 0.0), Vector(1.0, 1.0), Vector(2.0, 0.0)])
+    """
+
+    __slots__ = ()
+
+    def __init__(self, start: VectorLike, control: VectorLike, end: VectorLike):
+        p0, p1, p2 = self._points = (Vector(start), Vector(control), Vector(end))
+        self._set_coefficients([(p0, (p1 - p0) * 2, p0 - p1 * 2 + p2, Vector.zero)])
+
+
+class CubicBezier(_Curve):
+    """A cubic Bézier curve, from ``start`` to ``end``, with two control points.
+
+    The curve leaves ``start`` towards ``control1``, and arrives at ``end``
+    from the direction of ``control2``:
+
+    >>> curve = CubicBezier((0, 0), (0, 1), (1, 1), (1, 0))
+    >>> curve.derivative(0)
+    Vector(0.0, 3.0)
+    >>> curve.sample(3)
+    VectorArray([Vector(0.0, 0.0), Vector(0.5, 0.75), Vector(1.0, 0.0)])
+    """
+
+    __slots__ = ()
+
+    def __init__(self, start: VectorLike, control1: VectorLike,
+                 control2: VectorLike, end: VectorLike):
+        self._points = (Vector(start), Vector(control1), Vector(control2), Vector(end))
+        p0, p1, p2, p3 = self._points
+        self._set_coefficients([(
+            p0,
+            (p1 - p0) * 3,
+            (p0 - p1 * 2 + p2) * 3,
+            p3 - p0 + (p1 - p2) * 3,
+        )])
+
+
+class CatmullRom(_Curve):
+    """A uniform Catmull–Rom spline, passing through all the given points.
+
+    :param points: The points to go through, as vector-likes; there must be
+      at least two.
+
+    The spline is made of a cubic segment between each pair of consecutive
+    points, with equal intervals of the parameter, so that it reaches the
+    ``i``-th point of ``n`` for ``t = i / (n - 1)``:
+
+    >>> spline = CatmullRom([(0, 0), (1, 1), (2, 0), (3, 1)])
+    >>> spline(1 / 3).isclose((1, 1))
+    True
+    >>> spline(0.5)
+    Vector(1.5, 0.5)
+
+    At each point, the curve moves parallel to the line joining its
+    neighbours; the first and last points are their own outer neighbours.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, points: typing.Iterable[VectorLike]):
+        self._points = tuple(Vector(p) for p in points)
+        if len(self._points) < 2:
+            raise ValueError(f"Expected at least 2 points, got {len(self._points)}")
+
+        p = self._points
+        padded = (p[0], *p, p[-1])
+        self._set_coefficients(
+            (
+                p1,
+                (p2 - p0) * 0.5,
+                p0 - p1 * 2.5 + p2 * 2 - p3 * 0.5,
+                (p3 - p0) * 0.5 + (p1 - p2) * 1.5,
+            )
+            for p0, p1, p2, p3 in zip(padded, padded[1:], padded[2:], padded[3:])
+        )
+
+    def __repr__(self) -> str:
+        return f"CatmullRom({list(self._points)!r})"
@@ -0,0 +1,573 @@
+"""Lazy vector expressions, compiled into a single fused function.
+
+An update formula like ``pos + vel * dt`` makes a temporary
+:py:class:`Vector <ppb_vector.Vector>` at every operator. Written with
+symbolic :py:class:`Expression` operands instead, the same formula builds an
+expression tree, which is compiled once into a function computing all
+coordinates in a single pass:
+
+>>> from ppb_vector import Expression, Vector
+>>> pos, vel = Expression.vector('pos'), Expression.vector('vel')
+>>> dt = Expression.scalar('dt')
+>>> step = (pos + vel * dt).compile()
+>>> step(pos=Vector(0, 0), vel=(1, 2), dt=0.5)
+Vector(0.5, 1.0)
+
+The compiled function also runs over whole :py:class:`VectorArray
+<ppb_vector.VectorArray>` batches, bound to some or all of the symbols, and
+computes each coordinate column with NumPy.
+"""
+import typing
+from keyword import iskeyword
+from math import hypot
+from typing import Any, Dict, List, Optional, SupportsFloat, Tuple, Union
+
+from ppb_vector import _batch, _make, Vector, VectorLike
+
+__all__ = ('Expression', 'Kernel')
+
+
+VECTOR, SCALAR = 'vector', 'scalar'
+
+# Values an Expression can be combined with.
+Operand = Union['Expression', VectorLike, SupportsFloat]
+
+# Formatting of operators in Expression.__repr__, by operation.
+_INFIX = {'add': '+', 'sub': '-', 'mul': '*', 'scale': '*', 'div': '/'}
+
+
+class Expression:
+    """A node in a lazy expression tree, which is either vector- or scalar-valued.
+
+    Expressions are made from symbols, like :py:meth:`Expression.vector`, and
+    combined with vectors, scalars and other expressions using the operators
+    and methods of :py:class:`Vector <ppb_vector.Vector>`, where meaningful:
+    ``+``, ``-``, ``*`` (scaling, or the dot product of two vectors), ``/``,
+    :py:attr:`length`, :py:meth:`dot`, :py:meth:`scale_by`,
+    :py:meth:`normalize` and :py:meth:`rotate`.
+
+    Operations on constants are computed immediately:
+
+    >>> pos = Expression.vector('pos')
+    >>> pos + Vector(1, 2) * 2
+    (pos + Vector(2.0, 4.0))
+    """
+
+    __slots__ = ('op', 'args', 'kind', 'key', '_kernel')
+
+    #: The operation computing this node, like ``'add'``, or ``'symbol'`` and
+    #: ``'const'`` for the leaves of the tree.
+    op: str
+    #: The operands: child expressions, or the name of a symbol or the value of
+    #: a constant for the leaves.
+    args: Tuple[Any, ...]
+    #: Either ``'vector'`` or ``'scalar'``.
+    kind: str
+    #: A hashable summary of the whole subtree, equal for identical subtrees.
+    key: Tuple[Any, ...]
+
+    def __init__(self, op: str, args: Tuple[Any, ...], kind: str):
+        self.op, self.args, self.kind = op, args, kind
+        if op in ('symbol', 'const'):
+            self.key = (op, kind, *args)
+        else:
+            self.key = (op, kind, *(arg.key for arg in args))
+        self._kernel: Optional[Kernel] = None
+
+    @classmethod
+    def vector(cls, name: str) -> 'Expression':
+        """Make a vector-valued symbol, bound to a value when evaluating."""
+        return cls._symbol(name, VECTOR)
+
+    @classmethod
+    def scalar(cls, name: str) -> 'Expression':
+        """Make a scalar-valued symbol, bound to a value when evaluating."""
+        return cls._symbol(name, SCALAR)
+
+    @classmethod
+    def _symbol(cls, name: str, kind: str) -> 'Expression':
+        if not name.isidentifier() or iskeyword(name) or name.startswith('_'):
+            raise ValueError(f"Symbol names must be public identifiers, got {name!r}")
+
+        return cls('symbol', (name,), kind)
+
+    @classmethod
+    def constant(cls, value: Union[VectorLike, SupportsFloat]) -> 'Expression':
+        """Make a constant expression, from a vector-like or a scalar."""
+        if isinstance(value, (float, int)):
+            return cls('const', (float(value),), SCALAR)
+
+        return cls('const', (_make(*Vector._unpack(value)),), VECTOR)  # type: ignore
+
+    def __repr__(self) -> str:
+        if self.op == 'symbol':
+            return self.args[0]
+        if self.op == 'const':
+            return repr(self.args[0])
+        if self.op in _INFIX:
+            left, right = self.args
+            return f"({left!r} {_INFIX[self.op]} {right!r})"
+        if self.op == 'neg':
+            return f"-{self.args[0]!r}"
+        if self.op == 'length':
+            return f"{self.args[0]!r}.length"
+
+        receiver, *args = self.args
+        return f"{receiver!r}.{self.op}({', '.join(map(repr, args))})"
+
+    @property
+    def symbols(self) -> Dict[str, str]:
+        """The symbols this expression depends on, mapped to their kind."""
+        symbols: Dict[str, str] = {}
+        for node in _walk(self):
+            if node.op == 'symbol':
+                name = node.args[0]
+                if symbols.setdefault(name, node.kind) != node.kind:
+                    raise TypeError(f"Symbol {name!r} is used both as a vector and a scalar")
+
+        return symbols
+
+    # Construction of operations, with constant folding and simplifications
+
+    @staticmethod
+    def _lift(value: Operand) -> 'Expression':
+        if isinstance(value, Expression):
+            return value
+
+        try:
+            return Expression.constant(value)  # type: ignore
+        except ValueError:
+            raise TypeError(f"Cannot use {value!r} in a vector expression") from None
+
+    @staticmethod
+    def _node(op: str, args: Tuple['Expression', ...], kind: str) -> 'Expression':
+        if all(arg.op == 'const' for arg in args):
+            return Expression('const', (_FOLD[op](*(arg.args[0] for arg in args)),), kind)
+
+        return Expression(op, args, kind)
+
+    def _binary(self, op: str, other: Operand, reflected: bool = False) -> 'Expression':
+        try:
+            other = Expression._lift(other)
+        except TypeError:
+            return NotImplemented
+
+        left, right = (other, self) if reflected else (self, other)
+        if op in ('add', 'sub'):
+            if left.kind != right.kind:
+                raise TypeError(f"Cannot {op} a {left.kind} and a {right.kind}")
+
+            return Expression._node(op, (left, right), left.kind)
+
+        if op == 'mul':
+            if left.kind == VECTOR and right.kind == VECTOR:
+                return Expression._node('dot', (left, right), SCALAR)
+            if left.kind == SCALAR and right.kind == VECTOR:
+                left, right = right, left
+            if left.kind == VECTOR:
+                return left.scale_by(right)
+            if right.op == 'const' and right.args[0] == 1:
+                return left
+
+            return Expression._node('mul', (left, right), SCALAR)
+
+        # Division
+        if right.kind != SCALAR:
+            raise TypeError("Cannot divide by a vector")
+        if right.op == 'const' and right.args[0] == 1:
+            return left
+
+        return Expression._node('div', (left, right), left.kind)
+
+    def __add__(self, other: Operand) -> 'Expression':
+        return self._binary('add', other)
+
+    def __radd__(self, other: Operand) -> 'Expression':
+        return self._binary('add', other, reflected=True)
+
+    def __sub__(self, other: Operand) -> 'Expression':
+        return self._binary('sub', other)
+
+    def __rsub__(self, other: Operand) -> 'Expression':
+        return self._binary('sub', other, reflected=True)
+
+    def __mul__(self, other: Operand) -> 'Expression':
+        return self._binary('mul', other)
+
+    def __rmul__(self, other: Operand) -> 'Expression':
+        return self._binary('mul', other, reflected=True)
+
+    def __truediv__(self, other: Operand) -> 'Expression':
+        return self._binary('div', other)
+
+    def __rtruediv__(self, other: Operand) -> 'Expression':
+        return self._binary('div', other, reflected=True)
+
+    def __neg__(self) -> 'Expression':
+        if self.op == 'neg':
+            return self.args[0]
+
+        return Expression._node('neg', (self,), self.kind)
+
+    def _check_vector(self, operation: str) -> None:
+        if self.kind != VECTOR:
+            raise TypeError(f"Cannot take the {operation} of a scalar expression")
+
+    @property
+    def length(self) -> 'Expression':
+        """The length of a vector expression."""
+        self._check_vector('length')
+        return Expression._node('length', (self,), SCALAR)
+
+    def dot(self, other: Operand) -> 'Expression':
+        """The dot product of two vector expressions."""
+        other = Expression._lift(other)
+        self._check_vector('dot product')
+        other._check_vector('dot product')
+        return Expression._node('dot', (self, other), SCALAR)
+
+    def scale_by(self, scalar: Operand) -> 'Expression':
+        """Scale a vector expression by a scalar, or a scalar expression."""
+        scalar = Expression._lift(scalar)
+        self._check_vector('scaling')
+        if scalar.kind != SCALAR:
+            raise TypeError("Cannot scale by a vector")
+        if scalar.op == 'const' and scalar.args[0] == 1:
+            return self
+
+        return Expression._node('scale', (self, scalar), VECTOR)
+
+    def normalize(self) -> 'Expression':
+        """Scale a vector expression to unit length, like :py:meth:`Vector.normalize`."""
+        self._check_vector('normalization')
+        return Expression._node('normalize', (self,), VECTOR)
+
+    def rotate(self, angle: Operand) -> 'Expression':
+        """Rotate a vector expression by an angle in degrees, or a scalar expression."""
+        angle = Expression._lift(angle)
+        self._check_vector('rotation')
+        if angle.kind != SCALAR:
+            raise TypeError("Cannot rotate by a vector")
+
+        return Expression._node('rotate', (self, angle), VECTOR)
+
+    # Evaluation
+
+    def compile(self) -> 'Kernel':
+        """Compile the expression into a :py:class:`Kernel`, once."""
+        if self._kernel is None:
+            self._kernel = Kernel(self)
+
+        return self._kernel
+
+    def evaluate(self, **bindings: Any) -> Any:
+        """Compile the expression if needed, and evaluate it.
+
+        This is equivalent to ``self.compile()(**bindings)``.
+        """
+        return self.compile()(**bindings)
+
+
+# Evaluation of operations on constants, as Vector and float operations.
+_FOLD: Dict[str, typing.Callable[..., Any]] = {
+    'add': lambda a, b: a + b,
+    'sub': lambda a, b: a - b,
+    'mul': lambda a, b: a * b,
+    'div': lambda a, b: a / b,
+    'neg': lambda a: -a,
+    'dot': Vector.dot,
+    'scale': Vector.scale_by,
+    'length': lambda v: v.length,
+    'normalize': Vector.normalize,
+    'rotate': Vector.rotate,
+}
+
+
+def _walk(root: Expression) -> typing.Iterator[Expression]:
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        if node.op not in ('symbol', 'const'):
+            stack.extend(node.args)
+
+
+class _Compiler:
+    """Generate the source of the straight-line function evaluating an expression.
+
+    Each distinct subtree is computed once, into local variables; vector
+    subtrees are kept as two variables for their coordinates.
+    """
+
+    def __init__(self, batch: bool):
+        self.batch = batch
+        self.lines: List[str] = []
+        self.constants: Dict[str, Any] = {}
+        self.names: Dict[Tuple[Any, ...], Any] = {}
+
+    def _temp(self, kind: str) -> Any:
+        n = len(self.names)
+        return (f'_t{n}x', f'_t{n}y') if kind == VECTOR else f'_t{n}'
+
+    def _div(self, a: str, b: str) -> str:
+        # NumPy doesn't raise ZeroDivisionError, unlike float division.
+        return f"_div({a}, {b})" if self.batch else f"{a} / {b}"
+
+    def emit(self, node: Expression) -> Any:
+        if node.key in self.names:
+            return self.names[node.key]
+
+        if node.op == 'symbol':
+            name = node.args[0]
+            result = _coordinates(name) if node.kind == VECTOR else name
+            self.names[node.key] = result
+            return result
+
+        if node.op == 'const':
+            n = len(self.constants)
+            value = node.args[0]
+            if node.kind == VECTOR:
+                self.constants[f'_c{n}x'], self.constants[f'_c{n}y'] = value.x, value.y
+                result = (f'_c{n}x', f'_c{n}y')
+            else:
+                self.constants[f'_c{n}'] = value
+                result = f'_c{n}'
+
+            self.names[node.key] = result
+            return result
+
+        args = [self.emit(arg) for arg in node.args]
+        result = self._temp(node.kind)
+        self.names[node.key] = result
+        self.lines.extend(self._operation(node, result, *args))
+        return result
+
+    def _operation(self, node: Expression, out: Any, *args: Any) -> List[str]:
+        op = node.op
+        if op in ('add', 'sub', 'mul'):
+            symbol = _INFIX[op]
+            a, b = args
+            if node.kind == VECTOR:
+                return [f"{out[0]} = {a[0]} {symbol} {b[0]}", f"{out[1]} = {a[1]} {symbol} {b[1]}"]
+            return [f"{out} = {a} {symbol} {b}"]
+
+        if op == 'div':
+            a, b = args
+            if node.kind == VECTOR:
+                return [f"{out[0]} = {self._div(a[0], b)}", f"{out[1]} = {self._div(a[1], b)}"]
+            return [f"{out} = {self._div(a, b)}"]
+
+        if op == 'neg':
+            a, = args
+            if node.kind == VECTOR:
+                return [f"{out[0]} = -{a[0]}", f"{out[1]} = -{a[1]}"]
+            return [f"{out} = -{a}"]
+
+        if op == 'scale':
+            (x, y), s = args
+            return [f"{out[0]} = {s} * {x}", f"{out[1]} = {s} * {y}"]
+
+        if op == 'dot':
+            a, b = args
+            return [f"{out} = {a[0]} * {b[0]} + {a[1]} * {b[1]}"]
+
+        if op == 'length':
+            (x, y), = args
+            return [f"{out} = _hypot({x}, {y})"]
+
+        if op == 'normalize':
+            (x, y), = args
+            return [
+                f"{out[0]}_length = _hypot({x}, {y})",
+                f"{out[0]} = {self._div(x, out[0] + '_length')}",
+                f"{out[1]} = {self._div(y, out[0] + '_length')}",
+            ]
+
+        if op == 'rotate':
+            (x, y), angle = args
+            cos, sin = f"{out[0]}_cos", f"{out[0]}_sin"
+            return [
+                f"{cos}, {sin} = _trig({angle})",
+                f"{out[0]} = {x} * {cos} - {y} * {sin}",
+                f"{out[1]} = {x} * {sin} + {y} * {cos}",
+            ]
+
+        raise AssertionError(f"Unknown operation {op!r}")
+
+    def source(self, root: Expression, signature: str, prologue: List[str]) -> str:
+        result = self.emit(root)
+        if root.kind == VECTOR and not self.batch:
+            returned = f"_make({result[0]}, {result[1]})"
+        elif root.kind == VECTOR:
+            returned = f"{result[0]}, {result[1]}"
+        else:
+            returned = result
+
+        return "\n".join((
+            f"def kernel({signature}):",
+            *(f"    {line}" for line in prologue + self.lines),
+            f"    return {returned}",
+        ))
+
+
+class Kernel:
+    """A compiled :py:class:`Expression`, evaluated by calling it with its symbols' values.
+
+    Each vector symbol is bound to a vector-like, and each scalar symbol to a
+    number; the result is then a :py:class:`Vector <ppb_vector.Vector>` or a
+    float. If some vector symbols are bound to a :py:class:`VectorArray
+    <ppb_vector.VectorArray>`, or some scalar symbols to a NumPy array with a
+    value per vector, the expression is evaluated for all vectors at once,
+    producing a :py:class:`VectorArray <ppb_vector.VectorArray>` or an array.
+
+    >>> pos, vel = Expression.vector('pos'), Expression.vector('vel')
+    >>> kernel = (pos + vel.normalize()).compile()
+    >>> kernel.symbols
+    ('pos', 'vel')
+    >>> print(kernel.source)
+    def kernel(*, pos, vel):
+        if _type(pos) is not _Vector or _type(vel) is not _Vector:
+            return _general(pos=pos, vel=vel)
+        _pos_x = pos.x
+        _pos_y = pos.y
+        _vel_x = vel.x
+        _vel_y = vel.y
+        _t2x_length = _hypot(_vel_x, _vel_y)
+        _t2x = _vel_x / _t2x_length
+        _t2y = _vel_y / _t2x_length
+        _t3x = _pos_x + _t2x
+        _t3y = _pos_y + _t2y
+        return _make(_t3x, _t3y)
+    """
+
+    __slots__ = ('expression', 'symbols', 'kinds', 'source', '_scalar', '_batch')
+
+    #: The names of the symbols, in the order of the function's parameters.
+    symbols: Tuple[str, ...]
+    #: The source code of the function evaluating the expression over single values.
+    source: str
+
+    def __init__(self, expression: Expression):
+        self.expression = expression
+        kinds = expression.symbols
+        self.symbols = tuple(sorted(kinds))
+        self.kinds = tuple(kinds[name] for name in self.symbols)
+
+        # Evaluation over single vectors takes the symbols as keyword
+        #  arguments, and takes a fast path when they are vectors and floats;
+        #  anything else goes through _general, which converts them first.
+        # Symbols may shadow builtins, so those are bound to private names.
+        checks = [
+            f"_type({name}) is not {'_Vector' if kind == VECTOR else '_float'}"
+            for name, kind in zip(self.symbols, self.kinds)
+        ]
+        prologue = [
+            f"if {' or '.join(checks)}:",
+            f"    return _general({', '.join(f'{name}={name}' for name in self.symbols)})",
+        ] if checks else []
+        for name, kind in zip(self.symbols, self.kinds):
+            if kind == VECTOR:
+                x, y = _coordinates(name)
+                prologue.extend((f"{x} = {name}.x", f"{y} = {name}.y"))
+
+        self.source, self._scalar = self._compile(
+            False, f"*, {', '.join(self.symbols)}" if self.symbols else "", prologue,
+            {'_hypot': hypot, '_trig': Vector._trig, '_make': _make, '_Vector': Vector,
+             '_type': type, '_float': float, '_general': self._general},
+        )
+        self._batch: Optional[typing.Callable[..., Any]] = None
+
+    def _compile(self, batch: bool, signature: str, prologue: List[str],
+                 namespace: Dict[str, Any]) -> Tuple[str, typing.Callable[..., Any]]:
+        compiler = _Compiler(batch)
+        source = compiler.source(self.expression, signature, prologue)
+        namespace = {**namespace, **compiler.constants}
+        exec(compile(source, f"<Kernel {self.expression!r}>", 'exec'), namespace)
+        return source, namespace['kernel']
+
+    def __repr__(self) -> str:
+        return f"<Kernel {self.expression!r}>"
+
+    def __call__(self, **bindings: Any) -> Any:
+        return self._scalar(**bindings)
+
+    def _general(self, **bindings: Any) -> Any:
+        values = [bindings[name] for name in self.symbols]
+        if any(_is_batch(value, kind) for value, kind in zip(values, self.kinds)):
+            return self._evaluate_batch(values)
+
+        return self._scalar(**{
+            name: _make(*Vector._unpack(value)) if kind == VECTOR else float(value)
+            for name, value, kind in zip(self.symbols, values, self.kinds)
+        })
+
+    def _evaluate_batch(self, values: List[Any]) -> Any:
+        import numpy as np
+
+        from ppb_vector.array import VectorArray
+
+        if self._batch is None:
+            parameters: List[str] = []
+            for name, kind in zip(self.symbols, self.kinds):
+                parameters.extend(_coordinates(name) if kind == VECTOR else (name,))
+
+            _, self._batch = self._compile(True, ', '.join(parameters), [], {
+                '_hypot': np.hypot, '_trig': _batch_trig, '_div': _batch_div,
+            })
+
+        arguments: List[Any] = []
+        lengths = set()
+        for value, kind in zip(values, self.kinds):
+            batch = _batch(value) if kind == VECTOR else None
+            if batch is not None:
+                lengths.add(len(batch))
+                arguments.extend((batch.x, batch.y))
+            elif kind == VECTOR:
+                arguments.extend(Vector._unpack(value))
+            elif _is_batch(value, kind):
+                column = np.asarray(value, dtype=np.float64)
+                if column.ndim != 1:
+                    raise ValueError(f"Expected a 1-dimensional array of scalars: {column.shape}")
+                lengths.add(len(column))
+                arguments.append(column)
+            else:
+                arguments.append(float(value))
+
+        if len(lengths) != 1:
+            raise ValueError(f"Cannot evaluate batches of different lengths: {sorted(lengths)}")
+
+        length, = lengths
+        result = self._batch(*arguments)
+        if self.expression.kind == SCALAR:
+            return np.array(np.broadcast_to(result, length), dtype=np.float64)
+
+        x, y = result
+        return VectorArray.from_columns(np.broadcast_to(x, length), np.broadcast_to(y, length))
+
+
+def _coordinates(name: str) -> Tuple[str, str]:
+    return f'_{name}_x', f'_{name}_y'
+
+
+def _is_batch(value: Any, kind: str) -> bool:
+    if kind == VECTOR:
+        return _batch(value) is not None
+
+    return getattr(value, 'ndim', 0) > 0
+
+
+def _batch_trig(angle: Any) -> Tuple[Any, Any]:
+    import numpy as np
+    if np.ndim(angle) == 0:
+        return Vector._trig(float(angle))
+
+    from ppb_vector.array import _trig
+    return _trig(np.asarray(angle, dtype=np.float64))
+
+
+def _batch_div(a: Any, b: Any) -> Any:
+    import numpy as np
+    if np.any(np.equal(b, 0)):
+        raise ZeroDivisionError("division by zero")
+
+    return np.divide(a, b)
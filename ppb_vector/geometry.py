@@ -0,0 +1,298 @@
+"""Closest points, distances and intersections involving line segments.
+
+A segment is given by its two endpoints, as vector-likes. Each function works
+on single vectors, using plain floats without intermediate vectors:
+
+>>> from ppb_vector import closest_point, segment_intersection, Vector
+>>> closest_point((1, 2), (0, 0), (4, 0))
+Vector(1.0, 0.0)
+>>> segment_intersection((0, 0), (2, 2), (0, 2), (2, 0))
+Vector(1.0, 1.0)
+
+Any of the arguments can also be a :py:class:`VectorArray
+<ppb_vector.VectorArray>`, to test one segment against many, or many against
+many pairwise, in a single vectorised call:
+
+>>> from ppb_vector import VectorArray
+>>> closest_point(VectorArray([(1, 2), (5, 1)]), (0, 0), (4, 0))
+VectorArray([Vector(1.0, 0.0), Vector(4.0, 0.0)])
+
+Batches require NumPy; all batches passed to a function must have the same
+length.
+"""
+import typing
+from math import hypot
+from typing import Any, Optional, Tuple, Union
+
+from ppb_vector import _batch, _make, Vector, VectorLike
+
+if typing.TYPE_CHECKING:
+    import numpy as np  # noqa: F401
+
+    from ppb_vector.array import VectorArray  # noqa: F401
+
+__all__ = (
+    'closest_point', 'segment_distance', 'segment_distance_squared', 'segment_intersection',
+)
+
+# A coordinate of a batch operand: a float, or a column of floats.
+Coordinate = Union[float, 'np.ndarray']
+
+
+def _operands(*vectors: Any) -> Optional[typing.List[Tuple[Coordinate, Coordinate]]]:
+    """Unpack the coordinates of operands, if any of them is a batch, or return None."""
+    batches = [_batch(v) for v in vectors]
+    if all(b is None for b in batches):
+        return None
+
+    lengths = {len(b) for b in batches if b is not None}
+    if len(lengths) > 1:
+        raise ValueError(f"Cannot combine batches of different lengths {sorted(lengths)}")
+
+    # Single vectors are unpacked as NumPy scalars, so that divisions by zero
+    #  follow NumPy's rules even when they only involve single vectors.
+    import numpy as np
+    operands: typing.List[Tuple[Coordinate, Coordinate]] = []
+    for v, b in zip(vectors, batches):
+        if b is not None:
+            operands.append((b.x, b.y))
+        else:
+            x, y = Vector._unpack(v)
+            operands.append((np.float64(x), np.float64(y)))
+
+    return operands
+
+
+def _closest(px: float, py: float, sx: float, sy: float,
+             ex: float, ey: float) -> Tuple[float, float]:
+    dx, dy = ex - sx, ey - sy
+    length_squared = dx * dx + dy * dy
+    if length_squared == 0:
+        return sx, sy
+
+    t = ((px - sx) * dx + (py - sy) * dy) / length_squared
+    t = min(max(t, 0.0), 1.0)
+    return sx + t * dx, sy + t * dy
+
+
+def _batch_closest(px: Coordinate, py: Coordinate, sx: Coordinate, sy: Coordinate,
+                   ex: Coordinate, ey: Coordinate) -> Tuple['np.ndarray', 'np.ndarray']:
+    import numpy as np
+    dx, dy = ex - sx, ey - sy
+    length_squared = dx * dx + dy * dy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = ((px - sx) * dx + (py - sy) * dy) / length_squared
+
+    # Degenerate segments are reduced to their start point.
+    t = np.where(length_squared == 0, 0.0, np.clip(t, 0.0, 1.0))
+    return sx + t * dx, sy + t * dy
+
+
+@typing.overload
+def closest_point(point: VectorLike, start: VectorLike, end: VectorLike) -> Vector: pass
+
+
+@typing.overload
+def closest_point(point: Any, start: Any, end: Any) -> 'VectorArray': pass
+
+
+def closest_point(point, start, end):
+    """Find the point of the segment from ``start`` to ``end`` closest to ``point``.
+
+    If the segment is degenerate, with ``start == end``, that point is returned.
+
+    >>> closest_point((3, 3), (0, 0), (2, 0))
+    Vector(2.0, 0.0)
+    """
+    operands = _operands(point, start, end)
+    if operands is not None:
+        from ppb_vector.array import VectorArray
+        (px, py), (sx, sy), (ex, ey) = operands
+        x, y = _batch_closest(px, py, sx, sy, ex, ey)
+        return VectorArray.from_columns(x, y)
+
+    px, py = Vector._unpack(point)
+    sx, sy = Vector._unpack(start)
+    ex, ey = Vector._unpack(end)
+    return _make(*_closest(px, py, sx, sy, ex, ey))
+
+
+@typing.overload
+def segment_distance_squared(point: VectorLike, start: VectorLike, end: VectorLike) -> float: pass
+
+
+@typing.overload
+def segment_distance_squared(point: Any, start: Any, end: Any) -> 'np.ndarray': pass
+
+
+def segment_distance_squared(point, start, end):
+    """Compute the squared distance from ``point`` to the segment from ``start`` to ``end``.
+
+    This avoids the square root of :py:func:`segment_distance`, when comparing
+    against a squared radius:
+
+    >>> segment_distance_squared((1, 2), (0, 0), (4, 0))
+    4.0
+    """
+    operands = _operands(point, start, end)
+    if operands is not None:
+        (px, py), (sx, sy), (ex, ey) = operands
+        x, y = _batch_closest(px, py, sx, sy, ex, ey)
+        return (px - x) ** 2 + (py - y) ** 2
+
+    px, py = Vector._unpack(point)
+    sx, sy = Vector._unpack(start)
+    ex, ey = Vector._unpack(end)
+    x, y = _closest(px, py, sx, sy, ex, ey)
+    return (px - x) ** 2 + (py - y) ** 2
+
+
+@typing.overload
+def segment_distance(point: VectorLike, start: VectorLike, end: VectorLike) -> float: pass
+
+
+@typing.overload
+def segment_distance(point: Any, start: Any, end: Any) -> 'np.ndarray': pass
+
+
+def segment_distance(point, start, end):
+    """Compute the distance from ``point`` to the segment from ``start`` to ``end``.
+
+    >>> segment_distance((7, 4), (0, 0), (4, 0))
+    5.0
+    """
+    operands = _operands(point, start, end)
+    if operands is not None:
+        import numpy as np
+        (px, py), (sx, sy), (ex, ey) = operands
+        x, y = _batch_closest(px, py, sx, sy, ex, ey)
+        return np.hypot(px - x, py - y)
+
+    px, py = Vector._unpack(point)
+    sx, sy = Vector._unpack(start)
+    ex, ey = Vector._unpack(end)
+    x, y = _closest(px, py, sx, sy, ex, ey)
+    return hypot(px - x, py - y)
+
+
+def _intersection(ax: float, ay: float, bx: float, by: float,
+                  cx: float, cy: float, dx: float, dy: float) -> Optional[Tuple[float, float]]:
+    # Segments a + t r and c + u s, for t and u in [0, 1].
+    rx, ry = bx - ax, by - ay
+    sx, sy = dx - cx, dy - cy
+    qx, qy = cx - ax, cy - ay
+    denominator = rx * sy - ry * sx
+    if denominator != 0:
+        t = (qx * sy - qy * sx) / denominator
+        u = (qx * ry - qy * rx) / denominator
+        if 0 <= t <= 1 and 0 <= u <= 1:
+            return ax + t * rx, ay + t * ry
+        return None
+
+    # Parallel segments only intersect if they are on the same line.
+    if qx * ry - qy * rx != 0 or qx * sy - qy * sx != 0:
+        return None
+
+    r_squared = rx * rx + ry * ry
+    if r_squared == 0:
+        # The first segment is a point: check whether it lies on the second.
+        s_squared = sx * sx + sy * sy
+        if s_squared == 0:
+            return (ax, ay) if qx == 0 and qy == 0 else None
+        u = -(qx * sx + qy * sy) / s_squared
+        return (ax, ay) if 0 <= u <= 1 else None
+
+    # Collinear segments: return the start of their overlap along a + t r.
+    t0 = (qx * rx + qy * ry) / r_squared
+    t1 = t0 + (sx * rx + sy * ry) / r_squared
+    low, high = max(0.0, min(t0, t1)), min(1.0, max(t0, t1))
+    if low > high:
+        return None
+    return ax + low * rx, ay + low * ry
+
+
+def _batch_intersection(ax: Coordinate, ay: Coordinate, bx: Coordinate, by: Coordinate,
+                        cx: Coordinate, cy: Coordinate, dx: Coordinate, dy: Coordinate,
+                        ) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    # The same computation as _intersection, with branches replaced by masks.
+    import numpy as np
+    rx, ry = bx - ax, by - ay
+    sx, sy = dx - cx, dy - cy
+    qx, qy = cx - ax, cy - ay
+    denominator = rx * sy - ry * sx
+    q_cross_r = qx * ry - qy * rx
+    q_cross_s = qx * sy - qy * sx
+    r_squared = rx * rx + ry * ry
+    s_squared = sx * sx + sy * sy
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = q_cross_s / denominator
+        u = q_cross_r / denominator
+        crossing = (denominator != 0) & (0 <= t) & (t <= 1) & (0 <= u) & (u <= 1)
+
+        collinear = (denominator == 0) & (q_cross_r == 0) & (q_cross_s == 0)
+        t0 = (qx * rx + qy * ry) / r_squared
+        t1 = t0 + (sx * rx + sy * ry) / r_squared
+        low = np.maximum(0.0, np.minimum(t0, t1))
+        high = np.minimum(1.0, np.maximum(t0, t1))
+        overlapping = collinear & (r_squared != 0) & (low <= high)
+
+        u_point = -(qx * sx + qy * sy) / s_squared
+        on_segment = np.where(s_squared == 0, (qx == 0) & (qy == 0),
+                              (0 <= u_point) & (u_point <= 1))
+        point = collinear & (r_squared == 0) & on_segment
+
+    hit = crossing | overlapping | point
+    t = np.where(crossing, t, np.where(overlapping, low, 0.0))
+    t[~hit] = np.nan
+    return hit, ax + t * rx, ay + t * ry
+
+
+@typing.overload
+def segment_intersection(a_start: VectorLike, a_end: VectorLike,
+                         b_start: VectorLike, b_end: VectorLike) -> Optional[Vector]: pass
+
+
+@typing.overload
+def segment_intersection(a_start: Any, a_end: Any, b_start: Any,
+                         b_end: Any) -> Tuple['np.ndarray', 'VectorArray']: pass
+
+
+def segment_intersection(a_start, a_end, b_start, b_end):
+    """Find where the segments from ``a_start`` to ``a_end`` and ``b_start`` to ``b_end`` meet.
+
+    This returns the intersection point, or ``None`` if the segments don't
+    intersect. Segments along the same line may overlap, in which case this
+    returns the point of the overlap closest to ``a_start``:
+
+    >>> segment_intersection((0, 0), (4, 0), (6, 0), (2, 0))
+    Vector(2.0, 0.0)
+    >>> segment_intersection((0, 0), (4, 0), (0, 1), (4, 1)) is None
+    True
+
+    For batches, this returns a boolean array telling which pairs of segments
+    intersect, and a :py:class:`VectorArray <ppb_vector.VectorArray>` of the
+    intersection points, whose coordinates are NaN for the other pairs:
+
+    >>> from ppb_vector import VectorArray
+    >>> hit, points = segment_intersection((0, 0), (4, 0),
+    ...                                    VectorArray([(1, -1), (5, -1)]),
+    ...                                    VectorArray([(1, 1), (5, 1)]))
+    >>> hit
+    array([ True, False])
+    >>> points[0]
+    Vector(1.0, 0.0)
+    """
+    operands = _operands(a_start, a_end, b_start, b_end)
+    if operands is not None:
+        from ppb_vector.array import VectorArray
+        (ax, ay), (bx, by), (cx, cy), (dx, dy) = operands
+        hit, x, y = _batch_intersection(ax, ay, bx, by, cx, cy, dx, dy)
+        return hit, VectorArray.from_columns(x, y)
+
+    ax, ay = Vector._unpack(a_start)
+    bx, by = Vector._unpack(a_end)
+    cx, cy = Vector._unpack(b_start)
+    dx, dy = Vector._unpack(b_end)
+    result = _intersection(ax, ay, bx, by, cx, cy, dx, dy)
+    return _make(*result) if result is not None else None
@@ -0,0 +1,213 @@
+"""Integer vectors, for the coordinates of tiles and chunks in a grid.
+
+:py:class:`GridVector` keeps its coordinates as exact integers, and hashes and
+compares like a tuple of them, which makes it a cheap key for tile maps:
+
+>>> from ppb_vector import GridVector, Vector
+>>> tiles = {GridVector(0, 0): 'grass', GridVector(1, 0): 'water'}
+>>> tiles[GridVector(0, 0) + (1, 0)]
+'water'
+
+It converts from and to :py:class:`Vector <ppb_vector.Vector>`, for instance
+to find the tile containing a position:
+
+>>> GridVector.from_vector(Vector(1.5, -0.5))
+GridVector(1, -1)
+>>> Vector(GridVector(1, -1))
+Vector(1.0, -1.0)
+"""
+import typing
+from math import floor
+from operator import index, itemgetter
+from typing import Any, SupportsFloat, Tuple
+
+from ppb_vector import _make, Vector, VectorLike
+
+if typing.TYPE_CHECKING:
+    from typing import SupportsIndex  # noqa: F401 (Python 3.8 onwards)
+
+__all__ = ('GridVector',)
+
+# Pairs of integers, which GridVector operations accept alongside GridVectors.
+GridVectorLike = typing.Union['GridVector', Tuple[int, int]]
+
+
+def _grid(x: int, y: int) -> 'GridVector':
+    # Trusted construction path, for coordinates which are already ints.
+    return tuple.__new__(GridVector, (x, y))
+
+
+def _unpack(value: Any) -> Tuple[int, int]:
+    """Get the coordinates of a grid vector-like, or raise TypeError."""
+    if type(value) is GridVector:
+        return value
+
+    if isinstance(value, tuple) and len(value) == 2:
+        x, y = value
+        if type(x) is int and type(y) is int:
+            return x, y
+
+    raise TypeError(f"Cannot use {value!r} as a grid vector")
+
+
+class GridVector(Tuple[int, int]):
+    """An immutable 2D vector with integer coordinates.
+
+    :py:class:`GridVector` is a tuple of its ``x`` and ``y`` coordinates, so
+    that it is hashed, compared and unpacked like one, in C. It supports the
+    operations of :py:class:`Vector <ppb_vector.Vector>` which keep integer
+    coordinates, with other grid vectors or pairs of ints:
+
+    >>> GridVector(1, 2) + (3, 4)
+    GridVector(4, 6)
+    >>> GridVector(1, 2) * 3
+    GridVector(3, 6)
+    >>> GridVector(1, 2).rotate(90)
+    GridVector(-2, 1)
+
+    Floor division and modulo by an int give the chunk containing a tile, and
+    the position of the tile in that chunk:
+
+    >>> GridVector(37, -5) // 16
+    GridVector(2, -1)
+    >>> GridVector(37, -5) % 16
+    GridVector(5, 11)
+
+    Operations with a :py:class:`Vector <ppb_vector.Vector>` convert the
+    grid vector, and produce a :py:class:`Vector <ppb_vector.Vector>`.
+    """
+
+    __slots__ = ()
+
+    # Like namedtuple fields, coordinates are read through C-level getters.
+    x = typing.cast(int, property(itemgetter(0), doc="The ``x`` coordinate."))
+    y = typing.cast(int, property(itemgetter(1), doc="The ``y`` coordinate."))
+
+    #: The null grid vector.
+    zero: typing.ClassVar['GridVector']
+
+    __match_args__ = ('x', 'y')
+
+    def __new__(cls, x: 'SupportsIndex', y: 'SupportsIndex') -> 'GridVector':
+        """Make a grid vector from integer coordinates.
+
+        Floats are rejected with :py:class:`TypeError`, rather than silently
+        truncated; use :py:meth:`from_vector` to convert them.
+        """
+        return tuple.__new__(cls, (index(x), index(y)))
+
+    def __getnewargs__(self) -> Tuple[int, int]:  # type: ignore
+        return self[0], self[1]
+
+    @classmethod
+    def from_vector(cls, value: VectorLike) -> 'GridVector':
+        """Find the grid cell containing a point, by rounding its coordinates down.
+
+        >>> GridVector.from_vector((2.9, -0.1))
+        GridVector(2, -1)
+        """
+        x, y = Vector._unpack(value)
+        return _grid(floor(x), floor(y))
+
+    def to_vector(self) -> Vector:
+        """Convert to a :py:class:`Vector <ppb_vector.Vector>`.
+
+        This is the same as ``Vector(grid_vector)``, but faster.
+        """
+        x, y = self
+        return _make(float(x), float(y))
+
+    def __repr__(self) -> str:
+        return f"GridVector({self[0]}, {self[1]})"
+
+    def __bool__(self) -> bool:
+        """Check whether the grid vector is non-zero."""
+        return self[0] != 0 or self[1] != 0
+
+    def __add__(self, other: GridVectorLike) -> 'GridVector':  # type: ignore
+        try:
+            x, y = _unpack(other)
+        except TypeError:
+            return NotImplemented
+
+        return _grid(self[0] + x, self[1] + y)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: GridVectorLike) -> 'GridVector':
+        try:
+            x, y = _unpack(other)
+        except TypeError:
+            return NotImplemented
+
+        return _grid(self[0] - x, self[1] - y)
+
+    def __rsub__(self, other: GridVectorLike) -> 'GridVector':
+        try:
+            x, y = _unpack(other)
+        except TypeError:
+            return NotImplemented
+
+        return _grid(x - self[0], y - self[1])
+
+    def __neg__(self) -> 'GridVector':
+        return _grid(-self[0], -self[1])
+
+    def __mul__(self, other: int) -> 'GridVector':  # type: ignore
+        """Scale by an int. Other factors, including floats, aren't supported."""
+        if type(other) is not int:
+            return NotImplemented
+
+        return _grid(self[0] * other, self[1] * other)
+
+    __rmul__ = __mul__  # type: ignore
+
+    def __floordiv__(self, other: int) -> 'GridVector':
+        if type(other) is not int:
+            return NotImplemented
+
+        return _grid(self[0] // other, self[1] // other)
+
+    def __mod__(self, other: int) -> 'GridVector':
+        if type(other) is not int:
+            return NotImplemented
+
+        return _grid(self[0] % other, self[1] % other)
+
+    def dot(self, other: GridVectorLike) -> int:
+        """Compute the dot product of two grid vectors."""
+        x, y = _unpack(other)
+        return self[0] * x + self[1] * y
+
+    def rotate(self, angle: SupportsFloat) -> 'GridVector':
+        """Rotate by a multiple of 90°, counter-clockwise like :py:meth:`Vector.rotate
+        <ppb_vector.Vector.rotate>`.
+
+        Raises :py:class:`ValueError` for other angles.
+        """
+        quarter_turns, remainder = divmod(float(angle), 90)
+        if remainder:
+            raise ValueError(f"Can only rotate grid vectors by multiples of 90°, not {angle}")
+
+        x, y = self
+        quarter_turns = int(quarter_turns) % 4
+        if quarter_turns == 1:
+            return _grid(-y, x)
+        if quarter_turns == 2:
+            return _grid(-x, -y)
+        if quarter_turns == 3:
+            return _grid(y, -x)
+        return self
+
+    @property
+    def manhattan_length(self) -> int:
+        """The number of orthogonal steps from the origin: ``|x| + |y|``."""
+        return abs(self[0]) + abs(self[1])
+
+    @property
+    def chebyshev_length(self) -> int:
+        """The number of steps from the origin, diagonals included: ``max(|x|, |y|)``."""
+        return max(abs(self[0]), abs(self[1]))
+
+
+GridVector.zero = _grid(0, 0)
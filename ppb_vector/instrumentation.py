@@ -0,0 +1,268 @@
+"""Counting calls to :py:class:`Vector <ppb_vector.Vector>` methods, and allocations.
+
+Instrumentation is opt-in: :py:func:`instrument` enables it for the duration
+of a ``with`` block, and collects counters for it:
+
+>>> from ppb_vector import instrument, Vector
+>>> with instrument() as counters:
+...     v = Vector(1, 2) + (3, 4)
+>>> counters.snapshot()
+{'calls': {'__add__': 1}, 'allocations': {'positional': 1, 'trusted': 1}}
+
+Setting the environment variable ``PPB_VECTOR_INSTRUMENT`` enables it for the
+whole process instead, and prints a report when it exits. Its value can be
+``timing`` to also measure the time spent in each method.
+
+While instrumentation is enabled, :py:class:`Vector <ppb_vector.Vector>`'s
+methods are replaced with counting wrappers; the original methods are put back
+when it is disabled, so that it costs nothing otherwise.
+"""
+import atexit
+import sys
+import typing
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import ppb_vector
+from ppb_vector import Vector
+
+__all__ = ('Counters', 'disable', 'enable', 'instrument')
+
+
+class Counters:
+    """Counters collected while instrumentation is enabled."""
+
+    __slots__ = ('calls', 'allocations', 'time', 'timing')
+
+    #: The number of calls to each public or special method of
+    #: :py:class:`Vector <ppb_vector.Vector>`, by name.
+    calls: typing.Counter[str]
+
+    #: The number of vectors made, by kind of constructor input: ``positional``
+    #: or ``keyword`` coordinates, ``vector-like`` conversions, or ``trusted``
+    #: construction, from coordinates computed by :py:class:`Vector
+    #: <ppb_vector.Vector>` methods.
+    allocations: typing.Counter[str]
+
+    #: The total time spent in each method, in seconds, when timing is enabled.
+    #: Time spent in nested calls is counted in both methods.
+    time: Dict[str, float]
+
+    def __init__(self, timing: bool = False):
+        self.timing = timing
+        self.calls = Counter()
+        self.allocations = Counter()
+        self.time = {}
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get a copy of the counters, as plain dictionaries."""
+        snapshot: Dict[str, Dict[str, Any]] = {
+            'calls': dict(self.calls),
+            'allocations': dict(self.allocations),
+        }
+        if self.timing:
+            snapshot['time'] = dict(self.time)
+
+        return snapshot
+
+    def report(self) -> str:
+        """Format the counters as a human-readable table, most-called methods first."""
+        allocations = ", ".join(f"{kind} {n}" for kind, n in sorted(self.allocations.items()))
+        lines = [
+            f"Vector allocations: {sum(self.allocations.values())} ({allocations or 'none'})",
+            f"{'calls':>10}  {'time (s)':>10}  method" if self.timing else f"{'calls':>10}  method",
+        ]
+        for name, calls in self.calls.most_common():
+            if self.timing:
+                lines.append(f"{calls:>10}  {self.time.get(name, 0.0):>10.6f}  {name}")
+            else:
+                lines.append(f"{calls:>10}  {name}")
+
+        return "\n".join(lines)
+
+
+# Counters of the enabled instrumentations, innermost last.
+_active: List[Counters] = []
+
+# Whether any of the enabled instrumentations measures time.
+_timing = False
+
+# The original attributes of Vector, and `_make` of the ppb_vector modules,
+#  replaced while instrumentation is enabled.
+_originals: Dict[str, Any] = {}
+
+# Attributes which aren't instrumented, besides private ones: construction
+#  is counted separately, and frozen instances don't allow assignment anyway.
+_SKIPPED = frozenset({'__new__', '__setattr__', '__delattr__'})
+
+# The kind of allocations made through `_make`, which is also the key of the
+#  original `_make` in _originals.
+_TRUSTED = 'trusted'
+
+
+def _record(name: str, start: Optional[float]) -> None:
+    elapsed = perf_counter() - start if start is not None else 0.0
+    for counters in _active:
+        counters.calls[name] += 1
+        if counters.timing:
+            counters.time[name] = counters.time.get(name, 0.0) + elapsed
+
+
+def _counted(name: str, f: Callable) -> Callable:
+    @wraps(f)
+    def counted(*args, **kwargs):
+        if not _timing:
+            _record(name, None)
+            return f(*args, **kwargs)
+
+        start = perf_counter()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            _record(name, start)
+
+    return counted
+
+
+def _counted_new(new: Callable) -> Callable:
+    @wraps(new)
+    def counted_new(cls, *args, **kwargs):
+        result = new(cls, *args, **kwargs)
+        if kwargs:
+            kind = 'keyword'
+        elif len(args) == 1:
+            if result is args[0]:
+                # Vector(v) returns v itself, without allocating.
+                return result
+
+            kind = 'vector-like'
+        else:
+            kind = 'positional'
+
+        for counters in _active:
+            counters.allocations[kind] += 1
+
+        return result
+
+    return counted_new
+
+
+def _counted_make(make: Callable) -> Callable:
+    @wraps(make)
+    def counted_make(x, y):
+        for counters in _active:
+            counters.allocations[_TRUSTED] += 1
+
+        return make(x, y)
+
+    return counted_make
+
+
+def _wrapper(name: str, attribute: Any) -> Any:
+    """Make the instrumented equivalent of a class attribute, or None."""
+    if name in _SKIPPED or (name.startswith('_') and not name.startswith('__')):
+        return None
+
+    if isinstance(attribute, property):
+        return property(_counted(name, attribute.fget), attribute.fset,  # type: ignore
+                        attribute.fdel, attribute.__doc__)
+
+    if isinstance(attribute, classmethod):
+        return classmethod(_counted(name, attribute.__func__))
+
+    if isinstance(attribute, staticmethod):
+        return staticmethod(_counted(name, attribute.__func__))
+
+    if callable(attribute) and not isinstance(attribute, type):
+        return _counted(name, attribute)
+
+    return None
+
+
+def _replace_make(old: Callable, new: Callable) -> None:
+    """Replace `_make` in ppb_vector, and in its submodules which imported it."""
+    for name, module in list(sys.modules.items()):
+        if name.partition('.')[0] == 'ppb_vector' and vars(module).get('_make') is old:
+            module._make = new  # type: ignore
+
+
+def _install() -> None:
+    for name, attribute in list(vars(Vector).items()):
+        wrapper = _wrapper(name, attribute)
+        if wrapper is not None:
+            _originals[name] = attribute
+            setattr(Vector, name, wrapper)
+
+    new = vars(Vector)['__new__']
+    _originals['__new__'] = new
+    Vector.__new__ = staticmethod(_counted_new(new.__func__))  # type: ignore
+
+    # Operators build their results through ppb_vector._make, which the
+    #  submodules import as a global of their own.
+    make = _originals[_TRUSTED] = ppb_vector._make
+    _replace_make(make, _counted_make(make))
+
+
+def _uninstall() -> None:
+    # Submodules imported while instrumentation was enabled got the counting
+    #  _make too, and have it replaced as well.
+    _replace_make(ppb_vector._make, _originals.pop(_TRUSTED))
+    for name, attribute in _originals.items():
+        setattr(Vector, name, attribute)
+
+    _originals.clear()
+
+
+def enable(timing: bool = False) -> Counters:
+    """Enable instrumentation, until the matching call to :py:func:`disable`.
+
+    :param timing: Whether to measure the time spent in each method. This
+      makes calls noticeably slower, while instrumentation is enabled.
+
+    Returns the counters which collect the calls, and allocations, from now on.
+    Instrumentations can be nested, with each collecting its own counters.
+    """
+    global _timing
+    counters = Counters(timing)
+    if not _active:
+        _install()
+
+    _active.append(counters)
+    _timing = _timing or timing
+    return counters
+
+
+def disable(counters: Counters) -> None:
+    """Stop collecting ``counters``, and disable instrumentation if no others are."""
+    global _timing
+    _active.remove(counters)
+    _timing = any(c.timing for c in _active)
+    if not _active:
+        _uninstall()
+
+
+@contextmanager
+def instrument(timing: bool = False) -> Iterator[Counters]:
+    """Enable instrumentation for the duration of a ``with`` block.
+
+    The context manager returns the :py:class:`Counters` for that block, which
+    can be read with :py:meth:`Counters.snapshot` or :py:meth:`Counters.report`.
+    """
+    counters = enable(timing)
+    try:
+        yield counters
+    finally:
+        disable(counters)
+
+
+#: The counters enabled by the ``PPB_VECTOR_INSTRUMENT`` environment variable.
+counters: Optional[Counters] = None
+
+
+def _enable_from_environment(value: str) -> None:
+    global counters
+    counters = enable(timing=value.lower() == 'timing')
+    atexit.register(lambda: print(counters.report(), file=sys.stderr))  # type: ignore
@@ -0,0 +1,155 @@
+"""Sharing :py:class:`Vector <ppb_vector.Vector>` instances with the same coordinates.
+
+Tile-based games make many vectors with the same few coordinates. Vectors are
+immutable, so those can all be the same object, which a
+:py:class:`VectorInterner` takes care of:
+
+>>> from ppb_vector import Vector, VectorInterner
+>>> tiles = VectorInterner()
+>>> tiles(3, 4) is tiles(Vector(3, 4)) is tiles((3, 4))
+True
+"""
+import typing
+import weakref
+from collections import OrderedDict
+from math import copysign
+from typing import Optional, SupportsFloat, Tuple
+
+from ppb_vector import _float, _make, Vector, VectorLike
+
+__all__ = ('VectorInterner',)
+
+
+Key = Tuple[float, ...]
+
+
+def _key(x: float, y: float) -> Key:
+    # 0.0 and -0.0 compare (and hash) equal, but the sign of zero coordinates
+    #  matters, for instance to Vector.angle, so it is part of the key.
+    if x == 0 or y == 0:
+        return (x, y, copysign(1.0, x), copysign(1.0, y))
+
+    return (x, y)
+
+
+class VectorInterner:
+    """A cache of :py:class:`Vector <ppb_vector.Vector>` instances, keyed on their coordinates.
+
+    Calling it takes the same arguments as :py:class:`Vector <ppb_vector.Vector>`,
+    and returns a previously-made vector with the same coordinates if there is
+    one still in use.
+
+    :param maxsize: The maximum number of vectors kept in the cache, or ``None``
+      for no limit. Once it is reached, the least-recently used vector is evicted.
+
+    The cache only holds weak references: vectors that are not used anymore
+    are evicted as well. :py:attr:`Vector.zero <ppb_vector.Vector.zero>`,
+    :py:attr:`Vector.x_unit <ppb_vector.Vector.x_unit>` and
+    :py:attr:`Vector.y_unit <ppb_vector.Vector.y_unit>` are always interned:
+
+    >>> VectorInterner()(0, 0) is Vector.zero
+    True
+    """
+
+    __slots__ = ('_maxsize', '_refs', '_pinned', 'hits', 'misses', '__weakref__')
+
+    _refs: 'OrderedDict[Key, weakref.ref]'
+    _pinned: typing.Dict[Key, Vector]
+
+    #: The number of lookups which returned an existing vector.
+    hits: int
+
+    #: The number of lookups which made or inserted a new vector.
+    misses: int
+
+    def __init__(self, maxsize: Optional[int] = 4096):
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("VectorInterner takes a non-negative maxsize")
+
+        self._maxsize = maxsize
+        self._refs = OrderedDict()
+        self._pinned = {
+            _key(v.x, v.y): v for v in (Vector.zero, Vector.x_unit, Vector.y_unit)
+        }
+        self.hits = self.misses = 0
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        """The maximum number of (non-pinned) vectors kept in the cache."""
+        return self._maxsize
+
+    def __len__(self) -> int:
+        """The number of vectors currently interned, including pinned ones."""
+        return len(self._refs) + len(self._pinned)
+
+    def __repr__(self) -> str:
+        return f"VectorInterner(maxsize={self._maxsize})"
+
+    @typing.overload
+    def __call__(self, x: SupportsFloat, y: SupportsFloat) -> Vector: pass
+
+    @typing.overload
+    def __call__(self, other: VectorLike) -> Vector: pass
+
+    def __call__(self, *args):
+        """Get the interned vector with the given coordinates, interning it if needed."""
+        if len(args) == 2:
+            x, y = _float(args[0]), _float(args[1])
+            return self._lookup(x, y, None)
+
+        if len(args) != 1:
+            raise TypeError(f"Expected 1 vector-like or 2 float-like arguments, got {len(args)}")
+
+        value = args[0]
+        x, y = Vector._unpack(value)
+        return self._lookup(x, y, value if type(value) is Vector else None)
+
+    intern = __call__
+
+    def _lookup(self, x: float, y: float, instance: Optional[Vector]) -> Vector:
+        if x != x or y != y:
+            # NaN coordinates never compare equal, so they cannot be looked up.
+            return instance if instance is not None else _make(x, y)
+
+        key = _key(x, y)
+        pinned = self._pinned.get(key)
+        if pinned is not None:
+            self.hits += 1
+            return pinned
+
+        refs = self._refs
+        ref = refs.get(key)
+        if ref is not None:
+            vector = ref()
+            if vector is not None:
+                self.hits += 1
+                refs.move_to_end(key)
+                return vector
+
+        self.misses += 1
+        if self._maxsize == 0:
+            return instance if instance is not None else _make(x, y)
+
+        vector = instance if instance is not None else _make(x, y)
+        refs[key] = weakref.ref(vector, self._evictor(key))
+        if self._maxsize is not None and len(refs) > self._maxsize:
+            refs.popitem(last=False)
+
+        return vector
+
+    def _evictor(self, key: Key) -> typing.Callable[[weakref.ref], None]:
+        # The callback only holds a weak reference to the interner, so that
+        #  interned vectors don't keep it alive.
+        interner = weakref.ref(self)
+
+        def evict(ref: weakref.ref) -> None:
+            self = interner()
+            if self is not None and self._refs.get(key) is ref:
+                del self._refs[key]
+
+        return evict
+
+    def clear(self) -> None:
+        """Evict all vectors, except the pinned ones, and reset the statistics."""
+        self._refs.clear()
+        self.hits = self.misses = 0
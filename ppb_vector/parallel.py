@@ -0,0 +1,211 @@
+"""Batch operations split across threads, for very large batches.
+
+NumPy releases the GIL while computing over arrays, so a
+:py:class:`VectorArray <ppb_vector.VectorArray>` operation split into chunks
+can run on several cores at once. :py:class:`ParallelExecutor` does that for
+the most common batch operations:
+
+>>> from ppb_vector import ParallelExecutor, VectorArray
+>>> with ParallelExecutor() as parallel:
+...     parallel.rotate(VectorArray([(1, 0), (0, 1)]), 90)
+VectorArray([Vector(0.0, 1.0), Vector(-1.0, 0.0)])
+
+Each chunk is computed by the same :py:class:`VectorArray
+<ppb_vector.VectorArray>` method as the whole batch would be, so results are
+identical to the serial ones; small batches are simply computed serially.
+
+This module requires NumPy.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil
+from time import perf_counter
+from typing import Any, Callable, List, Optional, Union
+
+import numpy as np
+
+from ppb_vector import Rotation
+from ppb_vector.array import Scalars, VectorArray, VectorArrayLike
+
+__all__ = ('ParallelExecutor',)
+
+
+# The number of vectors timed by ParallelExecutor.calibrate.
+_CALIBRATION_SIZE = 1 << 16
+
+# Chunks are sized so that dispatching one to a thread costs about this
+#  fraction of computing it, and are never smaller than _MIN_CHUNK_SIZE.
+_OVERHEAD_RATIO = 0.05
+_MIN_CHUNK_SIZE = 1 << 12
+
+
+def _available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))  # type: ignore
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _split_vectors(arg: VectorArrayLike, length: int, start: int, stop: int) -> Any:
+    # Vector parameters are batched as VectorArrays, or (N, 2) arrays.
+    if isinstance(arg, VectorArray) or (isinstance(arg, np.ndarray) and arg.ndim == 2):
+        if len(arg) != length:
+            raise ValueError(f"Cannot broadcast a batch of {len(arg)} vectors "
+                             f"against one of {length}")
+        return arg[start:stop]
+
+    return arg
+
+
+def _split_scalars(arg: Union[Scalars, Rotation], length: int, start: int, stop: int) -> Any:
+    # Scalar parameters are batched as 1-dimensional arrays.
+    if isinstance(arg, np.ndarray) and arg.ndim > 0:
+        if arg.shape != (length,):
+            raise ValueError(f"Expected {length} scalars, got shape {arg.shape}")
+        return arg[start:stop]
+
+    return arg
+
+
+class ParallelExecutor:
+    """Run batch operations over chunks of a batch, in a pool of threads.
+
+    :param workers: The maximum number of threads; by default, the number of
+      CPUs available to the process.
+    :param chunk_size: The minimum number of vectors per chunk, below which a
+      batch isn't worth splitting. By default, it is measured by
+      :py:meth:`calibrate` when first needed.
+
+    The thread pool is started lazily, and stopped by :py:meth:`shutdown`, or
+    when leaving a ``with`` block.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: Optional[int] = None):
+        if workers is not None and workers < 1:
+            raise ValueError(f"Expected at least one worker, got {workers}")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"Expected a positive chunk size, got {chunk_size}")
+
+        self.workers = workers or _available_cpus()
+        self._chunk_size = chunk_size
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"ParallelExecutor(workers={self.workers}, chunk_size={self._chunk_size})"
+
+    def __enter__(self) -> 'ParallelExecutor':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='ppb_vector')
+
+            return self._pool
+
+    def shutdown(self) -> None:
+        """Stop the thread pool, which is restarted if the executor is used again."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+
+        if pool is not None:
+            pool.shutdown()
+
+    @property
+    def chunk_size(self) -> int:
+        """The minimum number of vectors per chunk."""
+        if self._chunk_size is None:
+            self._chunk_size = self.calibrate()
+
+        return self._chunk_size
+
+    def calibrate(self) -> int:
+        """Measure how many vectors a chunk needs, to be worth sending to a thread.
+
+        This times dispatching work to the thread pool, against computing a
+        batch rotation, and returns the number of vectors for which the first
+        is a small fraction of the second. It only takes a few milliseconds.
+        """
+        if self.workers == 1:
+            # Batches are never split anyway.
+            return _MIN_CHUNK_SIZE
+
+        pool = self._executor()
+        list(pool.map(len, [()] * self.workers))  # Start the threads
+
+        tasks = 4 * self.workers
+        start = perf_counter()
+        list(pool.map(len, [()] * tasks))
+        dispatch = (perf_counter() - start) / tasks
+
+        sample = VectorArray.zeros(_CALIBRATION_SIZE)
+        start = perf_counter()
+        sample.rotate(30)
+        per_vector = (perf_counter() - start) / _CALIBRATION_SIZE
+
+        return max(_MIN_CHUNK_SIZE, ceil(dispatch / (per_vector * _OVERHEAD_RATIO)))
+
+    def _bounds(self, length: int) -> List[int]:
+        """Split ``length`` vectors into at most ``workers`` equal chunks."""
+        chunks = max(1, min(self.workers, length // self.chunk_size))
+        return [length * i // chunks for i in range(chunks + 1)]
+
+    def _run(self, batch: VectorArray, compute: Callable[[int, int], Any],
+             vectors: bool) -> Any:
+        bounds = self._bounds(len(batch))
+        if len(bounds) == 2:
+            return compute(0, len(batch))
+
+        out = np.empty((2, len(batch)) if vectors else len(batch), dtype=np.float64)
+
+        def work(start: int, stop: int) -> None:
+            result = compute(start, stop)
+            if vectors:
+                out[:, start:stop] = result._data
+            else:
+                out[start:stop] = result
+
+        # Consuming the results raises the exceptions of any chunk.
+        list(self._executor().map(work, bounds[:-1], bounds[1:]))
+        return VectorArray._wrap(out) if vectors else out
+
+    def rotate(self, batch: VectorArray, angle: Union[Scalars, Rotation]) -> VectorArray:
+        """Parallel :py:meth:`VectorArray.rotate <ppb_vector.VectorArray.rotate>`."""
+        n = len(batch)
+        return self._run(batch, lambda start, stop: batch[start:stop].rotate(
+            _split_scalars(angle, n, start, stop),
+        ), vectors=True)
+
+    def normalize(self, batch: VectorArray) -> VectorArray:
+        """Parallel :py:meth:`VectorArray.normalize <ppb_vector.VectorArray.normalize>`."""
+        return self._run(batch, lambda start, stop: batch[start:stop].normalize(), vectors=True)
+
+    def truncate(self, batch: VectorArray, max_length: Scalars) -> VectorArray:
+        """Parallel :py:meth:`VectorArray.truncate <ppb_vector.VectorArray.truncate>`."""
+        n = len(batch)
+        return self._run(batch, lambda start, stop: batch[start:stop].truncate(
+            _split_scalars(max_length, n, start, stop),
+        ), vectors=True)
+
+    def reflect(self, batch: VectorArray, surface_normal: VectorArrayLike) -> VectorArray:
+        """Parallel :py:meth:`VectorArray.reflect <ppb_vector.VectorArray.reflect>`."""
+        n = len(batch)
+        return self._run(batch, lambda start, stop: batch[start:stop].reflect(
+            _split_vectors(surface_normal, n, start, stop),
+        ), vectors=True)
+
+    def dot(self, batch: VectorArray, other: VectorArrayLike) -> np.ndarray:
+        """Parallel :py:meth:`VectorArray.dot <ppb_vector.VectorArray.dot>`."""
+        n = len(batch)
+        return self._run(batch, lambda start, stop: batch[start:stop].dot(
+            _split_vectors(other, n, start, stop),
+        ), vectors=False)
+
+    def length(self, batch: VectorArray) -> np.ndarray:
+        """Parallel :py:attr:`VectorArray.length <ppb_vector.VectorArray.length>`."""
+        return self._run(batch, lambda start, stop: batch[start:stop].length, vectors=False)
@@ -0,0 +1,306 @@
+"""Paths made of line segments, indexed by the distance along them.
+
+A :py:class:`Polyline` measures its segments once, when it is made, so that
+finding the point at some distance along the path is a binary search rather
+than a walk over all segments:
+
+>>> from ppb_vector import Polyline
+>>> path = Polyline([(0, 0), (3, 4), (3, 10)])
+>>> path.length
+11.0
+>>> path.point_at(8)
+Vector(3.0, 7.0)
+
+Distances can also be given as a NumPy array, to sample many points at once
+into a :py:class:`VectorArray <ppb_vector.VectorArray>`.
+"""
+import typing
+from array import array
+from bisect import bisect_right
+from math import hypot
+from typing import Any, Iterator, SupportsFloat, Tuple
+
+from ppb_vector import _is_scalar, _make, Vector, VectorLike
+
+if typing.TYPE_CHECKING:
+    import numpy as np  # noqa: F401
+
+    from ppb_vector.array import VectorArray  # noqa: F401
+
+__all__ = ('Polyline',)
+
+
+class Polyline:
+    """An immutable path through a sequence of vertices.
+
+    :param vertices: The vertices of the path, as vector-likes; there must be
+      at least one. Consecutive vertices which are equal, or too close to add
+      to the length of the path, are merged.
+
+    Distances along the path are clamped to ``[0, length]``, so that
+    :py:meth:`point_at` returns the first vertex for negative distances, and
+    the last one past the end.
+
+    Queries with increasing, or decreasing, distances (as when following the
+    path) resume from the segment of the previous query, so that they take
+    constant time on average; other queries take logarithmic time.
+    """
+
+    __slots__ = ('_x', '_y', '_cumulative', '_cursor')
+
+    _x: 'array[float]'
+    _y: 'array[float]'
+    # The distance along the path of each vertex.
+    _cumulative: 'array[float]'
+    # The segment of the last query, as a starting point for the next one.
+    _cursor: int
+
+    def __init__(self, vertices: typing.Iterable[VectorLike]):
+        xs, ys, cumulative = array('d'), array('d'), array('d')
+        total = 0.0
+        for v in vertices:
+            x, y = Vector._unpack(v)
+            if xs:
+                step = total + hypot(x - xs[-1], y - ys[-1])
+                if step == total:
+                    continue
+                total = step
+
+            xs.append(x)
+            ys.append(y)
+            cumulative.append(total)
+
+        if not xs:
+            raise ValueError("A Polyline needs at least one vertex")
+
+        self._x, self._y, self._cumulative = xs, ys, cumulative
+        self._cursor = 0
+
+    def __len__(self) -> int:
+        """The number of vertices."""
+        return len(self._x)
+
+    def __getitem__(self, index: int) -> Vector:
+        return _make(self._x[index], self._y[index])
+
+    def __iter__(self) -> Iterator[Vector]:
+        for x, y in zip(self._x, self._y):
+            yield _make(x, y)
+
+    def __repr__(self) -> str:
+        return f"Polyline({list(self)!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Polyline):
+            return NotImplemented
+
+        return self._x == other._x and self._y == other._y
+
+    def __hash__(self) -> int:
+        return hash((tuple(self._x), tuple(self._y)))
+
+    @property
+    def length(self) -> float:
+        """The total length of the path."""
+        return self._cumulative[-1]
+
+    def distances(self) -> typing.List[float]:
+        """The distance along the path of each vertex.
+
+        >>> Polyline([(0, 0), (3, 4), (3, 10)]).distances()
+        [0.0, 5.0, 11.0]
+        """
+        return self._cumulative.tolist()
+
+    def _segment(self, distance: float) -> int:
+        """Find the segment containing ``distance``, clamped to the existing ones."""
+        cumulative = self._cumulative
+        # The cursor may be stale if another thread moved it, in which case
+        #  the checks below fail and the search proceeds normally.
+        i = self._cursor
+        if cumulative[i] <= distance < cumulative[i + 1]:
+            return i
+
+        last = len(cumulative) - 2
+        if i < last and cumulative[i + 1] <= distance < cumulative[i + 2]:
+            i += 1
+        elif i > 0 and cumulative[i - 1] <= distance < cumulative[i]:
+            i -= 1
+        else:
+            i = min(max(bisect_right(cumulative, distance) - 1, 0), last)
+
+        self._cursor = i
+        return i
+
+    def _batch_segments(self, distances: Any) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Find the segments containing a batch of distances, and the position along them."""
+        import numpy as np
+        cumulative = np.frombuffer(self._cumulative)
+        d = np.asarray(distances, dtype=np.float64)
+        i = np.clip(np.searchsorted(cumulative, d, side='right') - 1, 0, len(cumulative) - 2)
+        start = cumulative[i]
+        t = np.clip((d - start) / (cumulative[i + 1] - start), 0.0, 1.0)
+        return i, t
+
+    @typing.overload
+    def point_at(self, distance: SupportsFloat) -> Vector: pass
+
+    @typing.overload
+    def point_at(self, distance: Any) -> 'VectorArray': pass
+
+    def point_at(self, distance):
+        """Find the point at ``distance`` along the path.
+
+        :param distance: A distance, or a batch of distances, as a
+          1-dimensional NumPy array or a sequence.
+
+        For a batch of distances, this returns a :py:class:`VectorArray
+        <ppb_vector.VectorArray>` of the points:
+
+        >>> Polyline([(0, 0), (4, 0)]).point_at([1, 2, 5])
+        VectorArray([Vector(1.0, 0.0), Vector(2.0, 0.0), Vector(4.0, 0.0)])
+        """
+        xs, ys = self._x, self._y
+        if len(xs) == 1:
+            return self._broadcast(self[0], distance)
+
+        if not _is_scalar(distance):
+            from ppb_vector.array import VectorArray
+            x, y = (self._columns(c) for c in (xs, ys))
+            i, t = self._batch_segments(distance)
+            return VectorArray.from_columns((1 - t) * x[i] + t * x[i + 1],
+                                            (1 - t) * y[i] + t * y[i + 1])
+
+        distance = float(distance)
+        i = self._segment(distance)
+        start = self._cumulative[i]
+        t = (distance - start) / (self._cumulative[i + 1] - start)
+        return self._interpolate(i, min(max(t, 0.0), 1.0))
+
+    def _interpolate(self, i: int, t: float) -> Vector:
+        # Unlike a + t (b - a), this is exact at both ends of the segment.
+        xs, ys = self._x, self._y
+        return _make((1 - t) * xs[i] + t * xs[i + 1], (1 - t) * ys[i] + t * ys[i + 1])
+
+    @typing.overload
+    def tangent_at(self, distance: SupportsFloat) -> Vector: pass
+
+    @typing.overload
+    def tangent_at(self, distance: Any) -> 'VectorArray': pass
+
+    def tangent_at(self, distance):
+        """Find the direction of the path at ``distance`` along it, as a unit vector.
+
+        At a vertex, this is the direction of the segment starting there,
+        except at the end of the path. A path with a single vertex has no
+        direction, and its tangent is the null vector.
+
+        >>> path = Polyline([(0, 0), (3, 4), (3, 10)])
+        >>> path.tangent_at(2)
+        Vector(0.6, 0.8)
+        >>> path.tangent_at(5)
+        Vector(0.0, 1.0)
+        """
+        xs, ys = self._x, self._y
+        if len(xs) == 1:
+            return self._broadcast(Vector.zero, distance)
+
+        if not _is_scalar(distance):
+            import numpy as np
+
+            from ppb_vector.array import VectorArray
+            x, y = (self._columns(c) for c in (xs, ys))
+            i, _ = self._batch_segments(distance)
+            dx, dy = x[i + 1] - x[i], y[i + 1] - y[i]
+            length = np.hypot(dx, dy)
+            return VectorArray.from_columns(dx / length, dy / length)
+
+        i = self._segment(float(distance))
+        dx, dy = xs[i + 1] - xs[i], ys[i + 1] - ys[i]
+        length = hypot(dx, dy)
+        return _make(dx / length, dy / length)
+
+    @staticmethod
+    def _columns(column: 'array[float]') -> 'np.ndarray':
+        import numpy as np
+        return np.frombuffer(column)
+
+    @staticmethod
+    def _broadcast(v: Vector, distance: Any) -> Any:
+        # The result of a query on a path without segments.
+        if _is_scalar(distance):
+            return v
+
+        import numpy as np
+
+        from ppb_vector.array import VectorArray
+        n = len(np.asarray(distance))
+        return VectorArray.from_columns(np.full(n, v.x), np.full(n, v.y))
+
+    def _locate(self, point: VectorLike) -> Tuple[int, float]:
+        """Find the segment closest to ``point``, and the position along it."""
+        px, py = Vector._unpack(point)
+        xs, ys = self._x, self._y
+        best, best_i, best_t = float('inf'), 0, 0.0
+        for i in range(len(xs) - 1):
+            sx, sy = xs[i], ys[i]
+            dx, dy = xs[i + 1] - sx, ys[i + 1] - sy
+            length_squared = dx * dx + dy * dy
+            if length_squared == 0:
+                # The segment is so short that its squared length underflows.
+                t = 0.0
+            else:
+                t = min(max(((px - sx) * dx + (py - sy) * dy) / length_squared, 0.0), 1.0)
+            distance = (px - sx - t * dx) ** 2 + (py - sy - t * dy) ** 2
+            if distance < best:
+                best, best_i, best_t = distance, i, t
+
+        return best_i, best_t
+
+    def closest_point(self, point: VectorLike) -> Vector:
+        """Find the point of the path closest to ``point``.
+
+        This checks every segment, in linear time.
+
+        >>> Polyline([(0, 0), (4, 0), (4, 4)]).closest_point((5, 1))
+        Vector(4.0, 1.0)
+        """
+        if len(self) == 1:
+            return self[0]
+
+        return self._interpolate(*self._locate(point))
+
+    def project(self, point: VectorLike) -> float:
+        """Find the distance along the path of the point closest to ``point``.
+
+        This is the inverse of :py:meth:`point_at`, for points on the path:
+
+        >>> path = Polyline([(0, 0), (4, 0), (4, 4)])
+        >>> path.project((5, 1))
+        5.0
+        >>> path.point_at(path.project((5, 1)))
+        Vector(4.0, 1.0)
+        """
+        if len(self) == 1:
+            return 0.0
+
+        i, t = self._locate(point)
+        start = self._cumulative[i]
+        return start + t * (self._cumulative[i + 1] - start)
+
+    def resample(self, count: int) -> 'Polyline':
+        """Make a path through ``count`` points evenly spaced along this one.
+
+        Both ends are kept, but other vertices are generally not, so corners
+        are cut:
+
+        >>> Polyline([(0, 0), (4, 0), (4, 4)]).resample(3)
+        Polyline([Vector(0.0, 0.0), Vector(4.0, 0.0), Vector(4.0, 4.0)])
+        """
+        if count < 2:
+            raise ValueError(f"Expected at least 2 points, got {count}")
+
+        step = self.length / (count - 1)
+        points = [self.point_at(i * step) for i in range(count - 1)]
+        points.append(self[-1])
+        return Polyline(points)
@@ -0,0 +1,239 @@
+"""Batches of 2D vectors in shared memory, for working across processes.
+
+A :py:class:`SharedVectorArray` is a :py:class:`VectorArray
+<ppb_vector.VectorArray>` whose coordinates live in a
+:py:mod:`multiprocessing.shared_memory` block. Other processes attach to it
+by name, and read and write its coordinates in place, without copying them:
+
+>>> from ppb_vector import SharedVectorArray, Vector
+>>> with SharedVectorArray([(1, 0), (0, 1), (3, 4)]) as positions:
+...     with SharedVectorArray.attach(positions.name) as view:
+...         view[2] = view[2].normalize()
+...     positions[2]
+Vector(0.6, 0.8)
+
+Pickling a :py:class:`SharedVectorArray` only sends the name of its block, so
+passing one to a worker process attaches to it on the other side.
+:py:meth:`SharedVectorArray.map` uses that to run a batch operation over
+chunks of the vectors, in a pool of processes.
+
+This module requires NumPy, and Python 3.8 or later.
+"""
+import os
+import struct
+from contextlib import nullcontext
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Iterable, Optional, SupportsFloat, Tuple, Union
+
+import numpy as np
+
+from ppb_vector import VectorLike
+from ppb_vector.array import VectorArray
+
+__all__ = ('SharedVectorArray',)
+
+
+# The header of a shared block: the number of vectors, padded so that the
+#  coordinates which follow are aligned.
+_HEADER = struct.Struct('=Q8x')
+
+# A batch operation: the name of a VectorArray method, or a picklable
+#  function taking a VectorArray chunk as its first argument.
+Operation = Union[str, Callable[..., VectorArray]]
+
+
+class SharedVectorArray(VectorArray):
+    """A :py:class:`VectorArray <ppb_vector.VectorArray>` backed by shared memory.
+
+    Making a :py:class:`SharedVectorArray` creates a new shared memory block,
+    holding a copy of the given vectors. Other processes can
+    :py:meth:`attach` to it by name; each process should :py:meth:`close` it
+    when done, and the one which created it should also :py:meth:`unlink` it,
+    which frees the block once all processes closed it. Using it as a context
+    manager does both, as appropriate.
+
+    Slicing a :py:class:`SharedVectorArray` produces a view of its
+    coordinates, so that each process can update its own disjoint slices:
+
+    >>> from ppb_vector import Vector
+    >>> with SharedVectorArray.zeros(4) as a:
+    ...     a[2:] += Vector(1, 2)
+    ...     a[3]
+    Vector(1.0, 2.0)
+
+    Results of operations, like ``a + b`` or :py:meth:`VectorArray.rotate
+    <ppb_vector.VectorArray.rotate>`, are regular, private
+    :py:class:`VectorArray <ppb_vector.VectorArray>` instances.
+    """
+
+    __slots__ = ('_shm', '_owner')
+
+    _shm: SharedMemory
+    _owner: bool
+
+    def __init__(self, vectors: Iterable[VectorLike] = (), *, name: Optional[str] = None):
+        data = VectorArray(vectors)._data
+        self._create(data.shape[1], name)
+        self._data[...] = data
+
+    def _create(self, length: int, name: Optional[str]) -> None:
+        size = 2 * length * np.dtype(np.float64).itemsize
+        self._shm = SharedMemory(name, create=True, size=_HEADER.size + size)
+        self._owner = True
+        _HEADER.pack_into(self._shm.buf, 0, length)  # type: ignore
+        self._map(length)
+
+    def _map(self, length: int) -> None:
+        # Views made by np.frombuffer hold an export of the shared memory, so
+        #  that it can't be unmapped while they exist.
+        self._data = np.frombuffer(self._shm.buf, dtype=np.float64,  # type: ignore
+                                   count=2 * length, offset=_HEADER.size).reshape(2, length)
+
+    @classmethod
+    def zeros(cls, length: int, *, name: Optional[str] = None) -> 'SharedVectorArray':
+        """Create a shared batch of ``length`` null vectors."""
+        self = cls.__new__(cls)
+        self._create(length, name)
+        self._data[...] = 0
+        return self
+
+    @classmethod
+    def from_columns(cls, x: Iterable[SupportsFloat], y: Iterable[SupportsFloat],
+                     *, name: Optional[str] = None) -> 'SharedVectorArray':
+        """Create a shared batch from separate columns of coordinates."""
+        return cls(VectorArray.from_columns(x, y), name=name)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedVectorArray':
+        """Attach to the shared batch called ``name``, made by any process."""
+        self = cls.__new__(cls)
+        self._shm = SharedMemory(name)
+        self._owner = False
+        length, = _HEADER.unpack_from(self._shm.buf)  # type: ignore
+        self._map(length)
+        return self
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory block, for :py:meth:`attach`."""
+        return self._shm.name
+
+    def close(self) -> None:
+        """Stop using the shared block from this process.
+
+        The batch is empty afterwards. Views of the coordinates, like slices
+        or :py:attr:`x <ppb_vector.VectorArray.x>` columns, must not outlive
+        it: if some still exist, this raises :py:class:`BufferError`, and the
+        shared memory stays mapped until they are garbage-collected.
+        """
+        self._data = np.empty((2, 0), dtype=np.float64)
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Request the shared block to be freed, once all processes closed it.
+
+        This should be called once, typically by the process which created it.
+        """
+        self._shm.unlink()
+
+    def __enter__(self) -> 'SharedVectorArray':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the batch, and unlink it if this process created it."""
+        try:
+            self.close()
+        finally:
+            if self._owner:
+                self.unlink()
+
+    def __repr__(self) -> str:
+        return f"<SharedVectorArray {self.name!r} of {len(self)} vectors>"
+
+    def __reduce_ex__(self, protocol: Any) -> Tuple[Any, ...]:
+        return SharedVectorArray.attach, (self.name,)
+
+    def map(self, operation: Operation, *args: Any,
+            out: Optional['SharedVectorArray'] = None,
+            pool: Any = None, chunks: Optional[int] = None) -> 'SharedVectorArray':
+        """Apply a batch operation to chunks of the vectors, in parallel.
+
+        :param operation: The name of a :py:class:`VectorArray
+          <ppb_vector.VectorArray>` method returning a batch, like
+          ``'rotate'`` or ``'normalize'``, or a picklable function taking a
+          batch, followed by ``args``, and returning a batch of the same length.
+        :param out: Where to write the results; by default, in place.
+        :param pool: A process pool, like :py:class:`multiprocessing.pool.Pool`
+          or :py:class:`concurrent.futures.ProcessPoolExecutor`; only its
+          ``map`` method is used. By default, a new pool is made for this call.
+        :param chunks: How many chunks to split the batch in; by default, the
+          number of CPUs.
+
+        Each worker process attaches to the shared blocks, and computes and
+        writes its own chunk in place, so the coordinates are never copied
+        between processes. Arguments with one entry per vector, like a
+        :py:class:`VectorArray <ppb_vector.VectorArray>` or a NumPy column of
+        the same length, are split into the same chunks; pass them as a
+        :py:class:`SharedVectorArray` to avoid sending them to each worker.
+
+        >>> from concurrent.futures import ProcessPoolExecutor
+        >>> with ProcessPoolExecutor(2) as pool, SharedVectorArray([(3, 4), (0, 2)]) as a:
+        ...     list(a.map('normalize', pool=pool))
+        [Vector(0.6, 0.8), Vector(0.0, 1.0)]
+        """
+        if out is None:
+            out = self
+        elif len(out) != len(self):
+            raise ValueError(f"Cannot write results for {len(self)} vectors into {len(out)}")
+
+        if chunks is None:
+            chunks = os.cpu_count() or 1
+        chunks = max(1, min(chunks, len(self)))
+
+        bounds = np.linspace(0, len(self), chunks + 1).astype(int).tolist()
+        tasks = [
+            (operation, self.name, out.name, len(self), start, stop, args)
+            for start, stop in zip(bounds, bounds[1:])
+        ]
+
+        if pool is not None:
+            list(pool.map(_map_chunk, tasks))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(chunks) as executor:
+                list(executor.map(_map_chunk, tasks))
+
+        return out
+
+
+def _chunk(arg: Any, length: int, start: int, stop: int) -> Any:
+    # Split arguments with one entry per vector into the same chunks.
+    batched = isinstance(arg, VectorArray) or (isinstance(arg, np.ndarray) and arg.ndim > 0)
+    if batched and len(arg) == length:
+        return arg[start:stop]
+
+    return arg
+
+
+def _map_chunk(task: Tuple[Any, ...]) -> None:
+    """Compute one chunk of :py:meth:`SharedVectorArray.map`, in a worker process."""
+    # Shared batches among the arguments were attached when unpickling them.
+    attached = [arg for arg in task[-1] if isinstance(arg, SharedVectorArray)]
+    try:
+        _compute_chunk(*task)
+    finally:
+        for arg in attached:
+            arg.close()
+
+
+def _compute_chunk(operation: Operation, source: str, out: str,
+                   length: int, start: int, stop: int, args: Tuple[Any, ...]) -> None:
+    # Views of the attached blocks only live in this frame, so that they can
+    #  be closed once it returns.
+    chunks = [_chunk(arg, length, start, stop) for arg in args]
+    with SharedVectorArray.attach(source) as a:
+        with nullcontext(a) if out == source else SharedVectorArray.attach(out) as b:
+            if isinstance(operation, str):
+                b[start:stop] = getattr(a[start:stop], operation)(*chunks)
+            else:
+                b[start:stop] = operation(a[start:stop], *chunks)
@@ -0,0 +1,579 @@
+"""Spatial indexes, for finding points close to one another.
+
+A :py:class:`SpatialHash` answers queries like "which entities are within
+``r`` of this point" by only looking at the entities near that point, rather
+than comparing it against every other one:
+
+>>> from ppb_vector import SpatialHash
+>>> index = SpatialHash(cell_size=10)
+>>> index.insert('player', (0, 0))
+>>> index.insert('orc', (3, 4))
+>>> index.insert('dragon', (100, 100))
+>>> sorted(index.within((0, 0), 5))
+['orc', 'player']
+>>> index.nearest((90, 90))
+['dragon']
+"""
+import heapq
+import struct
+import sys
+import typing
+from array import array
+from math import floor, isfinite
+from typing import Dict, Hashable, Iterable, List, Mapping, SupportsFloat, Tuple, Union
+
+from ppb_vector import _batch, _make, Vector, VectorLike
+
+if typing.TYPE_CHECKING:
+    from ppb_vector.array import VectorArray  # noqa: F401
+
+__all__ = ('KDTree', 'SpatialHash')
+
+
+Cell = Tuple[int, int]
+
+# Vector-likes, or a batch of vectors.
+Points = Union[Iterable[VectorLike], 'VectorArray']
+
+# Either a mapping from keys to positions, or positions keyed by their index.
+Positions = Union[Mapping[Hashable, VectorLike], Points]
+
+
+def _vector(value: VectorLike) -> Vector:
+    if type(value) is Vector:
+        return value  # type: ignore
+
+    return _make(*Vector._unpack(value))
+
+
+class SpatialHash:
+    """An index of points, bucketed in a uniform grid of square cells.
+
+    Each point is identified by a hashable key, such as an entity, and queries
+    return the keys of matching points. Queries only visit the cells that
+    overlap the query area, so their cost depends on the density of points
+    around it rather than on the total number of points.
+
+    :param cell_size: The side of the grid's cells. It works best when queries
+      cover a handful of cells, for instance the typical query radius.
+    :param positions: Points to index, as a mapping from keys to vector-likes.
+      An iterable of vector-likes, or a :py:class:`VectorArray
+      <ppb_vector.VectorArray>`, is keyed by the index of each position.
+
+    Distances are compared squared, so queries never compute a square root.
+    """
+
+    __slots__ = ('_cell_size', '_cells', '_positions')
+
+    _cells: Dict[Cell, Dict[Hashable, Vector]]
+    _positions: Dict[Hashable, Vector]
+
+    def __init__(self, cell_size: SupportsFloat, positions: Positions = ()):
+        size = float(cell_size)
+        if not (0 < size and isfinite(size)):
+            raise ValueError("SpatialHash takes a positive, finite cell_size")
+
+        self._cell_size = size
+        self._cells = {}
+        self._positions = {}
+        self.rebuild(positions)
+
+    @property
+    def cell_size(self) -> float:
+        """The side of the grid's cells."""
+        return self._cell_size
+
+    def __repr__(self) -> str:
+        return f"<SpatialHash cell_size={self._cell_size} with {len(self)} points>"
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __iter__(self) -> typing.Iterator[Hashable]:
+        return iter(self._positions)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._positions
+
+    def __getitem__(self, key: Hashable) -> Vector:
+        """Get the position of a point."""
+        return self._positions[key]
+
+    def _cell(self, position: Vector) -> Cell:
+        x, y = position.x, position.y
+        if not (isfinite(x) and isfinite(y)):
+            raise ValueError(f"Cannot index a non-finite position: {position!r}")
+
+        size = self._cell_size
+        return floor(x / size), floor(y / size)
+
+    def _add(self, key: Hashable, position: Vector) -> None:
+        cell = self._cell(position)
+        self._positions[key] = position
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            self._cells[cell] = {key: position}
+        else:
+            bucket[key] = position
+
+    def _discard(self, key: Hashable, position: Vector) -> None:
+        cell = self._cell(position)
+        bucket = self._cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self._cells[cell]
+
+    def insert(self, key: Hashable, position: VectorLike) -> None:
+        """Add a point to the index.
+
+        Raises :py:class:`ValueError` if ``key`` is already in the index.
+        """
+        if key in self._positions:
+            raise ValueError(f"{key!r} is already in the index")
+
+        self._add(key, _vector(position))
+
+    def remove(self, key: Hashable) -> Vector:
+        """Remove a point from the index, and return its last position.
+
+        Raises :py:class:`KeyError` if ``key`` isn't in the index.
+        """
+        position = self._positions.pop(key)
+        self._discard(key, position)
+        return position
+
+    def move(self, key: Hashable, position: VectorLike) -> None:
+        """Update the position of a point.
+
+        This is cheap when the point stays within the same cell.
+        Raises :py:class:`KeyError` if ``key`` isn't in the index.
+        """
+        old = self._positions[key]
+        new = _vector(position)
+        cell = self._cell(new)
+        if cell == self._cell(old):
+            self._positions[key] = self._cells[cell][key] = new
+        else:
+            self._discard(key, old)
+            self._add(key, new)
+
+    def clear(self) -> None:
+        """Remove all points from the index."""
+        self._cells.clear()
+        self._positions.clear()
+
+    def rebuild(self, positions: Positions) -> None:
+        """Replace all points in the index, as with the constructor's ``positions``.
+
+        Rebuilding from a :py:class:`VectorArray <ppb_vector.VectorArray>`
+        computes the cells of all points in a single NumPy pass.
+        """
+        self.clear()
+        batch = _batch(positions)
+        if batch is not None:
+            import numpy as np
+            if not np.all(np.isfinite(batch._data)):
+                raise ValueError("Cannot index non-finite positions")
+
+            size = self._cell_size
+            cells = zip(np.floor(batch.x / size).astype(np.int64).tolist(),
+                        np.floor(batch.y / size).astype(np.int64).tolist())
+            self._positions = dict(enumerate(batch))
+            for (key, position), cell in zip(self._positions.items(), cells):
+                self._cells.setdefault(cell, {})[key] = position
+
+            return
+
+        if isinstance(positions, Mapping):
+            items: Iterable[Tuple[Hashable, VectorLike]] = positions.items()
+        else:
+            items = enumerate(positions)
+
+        for key, value in items:
+            self._add(key, _vector(value))
+
+    def _buckets(self, x0: float, y0: float,
+                 x1: float, y1: float) -> Iterable[Dict[Hashable, Vector]]:
+        # The buckets of all cells overlapping the rectangle from (x0, y0) to (x1, y1).
+        size = self._cell_size
+        fx0, fy0, fx1, fy1 = x0 / size, y0 / size, x1 / size, y1 / size
+        cells = self._cells
+        if (fx1 - fx0 + 1) * (fy1 - fy0 + 1) > len(cells):
+            # The rectangle spans more cells than are occupied: visit those instead.
+            return cells.values()
+
+        i0, j0, i1, j1 = floor(fx0), floor(fy0), floor(fx1), floor(fy1)
+        return [
+            bucket
+            for bucket in (cells.get((i, j)) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1))
+            if bucket is not None
+        ]
+
+    def within(self, center: VectorLike, radius: SupportsFloat) -> List[Hashable]:
+        """Find the points at most ``radius`` away from ``center``.
+
+        >>> index = SpatialHash(1, [(0, 0), (1, 0), (3, 0)])
+        >>> sorted(index.within((0, 0), 1))
+        [0, 1]
+        """
+        cx, cy = Vector._unpack(center)
+        r = float(radius)
+        if r < 0:
+            raise ValueError("within takes a non-negative radius")
+
+        r2 = r * r
+        result = []
+        for bucket in self._buckets(cx - r, cy - r, cx + r, cy + r):
+            for key, p in bucket.items():
+                dx, dy = p.x - cx, p.y - cy
+                if dx * dx + dy * dy <= r2:
+                    result.append(key)
+
+        return result
+
+    def in_rect(self, corner: VectorLike, opposite: VectorLike) -> List[Hashable]:
+        """Find the points in the axis-aligned rectangle with the given opposite corners.
+
+        Points on the edges of the rectangle are included.
+
+        >>> index = SpatialHash(1, [(0, 0), (1, 1), (2, 0)])
+        >>> sorted(index.in_rect((0, 0), (1, 1)))
+        [0, 1]
+        """
+        ax, ay = Vector._unpack(corner)
+        bx, by = Vector._unpack(opposite)
+        x0, x1 = min(ax, bx), max(ax, bx)
+        y0, y1 = min(ay, by), max(ay, by)
+
+        return [
+            key
+            for bucket in self._buckets(x0, y0, x1, y1)
+            for key, p in bucket.items()
+            if x0 <= p.x <= x1 and y0 <= p.y <= y1
+        ]
+
+    def nearest(self, center: VectorLike, k: int = 1) -> List[Hashable]:
+        """Find the ``k`` points closest to ``center``, from closest to farthest.
+
+        Fewer points are returned if the index doesn't hold ``k`` of them.
+
+        >>> index = SpatialHash(1, [(0, 0), (1, 0), (3, 0)])
+        >>> index.nearest((2.1, 0), k=2)
+        [2, 1]
+        """
+        if k < 0:
+            raise ValueError("nearest takes a non-negative k")
+
+        cx, cy = Vector._unpack(center)
+        ci, cj = self._cell(_make(cx, cy))
+        size, cells = self._cell_size, self._cells
+
+        # A max-heap of the k best candidates so far, as (-distance², tie-breaker, key)
+        heap: List[Tuple[float, int, Hashable]] = []
+        seen, ring = 0, 0
+        while seen < len(self._positions) and k > 0:
+            if 8 * ring > len(cells):
+                # The next ring has more cells than are occupied: check all points instead.
+                candidates = (
+                    ((p.x - cx) ** 2 + (p.y - cy) ** 2, i, key)
+                    for i, (key, p) in enumerate(self._positions.items())
+                )
+                return [key for _, _, key in heapq.nsmallest(k, candidates)]
+
+            for bucket in self._ring(ci, cj, ring):
+                for key, p in bucket.items():
+                    seen += 1
+                    dx, dy = p.x - cx, p.y - cy
+                    d2 = dx * dx + dy * dy
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d2, seen, key))
+                    elif d2 < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d2, seen, key))
+
+            if len(heap) == k:
+                # Points in cells outside the visited square are at least `margin` away.
+                margin = min(
+                    cx - (ci - ring) * size, (ci + ring + 1) * size - cx,
+                    cy - (cj - ring) * size, (cj + ring + 1) * size - cy,
+                )
+                if -heap[0][0] <= margin * margin:
+                    break
+
+            ring += 1
+
+        return [key for _, _, key in sorted(heap, key=lambda item: (-item[0], item[1]))]
+
+    def _ring(self, ci: int, cj: int, ring: int) -> Iterable[Dict[Hashable, Vector]]:
+        # The buckets of the cells at Chebyshev distance `ring` from cell (ci, cj).
+        if ring == 0:
+            cells: Iterable[Cell] = ((ci, cj),)
+        else:
+            cells = [
+                *((i, j) for i in range(ci - ring, ci + ring + 1) for j in (cj - ring, cj + ring)),
+                *((i, j) for i in (ci - ring, ci + ring) for j in range(cj - ring + 1, cj + ring)),
+            ]
+
+        get = self._cells.get
+        return [bucket for bucket in map(get, cells) if bucket is not None]
+
+
+# Subtrees with at most this many points are scanned linearly.
+_LEAF_SIZE = 8
+
+# The header of KDTree.to_bytes: a magic string, ending with the byte order,
+#  and the number of points. It is 16 bytes long, so the arrays that follow
+#  are aligned.
+_KDTREE_HEADER = struct.Struct('=8sQ')
+_KDTREE_MAGIC = b'ppbKDT\x00' + (b'<' if sys.byteorder == 'little' else b'>')
+
+# A sequence of floats or integers: either an array.array, or a memoryview
+#  over a buffer in the same format.
+Column = typing.Union[array, memoryview]
+
+
+class KDTree:
+    """An immutable index of points, for nearest-neighbour queries over large sets.
+
+    The tree is built once from an iterable of vector-likes, or a
+    :py:class:`VectorArray <ppb_vector.VectorArray>`, and queries return
+    ``(index, position)`` pairs, where ``index`` is the position's index in the
+    original iterable:
+
+    >>> from ppb_vector import KDTree
+    >>> tree = KDTree([(0, 0), (10, 0), (0, 10)])
+    >>> tree.nearest((8, 1))
+    [(1, Vector(10.0, 0.0))]
+
+    Unlike :py:class:`SpatialHash`, it needs no tuning and works well for
+    unevenly-distributed points, but it cannot be updated.
+
+    The tree is stored in a few flat arrays, with no per-node objects. It is
+    cheap to pickle, and :py:meth:`to_bytes` and :py:meth:`from_buffer` can
+    store it in a file which is later memory-mapped.
+    """
+
+    __slots__ = ('_xs', '_ys', '_indices', '_axes')
+
+    # Coordinates of the points, in the tree's order. The root of a subtree
+    #  over points lo..hi (excluded) is the median, at (lo + hi) // 2, which
+    #  splits them along the axis _axes[median] (0 for x, 1 for y).
+    #  Subtrees of at most _LEAF_SIZE points are leaves, and aren't ordered.
+    _xs: Column
+    _ys: Column
+    # The index of each point in the iterable the tree was built from.
+    _indices: Column
+    _axes: Column
+
+    def __init__(self, points: Points):
+        batch = _batch(points)
+        if batch is not None:
+            xs, ys = batch.x.tolist(), batch.y.tolist()
+        else:
+            xs, ys = [], []
+            for point in points:
+                x, y = Vector._unpack(point)
+                xs.append(x)
+                ys.append(y)
+
+        if not all(map(isfinite, xs)) or not all(map(isfinite, ys)):
+            raise ValueError("Cannot index non-finite positions")
+
+        order = list(range(len(xs)))
+        axes = bytearray(len(xs))
+        stack = [(0, len(order))]
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= _LEAF_SIZE:
+                continue
+
+            # Split along the axis where the points are most spread out.
+            sub = order[lo:hi]
+            sub_xs = [xs[i] for i in sub]
+            sub_ys = [ys[i] for i in sub]
+            axis = 0 if max(sub_xs) - min(sub_xs) >= max(sub_ys) - min(sub_ys) else 1
+            sub.sort(key=(xs if axis == 0 else ys).__getitem__)
+            order[lo:hi] = sub
+
+            mid = (lo + hi) // 2
+            axes[mid] = axis
+            stack.append((lo, mid))
+            stack.append((mid + 1, hi))
+
+        self._xs = array('d', [xs[i] for i in order])
+        self._ys = array('d', [ys[i] for i in order])
+        self._indices = array('q', order)
+        self._axes = array('b', axes)
+
+    @classmethod
+    def _wrap(cls, xs: Column, ys: Column, indices: Column, axes: Column) -> 'KDTree':
+        self = cls.__new__(cls)
+        self._xs, self._ys, self._indices, self._axes = xs, ys, indices, axes
+        return self
+
+    def __reduce__(self):
+        return KDTree._wrap, (array('d', self._xs), array('d', self._ys),
+                              array('q', self._indices), array('b', self._axes))
+
+    def to_bytes(self) -> bytes:
+        """Serialize the tree, in the platform's native byte order.
+
+        The result can be loaded with :py:meth:`from_buffer`.
+        """
+        columns = (self._xs, self._ys, self._indices, self._axes)
+        return _KDTREE_HEADER.pack(_KDTREE_MAGIC, len(self)) + b''.join(map(bytes, columns))
+
+    @classmethod
+    def from_buffer(cls, buffer: typing.Any) -> 'KDTree':
+        """Load a tree serialized with :py:meth:`to_bytes`, without copying it.
+
+        ``buffer`` can be any object supporting the buffer protocol, like
+        :py:class:`bytes` or a :py:class:`mmap.mmap`, which must be kept open
+        for as long as the tree is used.
+
+        >>> tree = KDTree([(0, 0), (1, 1)])
+        >>> KDTree.from_buffer(tree.to_bytes()).nearest((2, 2))
+        [(1, Vector(1.0, 1.0))]
+        """
+        view = memoryview(buffer).cast('B')
+        if len(view) < _KDTREE_HEADER.size:
+            raise ValueError("Buffer is too short to hold a KDTree")
+
+        magic, length = _KDTREE_HEADER.unpack_from(view)
+        if magic != _KDTREE_MAGIC:
+            raise ValueError("Buffer doesn't hold a KDTree in the native byte order")
+
+        start = _KDTREE_HEADER.size
+        columns: List[typing.Any] = []
+        for typecode in ('d', 'd', 'q', 'b'):
+            end = start + length * array(typecode).itemsize
+            if end > len(view):
+                raise ValueError("Buffer is too short to hold a KDTree")
+
+            columns.append(view[start:end].cast(typecode))
+            start = end
+
+        return cls._wrap(*columns)
+
+    def __len__(self) -> int:
+        return len(self._xs)
+
+    def __repr__(self) -> str:
+        return f"<KDTree with {len(self)} points>"
+
+    def _result(self, i: int) -> Tuple[int, Vector]:
+        return self._indices[i], _make(self._xs[i], self._ys[i])
+
+    def nearest(self, center: VectorLike, k: int = 1) -> List[Tuple[int, Vector]]:
+        """Find the ``k`` points closest to ``center``, from closest to farthest.
+
+        Fewer points are returned if the tree doesn't hold ``k`` of them.
+        """
+        if k < 0:
+            raise ValueError("nearest takes a non-negative k")
+
+        cx, cy = Vector._unpack(center)
+        return [self._result(i) for i in self._nearest(cx, cy, k)]
+
+    def _nearest(self, cx: float, cy: float, k: int) -> List[int]:
+        xs, ys, axes = self._xs, self._ys, self._axes
+        # A max-heap of the k best candidates so far, as (-distance², position)
+        heap: List[Tuple[float, int]] = []
+        # Subtrees left to visit, with a lower bound of their squared distance
+        stack = [(0, len(xs), 0.0)] if k > 0 else []
+        while stack:
+            lo, hi, bound = stack.pop()
+            if len(heap) == k and bound >= -heap[0][0]:
+                continue
+
+            if hi - lo <= _LEAF_SIZE:
+                candidates: Iterable[int] = range(lo, hi)
+            else:
+                mid = (lo + hi) // 2
+                candidates = (mid,)
+                diff = cx - xs[mid] if axes[mid] == 0 else cy - ys[mid]
+                far = max(bound, diff * diff)
+                if diff < 0:
+                    stack.append((mid + 1, hi, far))
+                    stack.append((lo, mid, bound))
+                else:
+                    stack.append((lo, mid, far))
+                    stack.append((mid + 1, hi, bound))
+
+            for i in candidates:
+                dx, dy = xs[i] - cx, ys[i] - cy
+                d2 = dx * dx + dy * dy
+                if len(heap) < k:
+                    heapq.heappush(heap, (-d2, i))
+                elif d2 < -heap[0][0]:
+                    heapq.heapreplace(heap, (-d2, i))
+
+        return [i for _, i in sorted(heap, key=lambda item: (-item[0], item[1]))]
+
+    def within(self, center: VectorLike, radius: SupportsFloat) -> List[Tuple[int, Vector]]:
+        """Find the points at most ``radius`` away from ``center``, in no particular order.
+
+        >>> tree = KDTree([(0, 0), (1, 0), (3, 0)])
+        >>> sorted(tree.within((0, 0), 1))
+        [(0, Vector(0.0, 0.0)), (1, Vector(1.0, 0.0))]
+        """
+        cx, cy = Vector._unpack(center)
+        r = float(radius)
+        if r < 0:
+            raise ValueError("within takes a non-negative radius")
+
+        return [self._result(i) for i in self._within(cx, cy, r * r)]
+
+    def _within(self, cx: float, cy: float, r2: float) -> List[int]:
+        xs, ys, axes = self._xs, self._ys, self._axes
+        result = []
+        stack = [(0, len(xs))]
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= _LEAF_SIZE:
+                candidates: Iterable[int] = range(lo, hi)
+            else:
+                mid = (lo + hi) // 2
+                candidates = (mid,)
+                diff = cx - xs[mid] if axes[mid] == 0 else cy - ys[mid]
+                if diff <= 0 or diff * diff <= r2:
+                    stack.append((lo, mid))
+                if diff >= 0 or diff * diff <= r2:
+                    stack.append((mid + 1, hi))
+
+            for i in candidates:
+                dx, dy = xs[i] - cx, ys[i] - cy
+                if dx * dx + dy * dy <= r2:
+                    result.append(i)
+
+        return result
+
+    def nearest_many(self, centers: Points, k: int = 1) -> List[List[Tuple[int, Vector]]]:
+        """Query the nearest points for many centers, as :py:meth:`nearest` does."""
+        if k < 0:
+            raise ValueError("nearest takes a non-negative k")
+
+        result = self._result
+        return [
+            [result(i) for i in self._nearest(cx, cy, k)]
+            for cx, cy in _coordinates(centers)
+        ]
+
+    def within_many(self, centers: Points, radius: SupportsFloat) -> List[List[Tuple[int, Vector]]]:
+        """Query the points within ``radius`` of many centers, as :py:meth:`within` does."""
+        r = float(radius)
+        if r < 0:
+            raise ValueError("within takes a non-negative radius")
+
+        result, r2 = self._result, r * r
+        return [
+            [result(i) for i in self._within(cx, cy, r2)]
+            for cx, cy in _coordinates(centers)
+        ]
+
+
+def _coordinates(points: Points) -> Iterable[Tuple[float, float]]:
+    batch = _batch(points)
+    if batch is not None:
+        return zip(batch.x.tolist(), batch.y.tolist())
+
+    return map(Vector._unpack, points)
@@ -0,0 +1,237 @@
+"""Affine transformations of the plane.
+
+A :py:class:`Transform2D` combines rotations, scalings and translations in a
+single 2×3 matrix, so that a chain like ``v.rotate(a).scale_by(s) + offset``
+costs a single matrix-vector product:
+
+>>> from ppb_vector import Transform2D, Vector
+>>> to_world = Transform2D.from_components(translation=(10, 0), rotation=90, scale=2)
+>>> to_world.apply((1, 0))
+Vector(10.0, 2.0)
+"""
+import typing
+from typing import SupportsFloat, Tuple, Union
+
+from ppb_vector import _batch, _is_scalar, _make, _unpacker, Rotation, Vector, VectorLike
+
+if typing.TYPE_CHECKING:
+    from ppb_vector.array import VectorArray  # noqa: F401
+
+__all__ = ('Transform2D',)
+
+
+class Transform2D:
+    """An immutable affine transformation of the plane.
+
+    It is represented by the matrix::
+
+        [ a  b  tx ]
+        [ c  d  ty ]
+
+    mapping the point ``(x, y)`` to ``(a x + b y + tx, c x + d y + ty)``.
+
+    Transformations are made from elementary ones, and composed using ``@``,
+    where ``t @ u`` applies ``u`` first then ``t``:
+
+    >>> t = Transform2D.translation((1, 2)) @ Transform2D.rotation(90)
+    >>> t.apply((1, 0))
+    Vector(1.0, 3.0)
+
+    ``@`` also applies a transformation to a vector-like, or to a whole
+    :py:class:`VectorArray <ppb_vector.VectorArray>`:
+
+    >>> t @ Vector(1, 0)
+    Vector(1.0, 3.0)
+    """
+
+    __slots__ = ('_a', '_b', '_c', '_d', '_tx', '_ty')
+
+    _a: float
+    _b: float
+    _c: float
+    _d: float
+    _tx: float
+    _ty: float
+
+    #: The transformation which leaves all points unchanged.
+    identity: typing.ClassVar['Transform2D']
+
+    def __init__(self, a: SupportsFloat = 1, b: SupportsFloat = 0,
+                 c: SupportsFloat = 0, d: SupportsFloat = 1,
+                 tx: SupportsFloat = 0, ty: SupportsFloat = 0):
+        self._a, self._b, self._tx = float(a), float(b), float(tx)
+        self._c, self._d, self._ty = float(c), float(d), float(ty)
+
+    @classmethod
+    def _make(cls, a: float, b: float, c: float, d: float,
+              tx: float, ty: float) -> 'Transform2D':
+        # Trusted construction path, for already-computed floats.
+        self = cls.__new__(cls)
+        self._a, self._b, self._c, self._d, self._tx, self._ty = a, b, c, d, tx, ty
+        return self
+
+    @classmethod
+    def translation(cls, offset: VectorLike) -> 'Transform2D':
+        """Make a transformation adding ``offset`` to all points.
+
+        >>> Transform2D.translation((1, 2)).apply((3, 3))
+        Vector(4.0, 5.0)
+        """
+        tx, ty = Vector._unpack(offset)
+        return cls._make(1.0, 0.0, 0.0, 1.0, tx, ty)
+
+    @classmethod
+    def rotation(cls, angle: Union[SupportsFloat, Rotation]) -> 'Transform2D':
+        """Make a rotation around the origin, as done by :py:meth:`Vector.rotate`.
+
+        :param angle: An angle in degrees, or a :py:class:`Rotation <ppb_vector.Rotation>`.
+
+        >>> Transform2D.rotation(90).apply((1, 0))
+        Vector(0.0, 1.0)
+        """
+        r_cos, r_sin = Vector._trig(angle)
+        return cls._make(r_cos, -r_sin, r_sin, r_cos, 0.0, 0.0)
+
+    @classmethod
+    def scaling(cls, factor: Union[SupportsFloat, VectorLike]) -> 'Transform2D':
+        """Make a scaling, either uniform or by a different factor along each axis.
+
+        >>> Transform2D.scaling(2).apply((1, 1))
+        Vector(2.0, 2.0)
+        >>> Transform2D.scaling((2, -1)).apply((1, 1))
+        Vector(2.0, -1.0)
+        """
+        if _is_scalar(factor) and _unpacker(type(factor)) is None:
+            sx = sy = float(factor)  # type: ignore
+        else:
+            sx, sy = Vector._unpack(factor)  # type: ignore
+
+        return cls._make(sx, 0.0, 0.0, sy, 0.0, 0.0)
+
+    @classmethod
+    def from_components(cls, *, translation: VectorLike = Vector.zero,
+                        rotation: Union[SupportsFloat, Rotation] = 0,
+                        scale: Union[SupportsFloat, VectorLike] = 1) -> 'Transform2D':
+        """Make a transformation which scales, then rotates, then translates.
+
+        Applying it to ``v`` is equivalent to
+        ``v.scale_by(scale).rotate(rotation) + translation``, up to rounding.
+        """
+        return (cls.translation(translation) @ cls.rotation(rotation)) @ cls.scaling(scale)
+
+    @property
+    def matrix(self) -> Tuple[Tuple[float, float, float], Tuple[float, float, float]]:
+        """The rows of the 2×3 matrix representing the transformation.
+
+        >>> Transform2D.translation((1, 2)).matrix
+        ((1.0, 0.0, 1.0), (0.0, 1.0, 2.0))
+        """
+        return (self._a, self._b, self._tx), (self._c, self._d, self._ty)
+
+    def __repr__(self) -> str:
+        return (f"Transform2D({self._a}, {self._b}, {self._c}, {self._d}, "
+                f"{self._tx}, {self._ty})")
+
+    def __eq__(self, other: typing.Any) -> bool:
+        if not isinstance(other, Transform2D):
+            return NotImplemented
+
+        return self.matrix == other.matrix
+
+    def __hash__(self) -> int:
+        return hash(self.matrix)
+
+    def isclose(self, other: 'Transform2D', *,
+                abs_tol: float = 1e-09, rel_tol: float = 1e-09) -> bool:
+        """Perform an approximate comparison of two transformations.
+
+        Both the linear and translation parts are compared as vectors, with the
+        same tolerances as :py:meth:`Vector.isclose <ppb_vector.Vector.isclose>`.
+        """
+        return all(
+            _make(*u).isclose(v, abs_tol=abs_tol, rel_tol=rel_tol)
+            for u, v in zip(self._columns(), other._columns())
+        )
+
+    def _columns(self) -> Tuple[Tuple[float, float], ...]:
+        return (self._a, self._c), (self._b, self._d), (self._tx, self._ty)
+
+    def compose(self, other: 'Transform2D') -> 'Transform2D':
+        """Make the transformation applying ``other``, then ``self``.
+
+        This is equivalent to ``self @ other``.
+        """
+        a, b, c, d = self._a, self._b, self._c, self._d
+        return Transform2D._make(
+            a * other._a + b * other._c, a * other._b + b * other._d,
+            c * other._a + d * other._c, c * other._b + d * other._d,
+            a * other._tx + b * other._ty + self._tx,
+            c * other._tx + d * other._ty + self._ty,
+        )
+
+    def inverse(self) -> 'Transform2D':
+        """Make the transformation undoing this one.
+
+        >>> t = Transform2D.from_components(translation=(3, 4), rotation=90, scale=2)
+        >>> t.inverse().apply(t.apply((1, 2)))
+        Vector(1.0, 2.0)
+
+        Raises :py:class:`ValueError` if the transformation isn't invertible.
+        """
+        a, b, c, d = self._a, self._b, self._c, self._d
+        det = a * d - b * c
+        if det == 0:
+            raise ValueError("Transform2D is not invertible")
+
+        inv_a, inv_b, inv_c, inv_d = d / det, -b / det, -c / det, a / det
+        return Transform2D._make(
+            inv_a, inv_b, inv_c, inv_d,
+            -(inv_a * self._tx + inv_b * self._ty), -(inv_c * self._tx + inv_d * self._ty),
+        )
+
+    @typing.overload
+    def apply(self, points: VectorLike) -> Vector: pass
+
+    @typing.overload
+    def apply(self, points: 'VectorArray') -> 'VectorArray': pass
+
+    def apply(self, points):
+        """Transform a point, or a whole batch of points in a single pass.
+
+        :param points: A vector-like, or a :py:class:`VectorArray <ppb_vector.VectorArray>`.
+        """
+        batch = _batch(points)
+        if batch is not None:
+            import numpy as np
+
+            from ppb_vector.array import VectorArray
+            x, y = batch.x, batch.y
+            return VectorArray._wrap(np.stack((
+                self._a * x + self._b * y + self._tx,
+                self._c * x + self._d * y + self._ty,
+            )))
+
+        x, y = Vector._unpack(points)
+        return _make(self._a * x + self._b * y + self._tx,
+                     self._c * x + self._d * y + self._ty)
+
+    @typing.overload
+    def __matmul__(self, other: 'Transform2D') -> 'Transform2D': pass
+
+    @typing.overload
+    def __matmul__(self, other: VectorLike) -> Vector: pass
+
+    @typing.overload
+    def __matmul__(self, other: 'VectorArray') -> 'VectorArray': pass
+
+    def __matmul__(self, other):
+        if isinstance(other, Transform2D):
+            return self.compose(other)
+
+        try:
+            return self.apply(other)
+        except ValueError:
+            return NotImplemented
+
+
+Transform2D.identity = Transform2D()
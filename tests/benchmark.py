@@ -1,20 +1,273 @@
 #!/usr/bin/env python3
+"""Benchmark suite for ppb_vector, using pyperf.
+
+Benchmarks are organised in groups, named ``group: benchmark``; pass
+``--group`` (possibly repeatedly) to only run some of them. Any other pyperf
+option is accepted, for instance ``-o`` to save results as JSON: ``bench.sh``
+uses that to record baselines, and ``benchmark_compare.py`` to compare them.
+"""
+import pickle
+import typing
+
 import pyperf  # type: ignore
 
-from ppb_vector import Vector
+import ppb_vector
+from ppb_vector import (CatmullRom, ComponentTable, Expression, GridVector, KDTree, lerp,
+                        pack_vectors, Polyline, Rotation, segment_distance_squared,
+                        segment_intersection, SpatialHash, unpack_vectors, Vector, VectorArray,
+                        VectorField)
 from utils import *
 
-if __name__ == "__main__":
-    r = pyperf.Runner()
-    x = Vector(1, 1)
-    y = Vector(0, 1)
-    scalar = 123
+x = Vector(1, 1)
+y = Vector(0, 1)
+scalar = 123
+
+# 10k points, on a 100×100 grid, and spread out for spatial queries
+points = [Vector(i % 100, i // 100) for i in range(10_000)]
+spread = [p * 10 for p in points]
+
+
+class GroupRunner:
+    """Register benchmarks on a pyperf runner, prefixing their names with a group's."""
+
+    def __init__(self, runner: pyperf.Runner, group: str):
+        self.runner = runner
+        self.group = group
+
+    def bench_func(self, name: str, *args, **kwargs) -> None:
+        self.runner.bench_func(f"{self.group}: {name}", *args, **kwargs)
 
-    for f in BINARY_OPS + BINARY_SCALAR_OPS + BOOL_OPS:  # type: ignore
+
+def construction(r: GroupRunner) -> None:
+    # Public constructor, validating its arguments, versus the trusted path
+    #  that operators use for results computed from floats.
+    r.bench_func("Vector(x, y)", Vector, 1.0, 2.0)
+    r.bench_func("Vector(int, int)", Vector, 1, 2)
+    r.bench_func("_make(x, y)", ppb_vector._make, 1.0, 2.0)
+
+    # Conversion from each kind of vector-like
+    r.bench_func("Vector(Vector)", Vector, x)
+    for v_like in vector_likes(x):
+        r.bench_func(f"Vector({type(v_like).__name__})", Vector, v_like)
+
+
+def operators(r: GroupRunner) -> None:
+    for f in BINARY_OPS + (Vector.dot,):  # type: ignore
         r.bench_func(f.__name__, f, x, y)
 
     for f in UNARY_OPS + UNARY_SCALAR_OPS:  # type: ignore
-        r.bench_func(f.__name__, f, x)
+        if f is not Vector:
+            r.bench_func(f.__name__, f, x)
+
+    for g in (Vector.scale_by, Vector.scale_to, Vector.truncate):
+        r.bench_func(g.__name__, g, x, scalar)
+
+    # Operators against vector-likes, which must be unpacked
+    r.bench_func("__add__(tuple)", Vector.__add__, x, (0, 1))
+    r.bench_func("__mul__(scalar)", Vector.__mul__, x, scalar)
+
+    # An update formula, with temporary vectors, versus its compiled kernel
+    pos, vel, dt = Expression.vector('pos'), Expression.vector('vel'), Expression.scalar('dt')
+    step = (pos + vel.normalize() * dt).compile()
+    r.bench_func("pos + vel.normalize() * dt", lambda: x + y.normalize() * 0.5)
+    r.bench_func("Kernel(pos + vel.normalize() * dt)", lambda: step(pos=x, vel=y, dt=0.5))
+
+
+def curves(r: GroupRunner) -> None:
+    # Sampling 10k points on a spline: hand-written interpolation, the
+    #  precomputed polynomials one point at a time, or as a batch
+    control = [Vector(i, (i * 7) % 13) for i in range(10)]
+    spline = CatmullRom(control)
+    ts = [i / 9_999 for i in range(10_000)]
+
+    def catmull_rom(t):
+        s = min(t * 9, 8.999999)
+        i = int(s)
+        u = s - i
+        p0, p1, p2, p3 = (control[min(max(j, 0), 9)] for j in range(i - 1, i + 3))
+        quadratic = (p0 * 2 - p1 * 5 + p2 * 4 - p3) * u * u
+        cubic = (p1 * 3 - p0 - p2 * 3 + p3) * u * u * u
+        return (p1 * 2 + (p2 - p0) * u + quadratic + cubic) * 0.5
+
+    r.bench_func("CatmullRom: Vector ops (10k)", lambda: [catmull_rom(t) for t in ts])
+    r.bench_func("CatmullRom: scalar (10k)", lambda: [spline(t) for t in ts])
+    r.bench_func("CatmullRom: batch (10k)", spline.sample, 10_000)
+    r.bench_func("lerp: Vector ops (10k)", lambda: [x + (y - x) * t for t in ts])
+    r.bench_func("lerp: scalar (10k)", lambda: [lerp(x, y, t) for t in ts])
+    r.bench_func("lerp: batch (10k)", lerp, x, y, ts)
+
+
+def trig(r: GroupRunner) -> None:
+    rotation = Rotation(scalar)
+    r.bench_func("rotate", Vector.rotate, x, scalar)
+    r.bench_func("rotate(Rotation)", Vector.rotate, x, rotation)
+    r.bench_func("angle", Vector.angle, x, y)
+    r.bench_func("Rotation(angle)", Rotation, scalar)
+
+
+def comparisons(r: GroupRunner) -> None:
+    for f in BOOL_OPS:  # type: ignore
+        r.bench_func(f.__name__, f, x, y)
+
+    r.bench_func("__eq__(tuple)", Vector.__eq__, x, (0, 1))
+    r.bench_func("isclose(rel_to)", lambda: x.isclose(y, rel_to=[x]))
+    r.bench_func("hash", hash, x)
+
+
+def conversions(r: GroupRunner) -> None:
+    data = x.to_bytes()
+    r.bench_func("tuple(Vector)", tuple, x)
+    r.bench_func("to_bytes", Vector.to_bytes, x)
+    r.bench_func("from_bytes", Vector.from_bytes, data)
+    r.bench_func("pickle", lambda: pickle.loads(pickle.dumps(x)))
+
+    # Pickle round-trips of many vectors, as when sending positions to
+    #  worker processes
+    def roundtrip(obj, protocol=pickle.HIGHEST_PROTOCOL):
+        return pickle.loads(pickle.dumps(obj, protocol=protocol))
+
+    def roundtrip_out_of_band(obj):
+        buffers = []
+        data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+        return pickle.loads(data, buffers=buffers)
+
+    batch = VectorArray(points)
+    r.bench_func("pickle(10k vectors)", roundtrip, points)
+    r.bench_func("pickle(VectorArray 10k, protocol 4)", roundtrip, batch, 4)
+    if pickle.HIGHEST_PROTOCOL >= 5:
+        r.bench_func("pickle(VectorArray 10k, out-of-band)", roundtrip_out_of_band, batch)
+
+
+def collections(r: GroupRunner) -> None:
+    # Vectors as keys in dicts and sets
+    tiles = dict.fromkeys(points)
+    r.bench_func("set(10k vectors)", set, points)
+    r.bench_func("dict lookups (10k)", lambda: [tiles[p] for p in points])
+
+    # Integer tile coordinates, as keys and when moving to a neighbour
+    cells = [GridVector(i % 100, i // 100) for i in range(10_000)]
+    grid_tiles = dict.fromkeys(cells)
+    step = GridVector(1, 0)
+    r.bench_func("dict lookups: GridVector (10k)", lambda: [grid_tiles[c] for c in cells])
+    r.bench_func("neighbours: Vector (10k)", lambda: [p + x for p in points])
+    r.bench_func("neighbours: GridVector (10k)", lambda: [c + step for c in cells])
+
+
+def spatial(r: GroupRunner) -> None:
+    # Radius queries: a brute-force scan versus spatial indexes
+    index = SpatialHash(20, spread)
+    r.bench_func("within: scan (10k)", lambda: [p for p in spread if (p - x).length <= 20])
+    r.bench_func("within: SpatialHash (10k)", index.within, x, 20)
+    r.bench_func("nearest: SpatialHash (10k)", index.nearest, x, 8)
+    r.bench_func("SpatialHash.rebuild (10k)", index.rebuild, spread)
+    tree = KDTree(spread)
+    r.bench_func("within: KDTree (10k)", tree.within, x, 20)
+    r.bench_func("nearest: KDTree (10k)", tree.nearest, x, 8)
+    r.bench_func("KDTree(10k)", KDTree, spread)
+
+
+def geometry(r: GroupRunner) -> None:
+    # Resolving broadphase candidates: pairs of segments, and points against
+    #  segments, using Vector operations, the scalar kernels, or batch ones
+    starts, ends = points, [p.rotate(90) + y for p in reversed(points)]
+
+    def distances_vector():
+        result = []
+        for p, a, b in zip(spread, starts, ends):
+            ab = b - a
+            t = min(max((p - a).dot(ab) / ab.dot(ab), 0), 1)
+            result.append((p - (a + ab * t)).length ** 2)
+        return result
+
+    def distances_scalar():
+        return [segment_distance_squared(*args) for args in zip(spread, starts, ends)]
+
+    batches = VectorArray(spread), VectorArray(starts), VectorArray(ends)
+    r.bench_func("segment distance: Vector ops (10k)", distances_vector)
+    r.bench_func("segment distance: scalar (10k)", distances_scalar)
+    r.bench_func("segment distance: batch (10k)", segment_distance_squared, *batches)
+    pairs = list(zip(starts, ends, spread, points))
+    r.bench_func("segment intersection: scalar (10k)",
+                 lambda: [segment_intersection(*args) for args in pairs])
+    r.bench_func("segment intersection: batch (10k)", segment_intersection,
+                 batches[1], batches[2], batches[0], VectorArray(points))
+
+    # Following a path: walking its segments for each query, versus a Polyline
+    path_vertices = [Vector(i, (i * 7) % 13) for i in range(1000)]
+    path = Polyline(path_vertices)
+    steps = [path.length * i / 10_000 for i in range(10_000)]
+
+    def walk(distance):
+        for a, b in zip(path_vertices, path_vertices[1:]):
+            step = (b - a).length
+            if distance <= step:
+                return a + (b - a) * (distance / step)
+            distance -= step
+        return path_vertices[-1]
+
+    r.bench_func("point_at: walk (1k queries)", lambda: [walk(d) for d in steps[::10]])
+    r.bench_func("point_at: Polyline (10k queries)", lambda: [path.point_at(d) for d in steps])
+    r.bench_func("point_at: Polyline batch (10k queries)", path.point_at, steps)
+
+
+def components(r: GroupRunner) -> None:
+    # Updating entities one at a time, versus a component table's columns
+    class Body:
+        table = ComponentTable(capacity=len(points))
+        position = VectorField(table)
+        velocity = VectorField(table)
+
+    class PlainBody:
+        def __init__(self, position, velocity):
+            self.position, self.velocity = position, velocity
+
+    plain_bodies = [PlainBody(p, y) for p in points]
+    for p in points:
+        body = Body()
+        body.position, body.velocity = p, y
+
+    def update_plain():
+        for b in plain_bodies:
+            b.position = b.position + b.velocity * 0.5
+
+    def update_table():
+        Body.table['position'] += Body.table['velocity'] * 0.5
+
+    r.bench_func("update: per object (10k)", update_plain)
+    r.bench_func("update: ComponentTable (10k)", update_table)
+
+
+def codecs(r: GroupRunner) -> None:
+    # Bulk binary encoding, versus encoding each vector
+    data = pack_vectors(points)
+    r.bench_func("to_bytes (10k)", lambda: b''.join([p.to_bytes() for p in points]))
+    r.bench_func("pack_vectors(10k)", pack_vectors, points)
+    r.bench_func("pack_vectors(VectorArray 10k)", pack_vectors, VectorArray(points))
+    r.bench_func("unpack_vectors(10k)", unpack_vectors, data)
+
+
+GROUPS: typing.Dict[str, typing.Callable[[GroupRunner], None]] = {
+    f.__name__: f
+    for f in (
+        construction, operators, curves, trig, comparisons, conversions, collections,
+        spatial, geometry, components, codecs,
+    )
+}
+
+
+def add_cmdline_args(cmd: typing.List[str], args) -> None:
+    # Pass the groups along to pyperf's worker processes.
+    for group in args.group or ():
+        cmd.extend(("--group", group))
+
+
+if __name__ == "__main__":
+    r = pyperf.Runner(add_cmdline_args=add_cmdline_args)
+    r.argparser.add_argument(
+        "--group", action="append", choices=sorted(GROUPS),
+        help="Only run the benchmarks in this group; can be repeated.",
+    )
+    args = r.parse_args()
 
-    for f in SCALAR_OPS:  # type: ignore
-        r.bench_func(f.__name__, f, x, scalar)  # type: ignore
+    for group in args.group or GROUPS:
+        GROUPS[group](GroupRunner(r, group))
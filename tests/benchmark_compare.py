@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Compare two runs of benchmark.py, saved as pyperf JSON files.
+
+Usage: benchmark_compare.py [--threshold PERCENT] BASELINE.json CURRENT.json
+
+For each benchmark in both files, this reports the relative change of the
+mean time, and whether it is statistically significant (Welch's t-test, at a
+95% confidence level). It exits with a non-zero status if any benchmark is
+significantly slower than the baseline by more than the threshold.
+"""
+import argparse
+import sys
+import typing
+from math import sqrt
+from statistics import mean, variance
+
+import pyperf  # type: ignore
+
+# Two-tailed critical values of Student's t-distribution, at the 95% level,
+#  for some degrees of freedom; intermediate ones use the next lower entry.
+T_CRITICAL_95 = (
+    (1, 12.706), (2, 4.303), (3, 3.182), (4, 2.776), (5, 2.571), (6, 2.447),
+    (7, 2.365), (8, 2.306), (9, 2.262), (10, 2.228), (15, 2.131), (20, 2.086),
+    (30, 2.042), (60, 2.000), (120, 1.980),
+)
+
+
+def t_critical(df: float) -> float:
+    critical = T_CRITICAL_95[0][1]
+    for dof, value in T_CRITICAL_95:
+        if dof > df:
+            break
+        critical = value
+
+    return critical
+
+
+def is_significant(baseline: typing.Sequence[float], current: typing.Sequence[float]) -> bool:
+    """Check whether two samples have different means, using Welch's t-test."""
+    if len(baseline) < 2 or len(current) < 2:
+        return False
+
+    v1, v2 = variance(baseline) / len(baseline), variance(current) / len(current)
+    diff = abs(mean(baseline) - mean(current))
+    if v1 + v2 == 0:
+        return diff > 0
+
+    t = diff / sqrt(v1 + v2)
+    df = (v1 + v2) ** 2 / (v1 ** 2 / (len(baseline) - 1) + v2 ** 2 / (len(current) - 1))
+    return t > t_critical(df)
+
+
+class Change(typing.NamedTuple):
+    name: str
+    baseline: str
+    current: str
+    #: Relative change of the mean time, in percents; positive when slower.
+    percent: float
+    significant: bool
+
+
+def compare(baseline: pyperf.BenchmarkSuite,
+            current: pyperf.BenchmarkSuite) -> typing.List[Change]:
+    current_benchmarks = {b.get_name(): b for b in current.get_benchmarks()}
+    changes = []
+    for old in baseline.get_benchmarks():
+        new = current_benchmarks.get(old.get_name())
+        if new is None:
+            continue
+
+        old_values, new_values = old.get_values(), new.get_values()
+        changes.append(Change(
+            name=old.get_name(),
+            baseline=old.format_value(mean(old_values)),
+            current=new.format_value(mean(new_values)),
+            percent=(mean(new_values) / mean(old_values) - 1) * 100,
+            significant=is_significant(old_values, new_values),
+        ))
+
+    return changes
+
+
+def describe(change: Change) -> str:
+    if not change.significant:
+        return "not significant"
+
+    return f"{abs(change.percent):.1f}% {'slower' if change.percent > 0 else 'faster'}"
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", help="pyperf JSON file with the baseline results")
+    parser.add_argument("current", help="pyperf JSON file with the results to check")
+    parser.add_argument(
+        "--threshold", type=float, default=5.0, metavar="PERCENT",
+        help="Fail if a benchmark is significantly slower by more than this (default: 5)",
+    )
+    args = parser.parse_args(argv)
+
+    changes = compare(pyperf.BenchmarkSuite.load(args.baseline),
+                      pyperf.BenchmarkSuite.load(args.current))
+    regressions = [
+        c for c in changes if c.significant and c.percent > args.threshold
+    ]
+
+    width = max((len(c.name) for c in changes), default=0)
+    for c in changes:
+        marker = '!' if c in regressions else ' '
+        print(f"{marker} {c.name:{width}}  {c.baseline:>10} -> {c.current:>10}  {describe(c)}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold}%:")
+        for c in regressions:
+            print(f"  {c.name} regressed by {c.percent:.1f}%")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
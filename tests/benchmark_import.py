@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Measure how long ``import ppb_vector`` takes, using ``python -X importtime``.
+
+Usage: benchmark_import.py [--runs N] [--budget MS]
+
+Each run imports ppb_vector in a fresh interpreter. This prints the best
+total import time, the modules imported along with ppb_vector (slowest
+first), and exits with a non-zero status if the time exceeds the budget.
+It requires CPython, and is run by ``./bench.sh import``.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import typing
+from pathlib import Path
+
+#: The maximum time ``import ppb_vector`` may take, in milliseconds, including
+#: the standard library modules it imports.
+BUDGET_MS = 15.0
+
+#: Modules which ``import ppb_vector`` should not load, as they are slow to
+#: import and only needed for type-checking, or on rare code paths.
+DEFERRED_MODULES = frozenset({'dataclasses', 'inspect', 'typing', 'warnings'})
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def import_times() -> typing.Dict[str, float]:
+    """Import ppb_vector in a new interpreter, and time it and its dependencies.
+
+    Returns the cumulative time of each module imported by ``import ppb_vector``,
+    in milliseconds.
+    """
+    # Allow writing bytecode, so that only the first run compiles ppb_vector.
+    env = {k: v for k, v in os.environ.items()
+           if k not in ('PPB_VECTOR_INSTRUMENT', 'PYTHONDONTWRITEBYTECODE')}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ppb_vector'],
+        cwd=ROOT, env=env, stderr=subprocess.PIPE, universal_newlines=True, check=True,
+    )
+
+    # Modules are reported after their own imports, indented by nesting level;
+    #  ppb_vector's are the ones since the previous top-level import.
+    times: typing.Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative) / 1000
+        if not name.startswith('  '):
+            if name.strip() == 'ppb_vector':
+                return times
+            times.clear()
+
+    raise RuntimeError(f"ppb_vector was not imported:\n{result.stderr}")
+
+
+def best_import_time(runs: int) -> typing.Tuple[float, typing.Dict[str, float]]:
+    """Get the fastest of several runs of :py:func:`import_times`."""
+    best = min((import_times() for _ in range(runs)), key=lambda t: t['ppb_vector'])
+    return best['ppb_vector'], best
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters to time")
+    parser.add_argument("--budget", type=float, default=BUDGET_MS, metavar="MS",
+                        help=f"Fail above this many milliseconds (default: {BUDGET_MS})")
+    args = parser.parse_args(argv)
+
+    total, times = best_import_time(args.runs)
+    print(f"import ppb_vector: {total:.2f}ms (budget: {args.budget}ms)")
+    for name, ms in sorted(times.items(), key=lambda item: -item[1]):
+        if name != 'ppb_vector':
+            print(f"  {ms:7.2f}ms  {name}")
+
+    return 0 if total <= args.budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
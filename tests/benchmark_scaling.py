@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Report how ParallelExecutor's batch operations scale with the number of threads.
+
+Usage: benchmark_scaling.py [--size N] [--repeat R]
+
+For each operation, this times the serial VectorArray method, then
+ParallelExecutor with 1, 2, 4... threads up to the number of CPUs, and prints
+the best time of each and its speedup over the serial one.
+"""
+import argparse
+import typing
+from functools import partial
+from timeit import repeat
+
+import numpy as np
+
+from ppb_vector import ParallelExecutor, VectorArray
+from ppb_vector.parallel import _available_cpus
+
+
+def operations(batch: VectorArray) -> typing.Dict[str, typing.Callable[[typing.Any], typing.Any]]:
+    # Each operation takes either a ParallelExecutor or None, for serial runs.
+    normal = (0.6, 0.8)
+    return {
+        "rotate": lambda p: p.rotate(batch, 30) if p else batch.rotate(30),
+        "normalize": lambda p: p.normalize(batch) if p else batch.normalize(),
+        "truncate": lambda p: p.truncate(batch, 0.5) if p else batch.truncate(0.5),
+        "reflect": lambda p: p.reflect(batch, normal) if p else batch.reflect(normal),
+        "dot": lambda p: p.dot(batch, batch) if p else batch.dot(batch),
+        "length": lambda p: p.length(batch) if p else batch.length,
+    }
+
+
+def best(f: typing.Callable[[], typing.Any], times: int) -> float:
+    return min(repeat(f, number=1, repeat=times))
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000, help="Vectors per batch")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    batch = VectorArray.from_columns(rng.uniform(-1, 1, args.size), rng.uniform(-1, 1, args.size))
+    counts = [1 << i for i in range(_available_cpus().bit_length())]
+    if counts[-1] != _available_cpus():
+        counts.append(_available_cpus())
+
+    executors = {n: ParallelExecutor(workers=n) for n in counts}
+    print(f"{args.size} vectors; chunk size (calibrated with {counts[-1]} threads): "
+          f"{executors[counts[-1]].chunk_size}")
+    columns = "  ".join(f"{f'{n} thread(s)':>14}" for n in counts)
+    print(f"{'operation':10}  {'serial':>9}  {columns}")
+    for name, op in operations(batch).items():
+        serial = best(partial(op, None), args.repeat)
+        cells = []
+        for executor in executors.values():
+            elapsed = best(partial(op, executor), args.repeat)
+            cells.append(f"{elapsed * 1e3:6.2f}ms x{serial / elapsed:4.2f}")
+        print(f"{name:10}  {serial * 1e3:7.2f}ms  " + "  ".join(cells))
+
+    for executor in executors.values():
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -16,3 +16,6 @@ setup_hypothesis()
 collect_ignore: typing.List[str] = []
 if sys.version_info < (3, 10):
     collect_ignore.append('test_pattern_matching.py')
+if sys.version_info < (3, 8):
+    # multiprocessing.shared_memory is new in Python 3.8
+    collect_ignore.append('test_shared.py')
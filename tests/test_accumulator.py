@@ -0,0 +1,56 @@
+import hypothesis.strategies as st
+import pytest  # type: ignore
+from hypothesis import given
+
+from ppb_vector import Vector, VectorAccumulator
+from utils import angles, floats, vector_likes, vectors
+
+
+@given(v=vectors())
+def test_accumulator_freeze(v: Vector):
+    for v_like in vector_likes(v):
+        assert VectorAccumulator(v_like).freeze() == v
+
+
+@given(vs=st.lists(vectors()))
+def test_accumulator_sum(vs):
+    """Accumulating in place matches summing Vectors, in the same order."""
+    acc = VectorAccumulator()
+    expected = Vector.zero
+    for v in vs:
+        acc += v
+        expected += v
+
+    assert acc.freeze() == expected
+
+
+@given(x=vectors(), y=vectors(), scalar=floats(), angle=angles())
+def test_accumulator_ops(x: Vector, y: Vector, scalar: float, angle: float):
+    assert VectorAccumulator(x).iadd(y).freeze() == x + y
+    assert VectorAccumulator(x).isub(y).freeze() == x - y
+    assert VectorAccumulator(x).iscale(scalar).freeze() == x.scale_by(scalar)
+    assert VectorAccumulator(x).irotate(angle).freeze() == x.rotate(angle)
+    assert VectorAccumulator(x).iadd_scaled(y, scalar).freeze() == x + y.scale_by(scalar)
+
+
+@given(x=vectors(), y=vectors())
+def test_accumulator_vector_like(x: Vector, y: Vector):
+    acc = VectorAccumulator(y)
+    assert x + acc == x + y
+    assert Vector(acc) == y
+    assert VectorAccumulator(acc).freeze() == y
+
+
+@given(x=vectors())
+def test_accumulator_reset(x: Vector):
+    acc = VectorAccumulator(x)
+    assert acc.reset().freeze() == Vector.zero
+    assert acc.reset(x).freeze() == x
+
+
+def test_accumulator_unhashable():
+    # Accumulators are mutable, and compare equal to vectors.
+    acc = VectorAccumulator((1, 2))
+    assert acc == Vector(1, 2)
+    with pytest.raises(TypeError):
+        hash(acc)
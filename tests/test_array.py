@@ -0,0 +1,204 @@
+import pickle
+import sys
+from decimal import Decimal
+from fractions import Fraction
+
+import hypothesis.strategies as st
+import numpy as np
+import pytest  # type: ignore
+from hypothesis import given
+
+from ppb_vector import Vector, VectorArray
+from utils import angle_isclose, angles, floats, isclose, lengths, units, vectors
+
+
+def vector_lists(max_magnitude=1e75, min_size=0):
+    return st.lists(vectors(max_magnitude), min_size=min_size, max_size=20)
+
+
+@given(vs=vector_lists())
+def test_array_roundtrip(vs):
+    a = VectorArray(vs)
+    assert len(a) == len(vs)
+    assert list(a) == vs
+    assert [a[i] for i in range(len(vs))] == vs
+
+
+@given(vs=vector_lists())
+def test_array_ctor_vector_likes(vs):
+    a = VectorArray(vs)
+    assert list(VectorArray((v.x, v.y) for v in vs)) == vs
+    assert list(VectorArray([v.asdict() for v in vs])) == vs
+    assert list(VectorArray(a.to_numpy())) == vs
+    assert list(VectorArray.from_columns(a.x, a.y)) == vs
+
+
+BINARY_OPS = ("__add__", "__sub__", "dot")
+
+
+@pytest.mark.parametrize("op", BINARY_OPS)
+@given(vs=vector_lists(), w=vectors())
+def test_array_binop_single(op, vs, w):
+    result = getattr(VectorArray(vs), op)(w)
+    assert list(result) == [getattr(v, op)(w) for v in vs]
+
+
+@pytest.mark.parametrize("op", BINARY_OPS)
+@given(data=st.data(), vs=vector_lists())
+def test_array_binop_batch(op, data, vs):
+    ws = data.draw(st.lists(vectors(), min_size=len(vs), max_size=len(vs)))
+    result = getattr(VectorArray(vs), op)(VectorArray(ws))
+    assert list(result) == [getattr(v, op)(w) for v, w in zip(vs, ws)]
+
+
+@given(vs=vector_lists(), w=vectors())
+def test_array_reflected(vs, w):
+    a = VectorArray(vs)
+    assert list(w + a) == [w + v for v in vs]
+    assert list(w - a) == [w - v for v in vs]
+    assert list(w * a) == [w * v for v in vs]
+
+
+@given(vs=vector_lists(min_size=1))
+def test_array_length_mismatch(vs):
+    with pytest.raises(ValueError):
+        VectorArray(vs).dot(VectorArray(vs + vs))
+
+
+@pytest.mark.parametrize("op", ["scale_by", "rotate"])
+@given(vs=vector_lists(), scalar=angles())
+def test_array_scalar_ops(op, vs, scalar):
+    result = getattr(VectorArray(vs), op)(scalar)
+    assert list(result) == [getattr(v, op)(scalar) for v in vs]
+
+
+@given(data=st.data(), vs=vector_lists(max_magnitude=1e30))
+def test_array_rotate_each(data, vs):
+    angle = data.draw(st.lists(angles(), min_size=len(vs), max_size=len(vs)))
+    rotated = VectorArray(vs).rotate(np.array(angle))
+
+    for v, a, r in zip(vs, angle, rotated):
+        assert r.isclose(v.rotate(a), abs_tol=1e-9)
+
+
+@given(vs=vector_lists(), scalar=floats(max_magnitude=1e30))
+def test_array_mul_div(vs, scalar):
+    a = VectorArray(vs)
+    assert list(scalar * a) == list(a * scalar) == [scalar * v for v in vs]
+    if scalar != 0:
+        assert list(a / scalar) == [v / scalar for v in vs]
+
+
+@pytest.mark.parametrize("scalar", [np.int64(2), np.float32(0.5), Fraction(1, 2), Decimal('0.5')])
+def test_array_mul_scalar_types(scalar):
+    """Single numbers of any type scale vectors, like floats."""
+    a = VectorArray([(1, 2), (3, 4)])
+    assert list(a * scalar) == list(scalar * a) == list(a.scale_by(float(scalar)))
+    assert list(a * {'x': 1, 'y': 0}) == [1, 3]
+
+
+@pytest.mark.parametrize("op", ["normalize", "__neg__"])
+@given(vs=vector_lists(max_magnitude=1e30))
+def test_array_unary(op, vs):
+    vs = [v for v in vs if v.length > 1e-30]
+    for r, v in zip(getattr(VectorArray(vs), op)(), vs):
+        assert r.isclose(getattr(v, op)())
+
+
+@given(vs=vector_lists(max_magnitude=1e30), length=lengths(max_value=1e30))
+def test_array_scale_to_truncate(vs, length):
+    vs = [v for v in vs if v.length > 1e-30]
+    a = VectorArray(vs)
+    for r, v in zip(a.scale_to(length), vs):
+        assert r.isclose(v.scale_to(length))
+    for r, v in zip(a.truncate(length), vs):
+        assert r.isclose(v.truncate(length))
+
+
+def test_array_scale_to_null():
+    with pytest.raises(ZeroDivisionError):
+        VectorArray([(1, 1), (0, 0)]).normalize()
+
+    assert (VectorArray([(1, 1), (0, 0)]).scale_to(0) == Vector.zero).all()
+
+    with pytest.raises(ValueError):
+        VectorArray([(1, 1)]).scale_to(-1)
+
+
+@given(vs=vector_lists(), normal=units())
+def test_array_reflect_decompose(vs, normal):
+    a = VectorArray(vs)
+    assert list(a.reflect(normal)) == [v.reflect(normal) for v in vs]
+
+    p, q = a.decompose(normal)
+    assert list(zip(p, q)) == [v.decompose(normal) for v in vs]
+
+
+@given(vs=vector_lists(max_magnitude=1e30), direction=vectors(max_magnitude=1e30))
+def test_array_project(vs, direction):
+    if direction.length < 1e-30:
+        return
+
+    a = VectorArray(vs)
+    projected = a.project(direction)
+    for r, v in zip(projected, vs):
+        assert r.isclose(v.project(direction), rel_to=[v])
+
+    # Like other operands, a 1-dimensional array is a single vector.
+    directions = VectorArray([direction] * len(vs))
+    for other in (np.array(direction), directions, directions.to_numpy()):
+        assert list(a.project(other)) == list(projected)
+
+
+@given(vs=vector_lists(max_magnitude=1e30), w=vectors(max_magnitude=1e30))
+def test_array_angle_length(vs, w):
+    a = VectorArray(vs)
+    for r, v in zip(a.angle(w), vs):
+        assert angle_isclose(r, v.angle(w))
+
+    for r, v in zip(a.length, vs):
+        assert isclose(r, v.length)
+
+
+@given(vs=vector_lists(), w=vectors())
+def test_array_eq_isclose(vs, w):
+    a = VectorArray(vs)
+    assert list(a == w) == [v == w for v in vs]
+    assert list(a.isclose(a)) == [True] * len(vs)
+
+
+def test_array_setitem_slice_view():
+    a = VectorArray([(1, 2), (3, 4), (5, 6)])
+    tail = a[1:]
+    tail[0] = (0, 0)
+    assert a[1] == Vector.zero
+
+    a[:2] = VectorArray([(7, 7), (8, 8)])
+    assert list(a) == [Vector(7, 7), Vector(8, 8), Vector(5, 6)]
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+@given(vs=vector_lists())
+def test_array_pickle(vs, protocol):
+    a = VectorArray(vs)
+    b = pickle.loads(pickle.dumps(a[::-1], protocol=protocol))
+    assert list(b) == vs[::-1]
+
+    # Unpickled batches are writable
+    b[:] = Vector.zero
+    assert list(a) == vs
+
+
+@pytest.mark.skipif(pickle.HIGHEST_PROTOCOL < 5, reason="requires pickle protocol 5")
+def test_array_pickle_out_of_band():
+    buffers = []
+    a = VectorArray.zeros(1000)
+    data = pickle.dumps(a, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 1
+    assert len(data) < 100
+
+    # The unpickled batch shares the buffer's memory
+    memory = bytearray(buffers[0].raw())
+    b = pickle.loads(data, buffers=[memory])
+    b[0] = (5, 6)
+    assert memory[:8] == Vector(5, 6).to_bytes(byteorder=sys.byteorder)[:8]
@@ -0,0 +1,50 @@
+import pyperf  # type: ignore
+import pytest  # type: ignore
+from benchmark_compare import compare, is_significant, main
+
+
+def suite(**timings):
+    return pyperf.BenchmarkSuite([
+        pyperf.Benchmark([
+            pyperf.Run(values, metadata={'name': name, 'unit': 'second'}, collect_metadata=False)
+            for values in runs
+        ])
+        for name, runs in timings.items()
+    ])
+
+
+STEADY = [[1.00, 1.01, 0.99], [1.00, 1.02, 0.98], [1.01, 0.99, 1.00]]
+SLOWER = [[1.20, 1.21, 1.19], [1.20, 1.22, 1.18], [1.21, 1.19, 1.20]]
+NOISY = [[0.50, 1.50, 1.00], [1.60, 0.40, 1.05], [1.00, 1.10, 0.90]]
+
+
+def test_is_significant():
+    assert not is_significant([1.0, 1.0, 1.0], [1.0, 1.0, 1.0])
+    assert is_significant([1.0, 1.01, 0.99] * 5, [1.2, 1.21, 1.19] * 5)
+    assert not is_significant([0.5, 1.5, 1.0], [1.6, 0.4, 1.05])
+
+
+def test_compare():
+    changes = {c.name: c for c in compare(
+        suite(add=STEADY, rotate=STEADY, angle=STEADY, removed=STEADY),
+        suite(add=STEADY, rotate=SLOWER, angle=NOISY, added=SLOWER),
+    )}
+    assert set(changes) == {'add', 'rotate', 'angle'}
+    assert not changes['add'].significant
+    assert changes['rotate'].significant
+    assert changes['rotate'].percent == pytest.approx(20, abs=0.5)
+    assert not changes['angle'].significant
+
+
+@pytest.mark.parametrize("current, threshold, status", [
+    (STEADY, 5, 0), (SLOWER, 5, 1), (SLOWER, 25, 0), (NOISY, 5, 0),
+])
+def test_main(tmp_path, capsys, current, threshold, status):
+    suite(rotate=STEADY).dump(str(tmp_path / 'baseline.json'))
+    suite(rotate=current).dump(str(tmp_path / 'current.json'))
+
+    assert main([
+        '--threshold', str(threshold),
+        str(tmp_path / 'baseline.json'), str(tmp_path / 'current.json'),
+    ]) == status
+    assert ("regressed by 20.0%" in capsys.readouterr().out) == bool(status)
@@ -0,0 +1,93 @@
+import hypothesis.strategies as st
+import pytest  # type: ignore
+from hypothesis import given
+
+from ppb_vector import pack_array, pack_vectors, unpack_vectors, Vector, VectorArray
+from utils import vector_likes, vectors
+
+
+LAYOUTS = [
+    (typecode, byteorder) for typecode in 'df' for byteorder in ('little', 'big')
+]
+
+
+def float32_vectors():
+    """Vectors whose coordinates are exactly representable as 32 bits floats."""
+    coordinates = st.floats(width=32, allow_nan=False)
+    return st.builds(Vector, coordinates, coordinates)
+
+
+@pytest.mark.parametrize("typecode, byteorder", LAYOUTS)
+@given(v=float32_vectors())
+def test_bytes_roundtrip(v: Vector, typecode, byteorder):
+    data = v.to_bytes(typecode=typecode, byteorder=byteorder)
+    assert len(data) == (16 if typecode == 'd' else 8)
+    assert Vector.from_bytes(data, typecode=typecode, byteorder=byteorder) == v
+
+
+@given(v=vectors())
+def test_bytes_byteorder(v: Vector):
+    assert v.to_bytes(byteorder='big') == v.to_bytes(byteorder='little')[7::-1] + \
+        v.to_bytes(byteorder='little')[:7:-1]
+
+
+@pytest.mark.parametrize("typecode, byteorder", LAYOUTS)
+@given(vs=st.lists(float32_vectors()))
+def test_pack_roundtrip(vs, typecode, byteorder):
+    data = pack_vectors(vs, typecode=typecode, byteorder=byteorder)
+    assert data == b''.join(v.to_bytes(typecode=typecode, byteorder=byteorder) for v in vs)
+    assert unpack_vectors(data, typecode=typecode, byteorder=byteorder) == vs
+
+    assert pack_vectors(VectorArray(vs), typecode=typecode, byteorder=byteorder) == data
+
+
+@given(vs=st.lists(vectors()))
+def test_pack_vector_likes(vs):
+    for v_likes in zip(*map(vector_likes, vs)):
+        assert pack_vectors(v_likes) == pack_vectors(vs)
+
+
+@given(vs=st.lists(vectors()))
+def test_pack_array(vs):
+    coordinates = pack_array(vs)
+    assert list(coordinates) == [c for v in vs for c in v]
+    assert unpack_vectors(coordinates) == vs
+
+
+def test_invalid_layout():
+    with pytest.raises(ValueError):
+        Vector(1, 2).to_bytes(typecode='q')
+
+    with pytest.raises(ValueError):
+        pack_vectors([], byteorder='middle')
+
+
+@pytest.mark.parametrize("v", [
+    Vector(1e300, 0), Vector(0, -1e39), Vector(3.402823669209372e+38, 0),
+])
+def test_single_precision_overflow(v: Vector):
+    """Packing many vectors fails like packing each, rather than producing inf."""
+    with pytest.raises(OverflowError):
+        v.to_bytes(typecode='f')
+
+    for vs in ([Vector(1, 2), v], VectorArray([Vector(1, 2), v])):
+        with pytest.raises(OverflowError):
+            pack_vectors(vs, typecode='f')
+        with pytest.raises(OverflowError):
+            pack_array(vs, typecode='f')
+
+
+def test_single_precision_infinities():
+    # Infinite coordinates aren't out of range, and are encoded as they are.
+    vs = [Vector(float('inf'), float('-inf')), Vector(3.4028235677973306e+38, 0)]
+    data = pack_vectors(vs, typecode='f')
+    assert data == b''.join(v.to_bytes(typecode='f') for v in vs)
+    assert pack_vectors(VectorArray(vs), typecode='f') == data
+
+
+def test_invalid_data():
+    with pytest.raises(ValueError):
+        Vector.from_bytes(b'\0' * 15)
+
+    with pytest.raises(ValueError):
+        unpack_vectors(b'\0' * 24)
@@ -0,0 +1,149 @@
+import pytest  # type: ignore
+from hypothesis import given
+from hypothesis.strategies import booleans, lists, tuples
+
+from ppb_vector import ComponentTable, Vector, VectorArray, VectorField
+from utils import vectors
+
+
+def make_body_class():
+    class Body:
+        table = ComponentTable(capacity=1)
+        position = VectorField(table)
+        velocity = VectorField(table, name='speed')
+
+        def __init__(self, position=None, velocity=(0, 0)):
+            if position is not None:
+                self.position = position
+            self.velocity = velocity
+
+    return Body
+
+
+def test_field_declaration():
+    body_type = make_body_class()
+    assert body_type.table.fields == ('position', 'speed')
+    assert isinstance(body_type.position, VectorField)
+    with pytest.raises(ValueError):
+        body_type.table.add_field('position')
+
+
+@given(vs=lists(tuples(vectors(), vectors()), max_size=20))
+def test_field_roundtrip(vs):
+    body_type = make_body_class()
+    bodies = [body_type(p, v) for p, v in vs]
+    assert [(b.position, b.velocity) for b in bodies] == vs
+    assert list(body_type.table['position']) == [p for p, _ in vs]
+    assert list(body_type.table.ids) == [b.entity_id for b in bodies]
+
+
+def test_field_unset():
+    body_type = make_body_class()
+    body = body_type.__new__(body_type)
+    with pytest.raises(AttributeError):
+        body.position
+
+    # Setting any field adds the entity, with the other fields null.
+    body.velocity = (1, 2)
+    assert body.position == Vector(0, 0)
+    assert len(body_type.table) == 1
+
+
+def test_field_removed_entity():
+    """Objects whose entity was removed don't alias the next entity."""
+    body_type = make_body_class()
+    table = body_type.table
+    stale = body_type((1, 2))
+    table.remove(stale.entity_id)
+    fresh = body_type((9, 9))
+    with pytest.raises(KeyError):
+        stale.position
+    with pytest.raises(KeyError):
+        stale.position = (0, 0)
+    assert fresh.position == Vector(9, 9)
+
+
+def test_field_unsettable_id():
+    class Slotted:
+        __slots__ = ()
+        table = ComponentTable()
+        position = VectorField(table)
+
+    with pytest.raises(AttributeError):
+        Slotted().position = (1, 2)
+    assert len(Slotted.table) == 0
+
+
+def test_batched_update():
+    body_type = make_body_class()
+    bodies = [body_type((i, 0), (1, i)) for i in range(5)]
+    table = body_type.table
+    table['position'] += table['speed'] * 2
+    assert [b.position for b in bodies] == [Vector(i + 2, 2 * i) for i in range(5)]
+
+    table['speed'] = Vector(0, 0)
+    assert all(b.velocity == Vector(0, 0) for b in bodies)
+
+    # Batches are views of the table's storage.
+    table['position'][0] = (-1, -1)
+    assert bodies[0].position == Vector(-1, -1)
+
+
+@given(operations=lists(tuples(booleans(), vectors()), max_size=50))
+def test_table_add_remove(operations):
+    """The table behaves like a dict of entity ids to vectors."""
+    table = ComponentTable(['v'], capacity=2)
+    model = {}
+    removed = set()
+    for add, v in operations:
+        if add or not model:
+            entity_id = table.add(v=v)
+            assert entity_id not in model and entity_id not in removed
+            model[entity_id] = v
+        else:
+            entity_id = min(model)
+            table.remove(entity_id)
+            del model[entity_id]
+            removed.add(entity_id)
+
+        assert not any(i in table for i in removed)
+
+        assert len(table) == len(model)
+        assert {i: table.get(i, 'v') for i in model} == model
+        assert dict(zip(table.ids.tolist(), table['v'])) == model
+
+
+def test_table_errors():
+    table = ComponentTable(['v'])
+    entity_id = table.add()
+    assert table.get(entity_id, 'v') == Vector(0, 0)
+    with pytest.raises(KeyError):
+        table.add(w=(1, 2))
+    with pytest.raises(KeyError):
+        table.get(entity_id + 1, 'v')
+    with pytest.raises(KeyError):
+        table.get(-1, 'v')
+    with pytest.raises(KeyError):
+        table['w']
+
+    table.remove(entity_id)
+    with pytest.raises(KeyError):
+        table.remove(entity_id)
+
+    assert isinstance(table['v'], VectorArray)
+    assert len(table['v']) == 0
+
+
+def test_table_numpy_ids():
+    table = ComponentTable(['v'])
+    table.add(v=(1, 2))
+    entity_id = table.ids[0]
+    assert entity_id in table
+    assert 1.0 not in table
+    assert table.get(entity_id, 'v') == Vector(1, 2)
+    table.set(entity_id, 'v', (3, 4))
+    assert table.get(entity_id, 'v') == Vector(3, 4)
+    table.remove(entity_id)
+    assert entity_id not in table
+    new_id = table.add()
+    assert type(new_id) is int and new_id != entity_id
@@ -1,10 +1,38 @@
+import numpy as np
 import pytest  # type: ignore
 from hypothesis import given
 
-from ppb_vector import Vector
+from ppb_vector import register_vector_like, Vector
 from utils import vector_likes, vectors
 
 
+class Point:
+    """A third-party point type, registered as a vector-like."""
+
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+
+class Point3D(Point):
+    pass
+
+
+class Opaque:
+    """A type that isn't a vector-like, whose operators should take over."""
+
+    def __radd__(self, other):
+        return "radd"
+
+    def __rmul__(self, other):
+        return "rmul"
+
+    def __eq__(self, other):
+        return "eq"
+
+
+register_vector_like(Point, lambda p: (float(p.x), float(p.y)))
+
+
 @pytest.mark.parametrize(
     "vector_like", vector_likes(), ids=lambda x: type(x).__name__,
 )
@@ -39,3 +67,34 @@ def test_convert_roundtrip(coerce, x: Vector):
 @given(x=vectors())
 def test_convert_roundtrip_positional(coerce, x: Vector):
     assert x == Vector(*coerce(x))
+
+
+@given(x=vectors(), y=vectors())
+def test_convert_registered(x: Vector, y: Vector):
+    assert Vector(Point(x.x, x.y)) == x  # type: ignore
+    assert x + Point(y.x, y.y) == x + y  # type: ignore
+    assert x == Point(x.x, x.y)
+
+
+@given(x=vectors())
+def test_convert_registered_subclass(x: Vector):
+    assert Vector(Point3D(x.x, x.y)) == x  # type: ignore
+
+
+@given(x=vectors())
+def test_convert_ndarray(x: Vector):
+    assert Vector(np.array([x.x, x.y])) == x  # type: ignore
+
+    with pytest.raises(ValueError):
+        Vector(np.array([x.x, x.y, 0]))  # type: ignore
+
+
+@given(x=vectors())
+def test_convert_not_vector_like(x: Vector):
+    """Operators defer to the other operand for types that aren't vector-likes."""
+    assert x + Opaque() == "radd"
+    assert x * Opaque() == "rmul"
+    assert (x == Opaque()) == "eq"
+
+    with pytest.raises(ValueError):
+        Vector(Opaque())  # type: ignore
@@ -27,6 +27,19 @@ def test_ctor_pickle(v: Vector):
     assert isinstance(w, Vector)
 
 
+def test_ctor_pickle_trusted(monkeypatch):
+    """Unpickling doesn't go through Vector.__new__'s argument handling."""
+    data = pickle.dumps(Vector(1, -0.0))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Vector.__new__ called")
+
+    monkeypatch.setattr(Vector, '__new__', fail)
+    w = pickle.loads(data)
+    assert (w.x, w.y) == (1.0, 0.0)
+    assert str(w.y) == '-0.0'
+
+
 @given(v=vectors())
 def test_ctor_copy(v: Vector):
     """Test that Vector instances can be copied."""
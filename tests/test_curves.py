@@ -0,0 +1,165 @@
+import pickle
+from decimal import Decimal
+from fractions import Fraction
+
+import hypothesis.strategies as st
+import numpy as np  # type: ignore
+import pytest  # type: ignore
+from hypothesis import example, given
+
+from ppb_vector import (
+    CatmullRom, CubicBezier, lerp, QuadraticBezier, slerp, Vector, VectorArray,
+)
+from utils import angle_isclose, isclose, vectors
+
+
+def points():
+    return vectors(max_magnitude=1e3)
+
+
+def params():
+    return st.floats(min_value=-0.5, max_value=1.5)
+
+
+def unit_params():
+    return st.floats(min_value=0, max_value=1)
+
+
+def curves():
+    return st.one_of(
+        st.builds(QuadraticBezier, points(), points(), points()),
+        st.builds(CubicBezier, points(), points(), points(), points()),
+        st.builds(CatmullRom, st.lists(points(), min_size=2, max_size=10)),
+    )
+
+
+def binomial(n, k):
+    result = 1
+    for i in range(k):
+        result = result * (n - i) // (i + 1)
+    return result
+
+
+def bernstein(control, t):
+    """Evaluate a Bézier curve from its definition, as a weighted sum of its control points."""
+    n = len(control) - 1
+    return sum(
+        (p * (binomial(n, k) * t ** k * (1 - t) ** (n - k)) for k, p in enumerate(control)),
+        Vector.zero,
+    )
+
+
+@given(a=points(), b=points(), t=params())
+def test_lerp(a: Vector, b: Vector, t: float):
+    assert lerp(a, b, t).isclose(a + (b - a) * t, abs_tol=1e-9, rel_to=[a, b])
+    assert lerp(a, b, 0) == a
+    assert lerp(a, b, 1) == b
+
+
+@given(a=points(), b=points(), t=unit_params())
+@example(a=Vector(0.0, 2.225073858507e-311), b=Vector(0.0, 1.0), t=1.0)  # Subnormal length
+def test_slerp(a: Vector, b: Vector, t: float):
+    v = slerp(a, b, t)
+    assert slerp(a, b, [t])[0].isclose(v, rel_tol=1e-6, rel_to=[a, b])
+    assert slerp(a, b, 0).isclose(a)
+    assert slerp(a, b, 1).isclose(b, rel_tol=1e-6, rel_to=[a, b])
+    if not a or not b:
+        assert v == lerp(a, b, t)
+        return
+
+    assert isclose(v.length, a.length * (1 - t) + b.length * t, rel_to=[a.length, b.length])
+    if v.length > 1e-6 * max(a.length, b.length):
+        assert angle_isclose(a.angle(v), a.angle(b) * t)
+
+
+def test_slerp_arc():
+    for t in np.linspace(0, 1, 11):
+        assert isclose(slerp((3, 0), (0, 3), float(t)).length, 3)
+
+
+@given(data=st.data(), size=st.integers(0, 20))
+def test_interpolation_batches(data, size: int):
+    """Batches of parameters, or endpoints, match single evaluations."""
+    a = data.draw(st.one_of(points(), st.lists(points(), min_size=size, max_size=size)))
+    b = data.draw(points())
+    ts = data.draw(st.lists(params(), min_size=size, max_size=size))
+    if isinstance(a, list):
+        a = VectorArray(a)
+
+    def a_at(i):
+        return a[i] if isinstance(a, VectorArray) else a
+
+    for interpolate in (lerp, slerp):
+        batch = interpolate(a, b, np.array(ts))
+        assert len(batch) == size
+        for i, t in enumerate(ts):
+            assert batch[i].isclose(interpolate(a_at(i), b, t), abs_tol=1e-9, rel_to=[a_at(i), b])
+
+    if isinstance(a, VectorArray):
+        assert list(lerp(a, b, 0.5)) == [lerp(v, b, 0.5) for v in a]
+
+
+@given(control=st.lists(points(), min_size=3, max_size=3), t=params())
+def test_quadratic_bezier(control, t: float):
+    curve = QuadraticBezier(*control)
+    assert curve(t).isclose(bernstein(control, t), abs_tol=1e-6, rel_to=control)
+
+
+@given(control=st.lists(points(), min_size=4, max_size=4), t=params())
+def test_cubic_bezier(control, t: float):
+    curve = CubicBezier(*control)
+    assert curve(t).isclose(bernstein(control, t), abs_tol=1e-6, rel_to=control)
+    assert curve(0) == control[0]
+    assert curve.derivative(0).isclose((control[1] - control[0]) * 3, abs_tol=1e-6, rel_to=control)
+
+
+@given(control=st.lists(points(), min_size=2, max_size=10))
+def test_catmull_rom_interpolates(control):
+    spline = CatmullRom(control)
+    n = len(control) - 1
+    for i, p in enumerate(control):
+        assert spline(i / n).isclose(p, abs_tol=1e-6, rel_to=control)
+
+
+@given(curve=curves(), t=unit_params())
+def test_derivative(curve, t: float):
+    low, high = max(t - 1e-6, 0), min(t + 1e-6, 1)
+    finite_difference = (curve(high) - curve(low)) / (high - low)
+    assert curve.derivative(t).isclose(finite_difference, abs_tol=1e-3, rel_tol=1e-3,
+                                       rel_to=list(curve))
+
+
+@given(data=st.data(), curve=curves())
+def test_curve_batches(data, curve):
+    ts = data.draw(st.lists(params(), max_size=20))
+    values, derivatives = curve(ts), curve.derivative(np.array(ts))
+    assert list(values) == [curve(t) for t in ts]
+    assert list(derivatives) == [curve.derivative(t) for t in ts]
+
+    samples = curve.sample(5)
+    assert list(samples) == [curve(t) for t in np.linspace(0, 1, 5)]
+
+
+@given(curve=curves())
+def test_curve_values(curve):
+    assert eval(repr(curve)) == curve
+    assert hash(eval(repr(curve))) == hash(curve)
+    assert pickle.loads(pickle.dumps(curve)) == curve
+
+
+@pytest.mark.parametrize("t", [
+    np.int64(1), np.float32(0.5), np.float64(0.5), np.array(0.5), Fraction(1, 2), Decimal('0.5'),
+])
+def test_scalar_types(t):
+    """Single numbers of any type are parameters, like floats, rather than batches."""
+    curve = CubicBezier((0, 0), (0, 1), (1, 1), (1, 0))
+    for evaluate in (curve, curve.derivative, lambda t: lerp((0, 0), (2, 4), t),
+                     lambda t: slerp((1, 0), (0, 2), t)):
+        result = evaluate(t)
+        assert type(result) is Vector and type(result.x) is float
+        assert result == evaluate(float(t))
+
+
+def test_catmull_rom_points():
+    with pytest.raises(ValueError):
+        CatmullRom([(0, 0)])
@@ -0,0 +1,148 @@
+
+import numpy as np
+import pytest  # type: ignore
+from hypothesis import given
+from hypothesis.strategies import floats, lists
+
+from ppb_vector import Expression, Vector, VectorArray
+from utils import angles, vector_likes, vectors
+
+pos, vel = Expression.vector('pos'), Expression.vector('vel')
+dt = Expression.scalar('dt')
+
+
+def finite(max_magnitude=1e75):
+    return floats(min_value=-max_magnitude, max_value=max_magnitude)
+
+
+@given(p=vectors(), v=vectors(), t=finite())
+def test_expression_matches_vector_ops(p, v, t):
+    kernel = (pos + v * t - (-vel).scale_by(dt) / 2).compile()
+    assert kernel(pos=p, vel=v, dt=t) == p + v * t - (-v).scale_by(t) / 2
+
+
+@given(p=vectors(), v=vectors(), angle=angles())
+def test_expression_methods(p, v, angle):
+    a = Expression.scalar('a')
+    assert (pos * vel).evaluate(pos=p, vel=v) == p * v
+    assert pos.dot(vel).evaluate(pos=p, vel=v) == p.dot(v)
+    assert pos.length.evaluate(pos=p) == p.length
+    assert pos.rotate(a).evaluate(pos=p, a=angle) == p.rotate(angle)
+    assert pos.rotate(angle).evaluate(pos=p) == p.rotate(angle)
+
+
+@given(p=vectors().filter(bool))
+def test_expression_normalize(p):
+    assert pos.normalize().evaluate(pos=p) == p.normalize()
+
+
+def test_expression_normalize_zero():
+    with pytest.raises(ZeroDivisionError):
+        pos.normalize().evaluate(pos=Vector(0, 0))
+
+    with pytest.raises(ZeroDivisionError):
+        pos.normalize().evaluate(pos=VectorArray([(1, 0), (0, 0)]))
+
+
+@given(p=vectors())
+def test_expression_vector_likes(p):
+    kernel = (pos + vel).compile()
+    for p_like in vector_likes(p):
+        assert kernel(pos=p_like, vel=(1, 2)) == p + (1, 2)
+
+
+def test_expression_constant_folding():
+    e = pos + Vector(1, 2) * 2 - Vector(1, 0).rotate(90).length * vel
+    assert e.args[0].args[1].key == Expression.constant((2, 4)).key
+    assert e.args[1] is vel  # Scaling by the folded length, 1, is elided.
+    assert (Expression.constant(3) * 2).args == (6.0,)
+
+
+def test_expression_simplifications():
+    assert pos * 1 is pos
+    assert pos / 1 is pos
+    assert -(-pos) is pos
+
+
+def test_expression_common_subexpressions():
+    speed = vel.length
+    kernel = (vel / speed + pos / vel.length).compile()
+    assert kernel.source.count('_hypot') == 1
+    assert kernel(pos=(3, 4), vel=(0, 2)) == Vector(1.5, 3)
+
+
+def test_expression_kind_errors():
+    with pytest.raises(TypeError):
+        pos + dt
+    with pytest.raises(TypeError):
+        dt / pos
+    with pytest.raises(TypeError):
+        dt.length
+    with pytest.raises(TypeError):
+        pos.rotate(vel)
+    with pytest.raises(TypeError):
+        (pos + Expression.scalar('pos')).compile()
+    with pytest.raises(TypeError):
+        pos + "foo"
+    with pytest.raises(ValueError):
+        Expression.vector('not a name')
+    with pytest.raises(ValueError):
+        Expression.scalar('_private')
+
+
+def test_kernel_bindings():
+    kernel = (pos + vel).compile()
+    assert kernel.symbols == ('pos', 'vel')
+    assert (pos + vel).compile() is not kernel
+    with pytest.raises(TypeError):
+        kernel(pos=(0, 0))
+    with pytest.raises(TypeError):
+        kernel(pos=(0, 0), vel=(0, 0), dt=1)
+
+
+@given(
+    ps=vectors(max_magnitude=1e30).map(lambda v: [v, v * 2, -v]),
+    v=vectors(max_magnitude=1e30), t=finite(1e30),
+)
+def test_expression_batch(ps, v, t):
+    kernel = (pos + vel * dt).compile()
+    batch = kernel(pos=VectorArray(ps), vel=v, dt=t)
+    assert isinstance(batch, VectorArray)
+    assert list(batch) == [kernel(pos=p, vel=v, dt=t) for p in ps]
+
+    times = np.array([t, 0, 1])
+    batch = kernel(pos=VectorArray(ps), vel=v, dt=times)
+    assert list(batch) == [kernel(pos=p, vel=v, dt=s) for p, s in zip(ps, times)]
+
+    lengths = pos.length.evaluate(pos=VectorArray(ps))
+    assert lengths.tolist() == VectorArray(ps).length.tolist()
+
+
+def test_expression_batch_broadcasting():
+    # Only scalars are batched, and the result doesn't depend on the vectors.
+    kernel = (Expression.constant((1, 1)) * dt).compile()
+    assert list(kernel(dt=np.array([1.0, 2.0]))) == [Vector(1, 1), Vector(2, 2)]
+
+    with pytest.raises(ValueError):
+        (pos + vel).evaluate(pos=VectorArray([(0, 0)]), vel=VectorArray([(0, 0)] * 2))
+
+
+def test_kernel_symbol_names():
+    # Symbol names can't clash with the kernel's own variables.
+    t0, hypot = Expression.vector('t0'), Expression.scalar('hypot')
+    kernel = (t0.normalize() * hypot + Vector(1, 0)).compile()
+    assert kernel(t0=(0, 2), hypot=3) == Vector(1, 3)
+
+    # Nor with the builtins it uses.
+    kernel = (Expression.vector('type') * Expression.scalar('float')).compile()
+    assert kernel(type=Vector(1, 2), float=2.0) == Vector(2, 4)
+    assert kernel(type=(1, 2), float=2) == Vector(2, 4)
+
+
+@given(v=vectors(), thetas=lists(angles(), min_size=1, max_size=20))
+def test_expression_batch_rotate(v, thetas):
+    """Batches of angles rotate exactly like single ones, and like VectorArray.rotate."""
+    kernel = pos.rotate(dt).compile()
+    batch = kernel(pos=VectorArray([v] * len(thetas)), dt=np.array(thetas))
+    assert list(batch) == [kernel(pos=v, dt=theta) for theta in thetas]
+    assert list(batch) == list(VectorArray([v] * len(thetas)).rotate(np.array(thetas)))
@@ -0,0 +1,120 @@
+import math
+
+import hypothesis.strategies as st
+import pytest  # type: ignore
+from hypothesis import given
+
+from ppb_vector import (
+    closest_point, segment_distance, segment_distance_squared, segment_intersection,
+    Vector, VectorArray,
+)
+from utils import isclose
+
+
+def points():
+    # Small integer coordinates, so that parallel and collinear segments,
+    #  and endpoints touching other segments, are commonly generated.
+    return st.builds(Vector, st.integers(-8, 8), st.integers(-8, 8))
+
+
+def batches(size):
+    return st.lists(points(), min_size=size, max_size=size).map(VectorArray)
+
+
+def on_segment(p: Vector, start: Vector, end: Vector) -> bool:
+    return isclose(segment_distance(p, start, end), 0, abs_tol=1e-9)
+
+
+@given(p=points(), start=points(), end=points())
+def test_closest_point(p: Vector, start: Vector, end: Vector):
+    closest = closest_point(p, start, end)
+    assert on_segment(closest, start, end)
+    for t in (0, 0.25, 0.5, 0.75, 1):
+        other = start + (end - start) * t
+        assert (p - closest).length <= (p - other).length + 1e-9
+
+
+@given(p=points(), start=points(), end=points())
+def test_segment_distance(p: Vector, start: Vector, end: Vector):
+    closest = closest_point(p, start, end)
+    assert segment_distance(p, start, end) == (p - closest).length
+    assert isclose(segment_distance_squared(p, start, end), (p - closest).length ** 2)
+
+
+@given(p=points())
+def test_degenerate_segment(p: Vector):
+    assert closest_point(p, (1, 1), (1, 1)) == (1, 1)
+    assert segment_distance(p, (1, 1), (1, 1)) == (p - (1, 1)).length
+
+
+@pytest.mark.parametrize("a_start, a_end, b_start, b_end, expected", [
+    ((0, 0), (2, 2), (0, 2), (2, 0), (1, 1)),
+    ((0, 0), (2, 0), (2, 0), (2, 5), (2, 0)),        # Touching endpoints
+    ((0, 0), (2, 0), (3, -1), (3, 1), None),
+    ((0, 0), (2, 0), (0, 1), (2, 1), None),          # Parallel
+    ((0, 0), (4, 0), (6, 0), (2, 0), (2, 0)),        # Overlapping
+    ((0, 0), (4, 0), (-1, 0), (5, 0), (0, 0)),
+    ((0, 0), (1, 0), (2, 0), (3, 0), None),          # Collinear, disjoint
+    ((1, 1), (1, 1), (0, 0), (2, 2), (1, 1)),        # Point on segment
+    ((1, 1), (1, 1), (1, 1), (1, 1), (1, 1)),
+    ((1, 1), (1, 1), (0, 0), (2, 0), None),
+])
+def test_segment_intersection(a_start, a_end, b_start, b_end, expected):
+    assert segment_intersection(a_start, a_end, b_start, b_end) == expected
+
+    hit, intersections = segment_intersection(VectorArray([a_start]), a_end, b_start, b_end)
+    assert hit.tolist() == [expected is not None]
+    if expected is not None:
+        assert intersections[0] == expected
+    else:
+        assert math.isnan(intersections.x[0]) and math.isnan(intersections.y[0])
+
+
+@given(a_start=points(), a_end=points(), b_start=points(), b_end=points())
+def test_segment_intersection_on_both(a_start: Vector, a_end: Vector,
+                                      b_start: Vector, b_end: Vector):
+    p = segment_intersection(a_start, a_end, b_start, b_end)
+    if p is not None:
+        assert on_segment(p, a_start, a_end)
+        assert on_segment(p, b_start, b_end)
+
+
+@given(a_start=points(), a_end=points(), b_start=points(), b_end=points())
+def test_segment_intersection_symmetric(a_start: Vector, a_end: Vector,
+                                        b_start: Vector, b_end: Vector):
+    """Whether segments intersect doesn't depend on their order or orientation."""
+    expected = segment_intersection(a_start, a_end, b_start, b_end) is None
+    assert (segment_intersection(b_start, b_end, a_start, a_end) is None) == expected
+    assert (segment_intersection(a_end, a_start, b_end, b_start) is None) == expected
+
+
+@given(data=st.data(), size=st.integers(0, 20), batched=st.sets(st.integers(0, 3), min_size=1))
+def test_batch_matches_scalar(data, size: int, batched):
+    """Any combination of batch and single operands matches the scalar functions."""
+    args = [data.draw(batches(size) if i in batched else points()) for i in range(4)]
+
+    def row(i):
+        return [a[i] if isinstance(a, VectorArray) else a for a in args]
+
+    hit, intersections = segment_intersection(*args)
+    assert len(hit) == len(intersections) == size
+    for i in range(size):
+        expected = segment_intersection(*row(i))
+        assert hit[i] == (expected is not None)
+        if expected is not None:
+            assert intersections[i] == expected
+
+    if batched & {0, 1, 2}:
+        closest = closest_point(*args[:3])
+        distance = segment_distance(*args[:3])
+        distance_squared = segment_distance_squared(*args[:3])
+        assert len(closest) == len(distance) == len(distance_squared) == size
+        for i in range(size):
+            assert closest[i] == closest_point(*row(i)[:3])
+            assert isclose(distance[i], segment_distance(*row(i)[:3]))
+            assert distance_squared[i] == segment_distance_squared(*row(i)[:3])
+
+
+def test_batch_lengths():
+    with pytest.raises(ValueError):
+        closest_point(VectorArray([(0, 0)]), VectorArray([(0, 0), (1, 1)]), (1, 0))
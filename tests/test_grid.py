@@ -0,0 +1,126 @@
+import copy
+import pickle
+
+import hypothesis.strategies as st
+import pytest  # type: ignore
+from hypothesis import given
+
+from ppb_vector import GridVector, Vector
+
+
+def ints():
+    # Beyond 2**53, ints aren't exactly representable as floats
+    return st.integers(-2**52, 2**52)
+
+
+def grid_vectors():
+    return st.builds(GridVector, ints(), ints())
+
+
+@given(x=ints(), y=ints())
+def test_ctor(x: int, y: int):
+    g = GridVector(x, y)
+    assert g.x == x and g.y == y
+    assert type(g.x) is int and type(g.y) is int
+    assert tuple(g) == (x, y)
+    assert eval(repr(g)) == g
+
+
+@pytest.mark.parametrize("x, y", [(1.0, 2), (1, 2.5), ("1", 2), (None, 0)])
+def test_ctor_rejects_non_ints(x, y):
+    with pytest.raises(TypeError):
+        GridVector(x, y)
+
+
+@given(g=grid_vectors())
+def test_immutable(g: GridVector):
+    with pytest.raises(AttributeError):
+        g.x = 0  # type: ignore
+    with pytest.raises(AttributeError):
+        g.z = 0  # type: ignore
+
+
+@given(g=grid_vectors())
+def test_hash_and_equality(g: GridVector):
+    """Grid vectors are equal, and hash alike, to tuples and vectors of the same coordinates."""
+    v = Vector(g.x, g.y)
+    assert g == (g.x, g.y) and hash(g) == hash((g.x, g.y))
+    assert g == v and v == g and hash(g) == hash(v)
+    assert {g: 1}[GridVector(g.x, g.y)] == 1
+
+
+@given(g=grid_vectors())
+def test_conversions(g: GridVector):
+    assert g.to_vector() == Vector(g) == Vector(g.x, g.y)
+    assert GridVector.from_vector(g.to_vector()) == g
+    assert GridVector.from_vector((g.x + 0.5, g.y + 0.5)) == g
+
+
+@given(g=grid_vectors())
+def test_serialization(g: GridVector):
+    for copied in (pickle.loads(pickle.dumps(g)), copy.copy(g), copy.deepcopy(g)):
+        assert copied == g and type(copied) is GridVector
+
+
+@given(a=grid_vectors(), b=grid_vectors(), k=st.integers(-1000, 1000))
+def test_arithmetic(a: GridVector, b: GridVector, k: int):
+    """Operations match Vector's, exactly."""
+    va, vb = a.to_vector(), b.to_vector()
+    for result, expected in [
+        (a + b, va + vb), (a - b, va - vb), (-a, -va),
+        (a + (b.x, b.y), va + vb), ((b.x, b.y) + a, va + vb), ((a.x, a.y) - b, va - vb),
+        (a * k, va * k), (k * a, va * k),
+    ]:
+        assert type(result) is GridVector
+        assert result == expected
+
+    assert a.dot(b) == a.x * b.x + a.y * b.y
+    assert bool(a) == bool(va)
+
+
+@given(a=grid_vectors(), v=st.builds(Vector, st.floats(-1e3, 1e3), st.floats(-1e3, 1e3)))
+def test_mixed_with_vector(a: GridVector, v: Vector):
+    assert type(a + v) is Vector and a + v == a.to_vector() + v
+    assert type(v - a) is Vector and v - a == v - a.to_vector()
+
+
+@given(g=grid_vectors(), size=st.integers(1, 64))
+def test_chunks(g: GridVector, size: int):
+    chunk, offset = g // size, g % size
+    assert chunk * size + offset == g
+    assert 0 <= offset.x < size and 0 <= offset.y < size
+
+
+@given(g=grid_vectors(), turns=st.integers(-8, 8))
+def test_rotate(g: GridVector, turns: int):
+    rotated = g.rotate(90 * turns)
+    assert rotated == g.to_vector().rotate(90 * turns)
+    assert rotated.rotate(-90 * turns) == g
+    assert g.rotate(float(90 * turns)) == rotated
+
+
+def test_rotate_non_right_angle():
+    with pytest.raises(ValueError):
+        GridVector(1, 0).rotate(45)
+
+
+@given(g=grid_vectors())
+def test_lengths(g: GridVector):
+    assert g.manhattan_length == abs(g.x) + abs(g.y)
+    assert g.chebyshev_length == max(abs(g.x), abs(g.y))
+    assert g.chebyshev_length <= g.to_vector().length <= g.manhattan_length
+
+
+def test_unsupported_operands():
+    g = GridVector(1, 2)
+    for other in (1.5, "ab", (1, 2, 3), (1.0, 2.0)):
+        with pytest.raises(TypeError):
+            g * other  # type: ignore
+    with pytest.raises(TypeError):
+        g + (1.5, 2)  # type: ignore
+    with pytest.raises(TypeError):
+        g // 2.0  # type: ignore
+
+
+def test_pattern_matching_args():
+    assert GridVector.__match_args__ == ('x', 'y')
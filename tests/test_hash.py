@@ -0,0 +1,33 @@
+from hypothesis import given
+
+from ppb_vector import Vector
+from utils import vectors
+
+
+@given(v=vectors())
+def test_hash_equal(v: Vector):
+    """Equal vectors have equal hashes."""
+    w = Vector(v.x, v.y)
+    assert v is not w
+    assert hash(v) == hash(w)
+
+
+@given(v=vectors())
+def test_hash_tuple(v: Vector):
+    """Vectors hash like the tuples they compare equal to."""
+    assert v == (v.x, v.y)
+    assert hash(v) == hash((v.x, v.y))
+
+
+def test_hash_signed_zero():
+    assert Vector(0.0, -0.0) == Vector(-0.0, 0.0)
+    assert hash(Vector(0.0, -0.0)) == hash(Vector(-0.0, 0.0))
+
+
+@given(v=vectors(), w=vectors())
+def test_hash_dict(v: Vector, w: Vector):
+    d = {v: 'v'}
+    d[Vector(w.x, w.y)] = 'w'
+    assert d[Vector(w.x, w.y)] == 'w'
+    assert len(d) == (1 if v == w else 2)
+    assert len({v, w, Vector(v.x, v.y)}) == len(d)
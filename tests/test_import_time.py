@@ -0,0 +1,20 @@
+import sys
+
+import pytest  # type: ignore
+from benchmark_import import DEFERRED_MODULES, import_times
+
+# The import budget is checked by benchmark_import.py (`./bench.sh import`),
+#  rather than here, as wall-clock timings are unreliable on loaded machines.
+
+
+@pytest.mark.skipif(sys.implementation.name != 'cpython',
+                    reason="Only CPython supports `python -X importtime`.")
+def test_import_defers_modules():
+    imported = {name.strip() for name in import_times()}
+    assert not imported & DEFERRED_MODULES
+
+
+def test_vector_like_aliases():
+    # VectorLike and VectorLikeDict are made on first use, for other modules.
+    from ppb_vector import VectorLike, VectorLikeDict
+    assert VectorLikeDict in VectorLike.__args__
@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+
+import pytest  # type: ignore
+
+import ppb_vector
+from ppb_vector import instrument, lerp, Vector
+
+
+def test_instrument_restores_methods():
+    before = dict(vars(Vector))
+    make = ppb_vector._make
+
+    with instrument():
+        assert vars(Vector)['__add__'] is not before['__add__']
+        assert ppb_vector._make is not make
+
+    assert vars(Vector) == before
+    assert ppb_vector._make is make
+
+
+def test_instrument_restores_on_error():
+    before = dict(vars(Vector))
+    with pytest.raises(ZeroDivisionError):
+        with instrument():
+            Vector(1, 1) / 0
+
+    assert vars(Vector) == before
+
+
+def test_instrument_calls():
+    v = Vector(3, 4)
+    with instrument() as counters:
+        v.length
+        v.normalize()
+        v.isclose(v)
+        Vector.sum([v, v])
+        v + v
+        v + v
+
+    calls = counters.snapshot()['calls']
+    assert calls['__add__'] == 2
+    assert calls['isclose'] == 1
+    assert calls['sum'] == 1
+    # Calls made by other methods are counted too
+    assert calls['normalize'] == calls['scale_to'] == 1
+    assert calls['length'] >= 1
+    assert 'time' not in counters.snapshot()
+
+
+def test_instrument_allocations():
+    v = Vector(1, 2)
+    with instrument() as counters:
+        Vector(1, 2)
+        Vector(x=1, y=2)
+        Vector((1, 2))
+        Vector({'x': 1, 'y': 2})
+        Vector(v)  # Doesn't allocate
+        v + v
+        -v
+
+    assert counters.snapshot()['allocations'] == {
+        'positional': 1, 'keyword': 1, 'vector-like': 2, 'trusted': 2,
+    }
+
+
+def test_instrument_submodule_allocations():
+    from ppb_vector import curves, VectorArray
+    make = curves._make
+    batch = VectorArray([(1, 2), (3, 4)])
+    a, b = Vector(0, 0), Vector(1, 1)
+    with instrument() as counters:
+        list(batch)
+        lerp(a, b, 0.5)
+        b.rotate(90)
+
+    assert counters.allocations == {'trusted': 4}
+    assert curves._make is make
+
+
+def test_instrument_submodule_imported():
+    # Submodules imported while instrumentation is enabled get _make restored
+    script = (
+        "import ppb_vector\n"
+        "with ppb_vector.instrument():\n"
+        "    from ppb_vector import polyline\n"
+        "assert polyline._make is ppb_vector._make\n"
+    )
+    subprocess.run([sys.executable, '-c', script], check=True)
+
+
+def test_instrument_nested():
+    with instrument() as outer:
+        Vector(1, 2) + (1, 1)
+        with instrument(timing=True) as inner:
+            Vector(1, 2).rotate(90)
+
+    assert outer.calls == {'__add__': 1, 'rotate': 1}
+    assert inner.calls == {'rotate': 1}
+    assert set(inner.snapshot()['time']) == {'rotate'}
+    assert inner.time['rotate'] > 0
+    assert 'rotate' in inner.report()
+
+
+def test_instrument_environment():
+    env = dict(os.environ, PPB_VECTOR_INSTRUMENT='1')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (
+        os.path.dirname(os.path.dirname(ppb_vector.__file__)), env.get('PYTHONPATH'),
+    )))
+    result = subprocess.run(
+        [sys.executable, '-c', 'from ppb_vector import Vector; Vector(1, 2) + (3, 4)'],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True,
+        check=True,
+    )
+    assert "Vector allocations: 2 (positional 1, trusted 1)" in result.stderr
+    assert "__add__" in result.stderr
@@ -0,0 +1,78 @@
+import gc
+import math
+
+import hypothesis.strategies as st
+import pytest  # type: ignore
+from hypothesis import given
+
+from ppb_vector import Vector, VectorInterner
+from utils import vector_likes, vectors
+
+
+@given(v=vectors())
+def test_interner_same_instance(v: Vector):
+    interner = VectorInterner()
+    interned = interner(v)
+    assert interned == v
+    assert interner(v.x, v.y) is interned
+    for v_like in vector_likes(v):
+        assert interner(v_like) is interned
+
+
+@given(v=vectors())
+def test_interner_equal(v: Vector):
+    assert VectorInterner()(v.x, v.y) == v
+
+
+def test_interner_pinned():
+    interner = VectorInterner(maxsize=0)
+    assert interner(0, 0) is Vector.zero
+    assert interner(1, 0) is Vector.x_unit
+    assert interner((0, 1)) is Vector.y_unit
+
+
+def test_interner_signed_zero():
+    interner = VectorInterner()
+    negative = interner(-0.0, 0.0)
+    assert negative is not Vector.zero
+    assert math.copysign(1, negative.x) == -1
+    assert interner(-0.0, 0.0) is negative
+
+
+def test_interner_nan():
+    nan = VectorInterner()(math.nan, 0)
+    assert math.isnan(nan.x)
+
+
+@given(maxsize=st.integers(min_value=1, max_value=10), count=st.integers(min_value=0, max_value=30))
+def test_interner_maxsize(maxsize: int, count: int):
+    interner = VectorInterner(maxsize=maxsize)
+    vectors = [interner(i, i) for i in range(2, 2 + count)]
+    assert len(interner) <= maxsize + 3
+
+    # The most recently-interned vectors are still there
+    if vectors:
+        assert interner(vectors[-1].x, vectors[-1].y) is vectors[-1]
+
+
+def test_interner_weak():
+    interner = VectorInterner()
+    interner(2, 3)
+    gc.collect()
+    assert len(interner) == 3
+
+
+def test_interner_stats():
+    interner = VectorInterner()
+    v = interner(2, 3)
+    assert interner(2, 3) is v
+    assert interner(Vector(2, 3)) is v
+    assert (interner.hits, interner.misses) == (2, 1)
+
+    interner.clear()
+    assert (interner.hits, interner.misses) == (0, 0)
+
+
+def test_interner_negative_maxsize():
+    with pytest.raises(ValueError):
+        VectorInterner(maxsize=-1)
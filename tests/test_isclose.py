@@ -1,11 +1,11 @@
 from math import sqrt
 
 from hypothesis import assume, given, note
-from hypothesis.strategies import floats
+from hypothesis.strategies import floats, lists
 from pytest import raises  # type: ignore
 
-from ppb_vector import Vector
-from utils import lengths, units, vectors
+from ppb_vector import Vector, VectorArray
+from utils import lengths, units, vector_likes, vectors
 
 
 @given(v=vectors(), abs_tol=floats(min_value=0), rel_tol=floats(min_value=0))
@@ -84,6 +84,34 @@ def test_isclose_rel_error(v, direction, rel_tol):
     assert not v.isclose(negative, abs_tol=0, rel_tol=rel_tol)
 
 
+def reference_isclose(v, w, abs_tol=1e-09, rel_tol=1e-09, rel_to=()):
+    """Straightforward implementation of Vector.isclose, in terms of vectors."""
+    w = Vector(w)
+    rel_length = max(v.length, w.length, *(Vector(u).length for u in rel_to))
+    diff = (v - w).length
+    return diff <= rel_tol * rel_length or diff <= abs_tol
+
+
+@given(v=vectors(), w=vectors(), rel_to=lists(vectors(), max_size=3),
+       abs_tol=floats(min_value=0), rel_tol=floats(min_value=0))
+def test_isclose_reference(v, w, rel_to, abs_tol, rel_tol):
+    expected = reference_isclose(v, w, abs_tol, rel_tol, rel_to)
+    assert v.isclose(w, abs_tol=abs_tol, rel_tol=rel_tol, rel_to=rel_to) == expected
+    for w_like in vector_likes(w):
+        assert v.isclose(w_like, abs_tol=abs_tol, rel_tol=rel_tol, rel_to=rel_to) == expected
+
+    assert VectorArray([v]).isclose(
+        VectorArray([w]), abs_tol=abs_tol, rel_tol=rel_tol, rel_to=rel_to,
+    )[0] == expected
+
+
+@given(vs=lists(vectors(), max_size=20), data=lists(vectors(), max_size=20))
+def test_isclose_batch(vs, data):
+    ws = (data + vs)[:len(vs)]
+    mask = VectorArray(vs).isclose(VectorArray(ws))
+    assert list(mask) == [v.isclose(w) for v, w in zip(vs, ws)]
+
+
 @given(v=vectors())
 def test_isclose_negative_tolerances(v: Vector):
     with raises(ValueError):
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest  # type: ignore
+from hypothesis import given
+from hypothesis.strategies import integers, lists
+
+from ppb_vector import ParallelExecutor, Rotation, Vector, VectorArray
+from utils import angles, lengths, units, vectors
+
+
+def batches(max_magnitude=1e75):
+    return lists(vectors(max_magnitude), min_size=1, max_size=40).map(VectorArray)
+
+
+@pytest.fixture(scope='module')
+def parallel():
+    # Tiny chunks, so that the parallel path is taken even for small batches.
+    with ParallelExecutor(workers=4, chunk_size=3) as executor:
+        yield executor
+
+
+def assert_identical(a, b):
+    if isinstance(a, VectorArray):
+        a, b = a._data, b._data
+    assert np.array_equal(a, b, equal_nan=True)
+
+
+@given(batch=batches(), angle=angles())
+def test_parallel_rotate(parallel, batch, angle):
+    assert_identical(parallel.rotate(batch, angle), batch.rotate(angle))
+    assert_identical(parallel.rotate(batch, Rotation(angle)), batch.rotate(Rotation(angle)))
+
+
+@given(batch=batches(), data=lists(angles(), min_size=40, max_size=40))
+def test_parallel_rotate_per_vector(parallel, batch, data):
+    angle = np.array(data[:len(batch)])
+    assert_identical(parallel.rotate(batch, angle), batch.rotate(angle))
+
+
+@given(batch=batches(1e75).filter(lambda b: bool(np.all(b.length > 0))))
+def test_parallel_normalize(parallel, batch):
+    assert_identical(parallel.normalize(batch), batch.normalize())
+
+
+def test_parallel_normalize_null(parallel):
+    with pytest.raises(ZeroDivisionError):
+        parallel.normalize(VectorArray([(1, 0)] * 10 + [(0, 0)]))
+
+
+@given(batch=batches(), max_length=lengths())
+def test_parallel_truncate(parallel, batch, max_length):
+    assert_identical(parallel.truncate(batch, max_length), batch.truncate(max_length))
+
+
+@given(batch=batches(), normal=units())
+def test_parallel_reflect(parallel, batch, normal):
+    assert_identical(parallel.reflect(batch, normal), batch.reflect(normal))
+    normals = VectorArray([normal] * len(batch))
+    assert_identical(parallel.reflect(batch, normals), batch.reflect(normals))
+
+
+@given(batch=batches(1e75), other=vectors(1e75))
+def test_parallel_dot_length(parallel, batch, other):
+    assert_identical(parallel.dot(batch, other), batch.dot(other))
+    assert_identical(parallel.dot(batch, batch), batch.dot(batch))
+    assert_identical(parallel.length(batch), batch.length)
+
+
+def test_parallel_broadcast_errors(parallel):
+    batch = VectorArray([(1, 0)] * 10)
+    with pytest.raises(ValueError):
+        parallel.dot(batch, VectorArray([(1, 0)] * 9))
+    with pytest.raises(ValueError):
+        parallel.truncate(batch, np.ones(9))
+
+
+@given(length=integers(min_value=0, max_value=100), workers=integers(1, 8),
+       chunk_size=integers(1, 20))
+def test_parallel_bounds(length, workers, chunk_size):
+    bounds = ParallelExecutor(workers, chunk_size)._bounds(length)
+    assert bounds[0] == 0 and bounds[-1] == length
+    assert len(bounds) - 1 <= workers
+    assert all(b - a >= min(chunk_size, length) for a, b in zip(bounds, bounds[1:]))
+
+
+def test_parallel_calibrate():
+    with ParallelExecutor(workers=2) as executor:
+        assert executor.chunk_size >= 1
+        assert executor.chunk_size == executor.chunk_size
+
+    assert ParallelExecutor(workers=1).calibrate() >= 1
+    with pytest.raises(ValueError):
+        ParallelExecutor(workers=0)
+
+
+def test_parallel_single_vector(parallel):
+    assert list(parallel.length(VectorArray([Vector(3, 4)]))) == [5.0]
@@ -0,0 +1,142 @@
+import pickle
+from decimal import Decimal
+from fractions import Fraction
+
+import hypothesis.strategies as st
+import numpy as np  # type: ignore
+import pytest  # type: ignore
+from hypothesis import assume, given
+
+from ppb_vector import Polyline, segment_distance, Vector, VectorArray
+from utils import isclose, vectors
+
+
+def paths(min_size=1):
+    return st.lists(vectors(max_magnitude=1e3), min_size=min_size, max_size=20).map(Polyline)
+
+
+def distances(path: Polyline):
+    return st.floats(min_value=-10, max_value=path.length + 10)
+
+
+def naive_point_at(vertices, distance):
+    """Walk the segments, as done without a Polyline."""
+    for a, b in zip(vertices, vertices[1:]):
+        step = (b - a).length
+        if distance <= step:
+            return a + (b - a) * (max(distance, 0) / step)
+        distance -= step
+
+    return vertices[-1]
+
+
+def test_empty():
+    with pytest.raises(ValueError):
+        Polyline([])
+
+
+def test_duplicates_merged():
+    path = Polyline([(0, 0), (0, 0), (1, 0), (1, 0), (1, 0), (0, 0)])
+    assert list(path) == [(0, 0), (1, 0), (0, 0)]
+    assert path.distances() == [0, 1, 2]
+
+
+@given(path=paths())
+def test_vertices(path: Polyline):
+    assert Polyline(path) == path
+    assert hash(Polyline(path)) == hash(path)
+    assert eval(repr(path)) == path
+    assert pickle.loads(pickle.dumps(path)) == path
+    assert len(path.distances()) == len(path)
+    assert path.distances()[-1] == path.length
+    for v, d in zip(path, path.distances()):
+        assert path.point_at(d) == v
+
+
+@given(data=st.data(), path=paths())
+def test_point_at(data, path: Polyline):
+    d = data.draw(distances(path))
+    p = path.point_at(d)
+    assert p.isclose(naive_point_at(list(path), d), abs_tol=1e-6, rel_to=list(path))
+    assert path.point_at(path.project(p)).isclose(p, abs_tol=1e-6, rel_to=list(path))
+
+
+@given(data=st.data(), path=paths())
+def test_monotonic_queries(data, path: Polyline):
+    """Queries resuming from the previous segment find the same points."""
+    queries = sorted(data.draw(st.lists(distances(path), max_size=50)))
+    expected = [Polyline(path).point_at(d) for d in queries]
+    assert [path.point_at(d) for d in queries] == expected
+    assert [path.point_at(d) for d in reversed(queries)] == expected[::-1]
+
+
+@given(data=st.data(), path=paths())
+def test_batch_matches_scalar(data, path: Polyline):
+    queries = data.draw(st.lists(distances(path), max_size=50))
+    points = path.point_at(np.array(queries))
+    tangents = path.tangent_at(queries)
+    assert isinstance(points, VectorArray) and len(points) == len(queries)
+    assert list(points) == [path.point_at(d) for d in queries]
+    for t, d in zip(tangents, queries):
+        assert t.isclose(path.tangent_at(d))
+
+
+@given(data=st.data(), path=paths(min_size=2))
+def test_tangent_at(data, path: Polyline):
+    assume(len(path) > 1)
+    d = data.draw(distances(path))
+    tangent = path.tangent_at(d)
+    assert isclose(tangent.length, 1)
+    if 0 < d < path.length:
+        # Moving along the tangent stays close to the path
+        step = 1e-3 * path.length
+        ahead = path.point_at(d) + tangent * step
+        assert isclose(segment_distance(ahead, path.point_at(d), path.point_at(d + step)), 0,
+                       abs_tol=1e-6 * path.length)
+
+
+@pytest.mark.parametrize("distance", [
+    np.int64(5), np.float32(5), np.float64(5), np.array(5.0), Fraction(5), Decimal(5),
+])
+def test_scalar_types(distance):
+    """Single numbers of any type are distances, like floats, rather than batches."""
+    path = Polyline([(0, 0), (3, 4), (3, 10)])
+    for query in (path.point_at, path.tangent_at, Polyline([(1, 2)]).point_at):
+        result = query(distance)
+        assert type(result) is Vector and type(result.x) is float
+        assert result == query(5.0)
+
+
+def test_single_vertex():
+    path = Polyline([(1, 2)])
+    assert path.length == 0
+    assert path.point_at(3) == (1, 2)
+    assert path.tangent_at(3) == Vector.zero
+    assert list(path.point_at([0, 1])) == [(1, 2), (1, 2)]
+    assert path.closest_point((5, 5)) == (1, 2)
+    assert path.project((5, 5)) == 0
+
+
+@given(path=paths(), point=vectors(max_magnitude=1e3))
+def test_closest_point(path: Polyline, point: Vector):
+    closest = path.closest_point(point)
+    vertices = list(path)
+    nearest = min(
+        [segment_distance(point, a, b) for a, b in zip(vertices, vertices[1:])],
+        default=(point - vertices[0]).length,
+    )
+    assert isclose((point - closest).length, nearest, abs_tol=1e-6, rel_to=[point, *vertices])
+
+
+@given(path=paths(min_size=2), count=st.integers(2, 50))
+def test_resample(path: Polyline, count: int):
+    resampled = path.resample(count)
+    assert resampled[0] == path[0] and resampled[-1] == path[-1]
+    assert len(resampled) <= count
+    for v in resampled:
+        assert path.closest_point(v).isclose(v, abs_tol=1e-6, rel_to=list(path))
+
+
+def test_resample_count():
+    with pytest.raises(ValueError):
+        Polyline([(0, 0), (1, 1)]).resample(1)
@@ -0,0 +1,130 @@
+import math
+import operator
+from functools import reduce
+
+import hypothesis.strategies as st
+import numpy as np
+import pytest  # type: ignore
+from hypothesis import assume, given
+
+from ppb_vector import Vector, VectorArray
+from utils import floats, vector_likes, vectors
+
+
+def vector_lists(min_size=0):
+    return st.lists(vectors(max_magnitude=1e30), min_size=min_size, max_size=50)
+
+
+@given(vs=vector_lists())
+def test_sum_reduce(vs):
+    """Vector.sum is equivalent to adding up vectors, in order."""
+    assert Vector.sum(vs) == reduce(operator.add, vs, Vector.zero)
+
+
+@given(vs=vector_lists())
+def test_sum_exact(vs):
+    assert Vector.sum(vs, exact=True) == (
+        math.fsum(v.x for v in vs), math.fsum(v.y for v in vs),
+    )
+
+
+@given(vs=vector_lists())
+def test_sum_vector_likes(vs):
+    for v_likes in zip(*map(vector_likes, vs)):
+        assert Vector.sum(v_likes) == Vector.sum(vs)
+
+
+@pytest.mark.parametrize("exact", [False, True])
+@given(vs=vector_lists())
+def test_sum_batch(vs, exact):
+    assert Vector.sum(VectorArray(vs), exact=exact).isclose(
+        Vector.sum(vs, exact=exact),
+        abs_tol=1e-9, rel_to=vs,
+    )
+
+
+@pytest.mark.parametrize("exact", [False, True])
+@given(vs=vector_lists(min_size=1))
+def test_mean(vs, exact):
+    assert Vector.mean(vs, exact=exact) == Vector.sum(vs, exact=exact) / len(vs)
+    assert Vector.mean(VectorArray(vs), exact=exact).isclose(
+        Vector.mean(vs, exact=exact),
+        abs_tol=1e-9, rel_to=vs,
+    )
+
+
+@pytest.mark.parametrize("reduction", [
+    Vector.mean, Vector.centroid, Vector.min, Vector.max, Vector.bounding_box,
+])
+def test_reductions_empty(reduction):
+    for vs in ([], VectorArray()):
+        with pytest.raises(ValueError):
+            reduction(vs)
+
+
+@given(data=st.data(), vs=vector_lists(min_size=1))
+def test_weighted_mean(data, vs):
+    weights = data.draw(st.lists(
+        floats(max_magnitude=1e10), min_size=len(vs), max_size=len(vs),
+    ))
+    total = math.fsum(weights)
+    assume(abs(total) > 1e-3)
+
+    expected = Vector(
+        math.fsum(w * v.x for v, w in zip(vs, weights)) / total,
+        math.fsum(w * v.y for v, w in zip(vs, weights)) / total,
+    )
+    assert Vector.weighted_mean(vs, weights, exact=True) == expected
+
+
+@given(vs=vector_lists(min_size=1))
+def test_weighted_mean_uniform(vs):
+    uniform = Vector.weighted_mean(vs, [1] * len(vs))
+    assert uniform == Vector.mean(vs)
+    assert Vector.weighted_mean(VectorArray(vs), [1] * len(vs)).isclose(
+        uniform, abs_tol=1e-9, rel_to=vs,
+    )
+
+
+@pytest.mark.parametrize("weights", [[1], [1, 2, 3], np.array([1.0])])
+def test_weighted_mean_lengths(weights):
+    vs = [Vector(1, 2), Vector(3, 4)]
+    for collection in (vs, iter(vs), VectorArray(vs)):
+        for exact in (False, True):
+            with pytest.raises(ValueError):
+                Vector.weighted_mean(collection, weights, exact=exact)
+
+    with pytest.raises(ValueError):
+        Vector.weighted_mean(VectorArray(vs), np.ones((2, 2)))
+
+
+@given(corner=vectors(max_magnitude=1e10), width=st.floats(1, 1e5), height=st.floats(1, 1e5))
+def test_centroid_rectangle(corner, width, height):
+    rectangle = [corner, corner + (width, 0), corner + (width, height), corner + (0, height)]
+    center = corner + (width / 2, height / 2)
+
+    assert Vector.centroid(rectangle).isclose(center, rel_to=[corner, center])
+    assert Vector.centroid(VectorArray(rectangle)).isclose(center, rel_to=[corner, center])
+    # The orientation of the polygon doesn't matter
+    assert Vector.centroid(reversed(rectangle)).isclose(center, rel_to=[corner, center])
+
+
+def test_centroid_degenerate():
+    with pytest.raises(ValueError):
+        Vector.centroid([(0, 0), (1, 1), (2, 2)])
+
+
+@given(vs=vector_lists(min_size=1))
+def test_min_max(vs):
+    assert Vector.min(vs) is min(vs, key=lambda v: v.length)
+    assert Vector.max(vs) is max(vs, key=lambda v: v.length)
+    assert math.isclose(Vector.min(VectorArray(vs)).length, Vector.min(vs).length)
+    assert math.isclose(Vector.max(VectorArray(vs)).length, Vector.max(vs).length)
+
+
+@given(vs=vector_lists(min_size=1))
+def test_bounding_box(vs):
+    lower, upper = Vector.bounding_box(vs)
+    assert lower == (min(v.x for v in vs), min(v.y for v in vs))
+    assert upper == (max(v.x for v in vs), max(v.y for v in vs))
+    assert Vector.bounding_box(VectorArray(vs)) == (lower, upper)
@@ -0,0 +1,53 @@
+import hypothesis.strategies as st
+import numpy as np
+from hypothesis import given
+
+from ppb_vector import (
+    Rotation, trig_cache_clear, trig_cache_info,
+    Vector, VectorAccumulator, VectorArray,
+)
+from utils import angle_isclose, angles, vectors
+
+
+@given(v=vectors(), angle=angles())
+def test_rotation_apply(v: Vector, angle: float):
+    """Applying a Rotation is exactly equivalent to Vector.rotate."""
+    rotation = Rotation(angle)
+    assert rotation.apply(v) == v.rotate(rotation) == v.rotate(angle)
+    assert VectorAccumulator(v).irotate(rotation).freeze() == v.rotate(angle)
+
+
+@given(vs=st.lists(vectors()), angle=angles())
+def test_rotation_apply_batch(vs, angle: float):
+    rotated = Rotation(angle).apply(VectorArray(vs))
+    assert isinstance(rotated, VectorArray)
+    assert list(rotated) == [v.rotate(angle) for v in vs]
+
+
+@given(a=angles(), b=angles())
+def test_rotation_compose(a: float, b: float):
+    assert Rotation(a) + Rotation(b) == Rotation(a + b)
+    assert Rotation(a) - Rotation(b) == Rotation(a - b)
+
+
+@given(v=vectors(), angle=angles())
+def test_rotation_inverse(v: Vector, angle: float):
+    rotation = Rotation(angle)
+    assert rotation.inverse() == -rotation == Rotation(-angle)
+    assert (rotation.inverse().cos, rotation.inverse().sin) == Vector._trig(-angle)
+    assert v.rotate(rotation).rotate(-rotation).isclose(v)
+    assert angle_isclose(rotation.inverse().angle, -angle)
+
+
+@given(angle=angles())
+def test_trig_cache(angle: float):
+    trig_cache_clear()
+    expected = Vector._trig(angle)
+    assert trig_cache_info().misses == 1
+
+    assert Vector._trig(angle) == expected
+    assert trig_cache_info().hits == 1
+
+
+def test_trig_unhashable():
+    assert Vector(1, 0).rotate(np.array(90.0)) == Vector(0, 1)
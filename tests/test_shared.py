@@ -0,0 +1,113 @@
+import operator
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest  # type: ignore
+from hypothesis import given, settings
+from hypothesis.strategies import lists
+
+from ppb_vector import SharedVectorArray, Transform2D, Vector, VectorArray
+from ppb_vector.shared import _map_chunk
+from utils import angles, vectors
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with ProcessPoolExecutor(2) as executor:
+        yield executor
+
+
+@given(vs=lists(vectors(), max_size=20))
+def test_shared_roundtrip(vs):
+    with SharedVectorArray(vs) as a:
+        assert list(a) == vs
+        assert isinstance(a, VectorArray)
+        assert list(a + (1, 1)) == list(VectorArray(vs) + (1, 1))
+
+
+def test_shared_attach():
+    with SharedVectorArray.zeros(3) as a, SharedVectorArray.attach(a.name) as b:
+        assert len(b) == 3
+        b[1] = (1, 2)
+        a[2:] = VectorArray([(3, 4)])
+        assert list(a) == list(b) == [Vector(0, 0), Vector(1, 2), Vector(3, 4)]
+
+    with pytest.raises(FileNotFoundError):
+        SharedVectorArray.attach(a.name)
+
+
+def test_shared_constructors():
+    with SharedVectorArray.from_columns([1, 2], [3, 4]) as a:
+        assert list(a) == [Vector(1, 3), Vector(2, 4)]
+
+    with SharedVectorArray() as empty:
+        assert len(empty) == 0
+
+
+def test_shared_close_with_views():
+    a = SharedVectorArray([(1, 2)])
+    view = a[:]
+    with pytest.raises(BufferError):
+        a.close()
+
+    # The view stays valid, until it is collected.
+    assert len(a) == 0
+    assert view[0] == Vector(1, 2)
+    a.unlink()
+    del view
+
+
+def test_shared_pickle_by_name():
+    with SharedVectorArray([(1, 2)] * 1000) as a:
+        data = pickle.dumps(a)
+        assert len(data) < 200
+        with pickle.loads(data) as b:
+            b[0] = (5, 6)
+            assert a[0] == Vector(5, 6)
+
+
+@settings(deadline=None, max_examples=10)
+@given(vs=lists(vectors(max_magnitude=1e75), max_size=50), angle=angles())
+def test_shared_map(pool, vs, angle):
+    expected = VectorArray(vs).rotate(angle)
+    with SharedVectorArray(vs) as a:
+        assert a.map('rotate', angle, pool=pool, chunks=3) is a
+        assert list(a) == list(expected)
+
+
+def test_shared_map_out(pool):
+    vs = [Vector(i, -i) for i in range(10)]
+    scalars = np.arange(10.0)
+    with SharedVectorArray(vs) as a, SharedVectorArray.zeros(10) as out:
+        a.map(operator.neg, out=out, pool=pool)
+        assert list(out) == [-v for v in vs]
+        assert list(a) == vs
+
+        a.map('scale_by', scalars, out=out, pool=pool, chunks=4)
+        assert list(out) == [v * s for v, s in zip(vs, scalars)]
+
+        with SharedVectorArray([(1, 1)] * 10) as offsets:
+            a.map(operator.add, offsets, pool=pool)
+        assert list(a) == [v + (1, 1) for v in vs]
+
+        with pytest.raises(ValueError):
+            a.map('normalize', out=out[:5], pool=pool)
+
+
+def test_shared_map_closes_arguments():
+    """Workers close the shared batches they attach to when unpickling arguments."""
+    with SharedVectorArray([(1, 2)] * 4) as a, SharedVectorArray([(1, 1)] * 4) as offsets:
+        task = ('__add__', a.name, a.name, 4, 0, 4, (offsets,))
+        task = pickle.loads(pickle.dumps(task))
+        _map_chunk(task)
+        attached, = task[-1]
+        assert len(attached) == 0
+        assert list(a) == [Vector(2, 3)] * 4
+
+
+def test_shared_operation_results():
+    with SharedVectorArray([(1, 2), (3, 4)]) as a:
+        for result in (a + (1, 1), a[:1], Transform2D.translation((1, 1)).apply(a)):
+            assert type(result) is VectorArray
+            assert repr(result).startswith('VectorArray(')
@@ -0,0 +1,191 @@
+import mmap
+import pickle
+
+import hypothesis.strategies as st
+import pytest  # type: ignore
+from hypothesis import given
+
+from ppb_vector import KDTree, SpatialHash, Vector, VectorArray
+
+
+def coordinates():
+    # Multiples of 1/64, so that squared distances don't underflow
+    return st.integers(-10**6, 10**6).map(lambda i: i / 64)
+
+
+def positions():
+    return st.builds(Vector, coordinates(), coordinates())
+
+
+def points(min_size=0):
+    return st.lists(positions(), min_size=min_size, max_size=100)
+
+
+def cell_sizes():
+    return st.floats(min_value=0.1, max_value=1e3)
+
+
+def distance2(u, v):
+    return (u.x - v.x) ** 2 + (u.y - v.y) ** 2
+
+
+@given(ps=points(), cell_size=cell_sizes(), center=positions(),
+       radius=st.floats(min_value=0, max_value=1e4))
+def test_within(ps, cell_size, center, radius):
+    index = SpatialHash(cell_size, ps)
+    assert sorted(index.within(center, radius)) == [
+        i for i, p in enumerate(ps) if distance2(p, center) <= radius * radius
+    ]
+
+
+@given(ps=points(), cell_size=cell_sizes(),
+       corner=positions(), opposite=positions())
+def test_in_rect(ps, cell_size, corner, opposite):
+    index = SpatialHash(cell_size, ps)
+    (x0, x1), (y0, y1) = sorted((corner.x, opposite.x)), sorted((corner.y, opposite.y))
+    assert sorted(index.in_rect(corner, opposite)) == [
+        i for i, p in enumerate(ps) if x0 <= p.x <= x1 and y0 <= p.y <= y1
+    ]
+
+
+@given(ps=points(), cell_size=cell_sizes(), center=positions(),
+       k=st.integers(min_value=0, max_value=10))
+def test_nearest(ps, cell_size, center, k):
+    index = SpatialHash(cell_size, ps)
+    nearest = index.nearest(center, k)
+    assert len(nearest) == min(k, len(ps))
+
+    distances = [distance2(ps[i], center) for i in nearest]
+    assert distances == sorted(distances)
+    assert distances == sorted(distance2(p, center) for p in ps)[:k]
+
+
+@given(ps=points(), cell_size=cell_sizes())
+def test_rebuild_batch(ps, cell_size):
+    index = SpatialHash(cell_size, VectorArray(ps))
+    assert dict(index._cells) == SpatialHash(cell_size, ps)._cells
+    assert [index[i] for i in range(len(ps))] == ps
+
+
+@given(ps=points(min_size=1), moves=st.lists(st.tuples(st.integers(0), positions())),
+       cell_size=cell_sizes())
+def test_move(ps, moves, cell_size):
+    index = SpatialHash(cell_size, {str(i): p for i, p in enumerate(ps)})
+    for i, new in moves:
+        key = str(i % len(ps))
+        index.move(key, new)
+        ps[i % len(ps)] = new
+
+    assert index._cells == SpatialHash(cell_size, {str(i): p for i, p in enumerate(ps)})._cells
+
+
+def test_insert_remove():
+    index = SpatialHash(10)
+    index.insert('a', (1, 2))
+    index.insert('b', Vector(3, 4))
+    assert len(index) == 2
+    assert index['a'] == Vector(1, 2)
+
+    with pytest.raises(ValueError):
+        index.insert('a', (5, 6))
+
+    assert index.remove('a') == Vector(1, 2)
+    assert 'a' not in index
+    assert list(index) == ['b']
+    assert index.within((1, 2), 1) == []
+
+    with pytest.raises(KeyError):
+        index.remove('a')
+
+    with pytest.raises(KeyError):
+        index.move('a', (0, 0))
+
+    index.remove('b')
+    assert not index._cells
+
+
+@pytest.mark.parametrize("cell_size", [0, -1, float('inf'), float('nan')])
+def test_invalid_cell_size(cell_size):
+    with pytest.raises(ValueError):
+        SpatialHash(cell_size)
+
+
+@pytest.mark.parametrize("position", [(float('inf'), 0), (0, float('nan'))])
+def test_non_finite(position):
+    with pytest.raises(ValueError):
+        SpatialHash(1).insert('a', position)
+
+    with pytest.raises(ValueError):
+        SpatialHash(1, VectorArray([position]))
+
+
+def point_sets(min_size=0):
+    # Large enough that the trees have internal nodes, and with duplicates
+    return st.lists(
+        st.one_of(positions(), st.sampled_from([Vector(1, 1), Vector(-3, 2)])),
+        min_size=min_size, max_size=200,
+    )
+
+
+@given(ps=point_sets(), center=positions(), k=st.integers(0, 10))
+def test_kdtree_nearest(ps, center, k):
+    tree = KDTree(ps)
+    nearest = tree.nearest(center, k)
+    assert len(nearest) == min(k, len(ps))
+    assert all(ps[i] == p for i, p in nearest)
+
+    distances = [distance2(p, center) for _, p in nearest]
+    assert distances == sorted(distance2(p, center) for p in ps)[:k]
+
+
+@given(ps=point_sets(), center=positions(),
+       radius=st.floats(min_value=0, max_value=1e4))
+def test_kdtree_within(ps, center, radius):
+    tree = KDTree(ps)
+    assert sorted(tree.within(center, radius)) == [
+        (i, p) for i, p in enumerate(ps) if distance2(p, center) <= radius * radius
+    ]
+
+
+@given(ps=point_sets(), centers=st.lists(positions(), max_size=5))
+def test_kdtree_many(ps, centers):
+    tree = KDTree(VectorArray(ps))
+    for batch in (centers, VectorArray(centers)):
+        assert tree.nearest_many(batch, 3) == [tree.nearest(c, 3) for c in centers]
+        assert tree.within_many(batch, 100) == [tree.within(c, 100) for c in centers]
+
+
+@given(ps=point_sets(), center=positions())
+def test_kdtree_serialize(ps, center):
+    tree = KDTree(ps)
+    for copy in (pickle.loads(pickle.dumps(tree)), KDTree.from_buffer(tree.to_bytes())):
+        assert len(copy) == len(tree)
+        assert copy.nearest(center, 5) == tree.nearest(center, 5)
+        assert pickle.loads(pickle.dumps(copy)).nearest(center) == tree.nearest(center)
+
+
+def test_kdtree_mmap(tmp_path):
+    tree = KDTree((i, i % 7) for i in range(100))
+    path = tmp_path / "tree.bin"
+    path.write_bytes(tree.to_bytes())
+
+    with path.open('rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        mapped = KDTree.from_buffer(buffer)
+        assert mapped.within((50, 3), 2) == tree.within((50, 3), 2)
+        del mapped
+
+
+def test_kdtree_invalid():
+    with pytest.raises(ValueError):
+        KDTree([(0, float('nan'))])
+
+    with pytest.raises(ValueError):
+        KDTree([]).nearest((0, 0), -1)
+
+    with pytest.raises(ValueError):
+        KDTree([]).within((0, 0), -1)
+
+    data = KDTree([(0, 0), (1, 1)]).to_bytes()
+    for buffer in (b'', data[:-1], b'x' + data[1:]):
+        with pytest.raises(ValueError):
+            KDTree.from_buffer(buffer)
@@ -0,0 +1,78 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import hypothesis.strategies as st
+import numpy as np
+import pytest  # type: ignore
+from hypothesis import assume, given
+
+from ppb_vector import Rotation, Transform2D, Vector, VectorArray
+from utils import angles, floats, vectors
+
+
+def transforms():
+    return st.builds(
+        Transform2D.from_components,
+        translation=vectors(max_magnitude=1e10),
+        rotation=angles(),
+        scale=st.floats(min_value=1e-3, max_value=1e3),
+    )
+
+
+@given(v=vectors(max_magnitude=1e10), offset=vectors(), angle=angles(), scale=floats(1e10))
+def test_transform_elementary(v: Vector, offset: Vector, angle: float, scale: float):
+    assert Transform2D.translation(offset).apply(v) == v + offset
+    assert Transform2D.rotation(angle).apply(v).isclose(v.rotate(angle))
+    assert Transform2D.rotation(Rotation(angle)).apply(v).isclose(v.rotate(angle))
+    assert Transform2D.scaling(scale).apply(v) == v.scale_by(scale)
+    assert Transform2D.identity.apply(v) == v
+
+
+@given(v=vectors(max_magnitude=1e10), offset=vectors(max_magnitude=1e10),
+       angle=angles(), scale=st.floats(min_value=1e-3, max_value=1e3))
+def test_transform_components(v: Vector, offset: Vector, angle: float, scale: float):
+    """from_components is equivalent to the chain of Vector operations."""
+    t = Transform2D.from_components(translation=offset, rotation=angle, scale=scale)
+    expected = v.scale_by(scale).rotate(angle) + offset
+    assert t.apply(v).isclose(expected, rel_to=[v.scale_by(scale), offset])
+
+
+@given(t=transforms(), u=transforms(), v=vectors(max_magnitude=1e10))
+def test_transform_compose(t: Transform2D, u: Transform2D, v: Vector):
+    composed = t @ u
+    assert (t @ u) == t.compose(u)
+
+    expected = t.apply(u.apply(v))
+    assert composed.apply(v).isclose(expected, abs_tol=1e-3, rel_to=[v, u.apply(v)])
+
+
+@given(t=transforms(), v=vectors(max_magnitude=1e10))
+def test_transform_inverse(t: Transform2D, v: Vector):
+    assert t.inverse().apply(t.apply(v)).isclose(v, abs_tol=1e-3, rel_to=[t.apply(v)])
+    assert t.inverse().inverse().isclose(t, rel_tol=1e-6)
+
+
+@pytest.mark.parametrize("factor", [np.int64(2), np.float32(0.5), Fraction(1, 2), Decimal('0.5')])
+def test_transform_scalar_types(factor):
+    """Single numbers of any type are uniform scalings, like floats."""
+    assert Transform2D.scaling(factor) == Transform2D.scaling(float(factor))
+    assert Transform2D.from_components(scale=factor) == Transform2D.scaling(float(factor))
+
+
+def test_transform_singular():
+    with pytest.raises(ValueError):
+        Transform2D.scaling((1, 0)).inverse()
+
+
+@given(t=transforms(), vs=st.lists(vectors(max_magnitude=1e10)))
+def test_transform_batch(t: Transform2D, vs):
+    batch = t @ VectorArray(vs)
+    assert isinstance(batch, VectorArray)
+    for result, v in zip(batch, vs):
+        assert result == t.apply(v)
+
+
+@given(t=transforms(), v=vectors(max_magnitude=1e10))
+def test_transform_matmul_vector_like(t: Transform2D, v: Vector):
+    assume(v)
+    assert t @ v == t @ (v.x, v.y) == t.apply(v)